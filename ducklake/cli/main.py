@@ -163,19 +163,30 @@ def extract(ctx: click.Context, source_name: str) -> None:
 
 @cli.command()
 @click.argument("pipeline_name")
+@click.option("--sample", default=None, help="Correr sobre una muestra, ej: 1% (salida en _scratch)")
+@click.option("--limit-files", type=int, default=None, help="Leer solo los N archivos RAW más recientes")
 @click.pass_context
-def run(ctx: click.Context, pipeline_name: str) -> None:
+def run(
+    ctx: click.Context, pipeline_name: str, sample: str | None, limit_files: int | None
+) -> None:
     """Ejecutar un pipeline de transformación."""
     from ducklake.core.orchestrator import Orchestrator
 
     config_path = ctx.obj["config_path"]
     data_path = ctx.obj["data_path"]
 
+    sample_pct = None
+    if sample is not None:
+        try:
+            sample_pct = float(sample.rstrip("%"))
+        except ValueError:
+            raise click.BadParameter(f"Porcentaje inválido: {sample}", param_hint="--sample")
+
     click.echo(f"Ejecutando pipeline: {pipeline_name}")
 
     orch = Orchestrator(config_path, data_path)
     try:
-        result = orch.run_pipeline(pipeline_name)
+        result = orch.run_pipeline(pipeline_name, sample=sample_pct, limit_files=limit_files)
         if result["status"] == "success":
             click.echo(f"  OK  {result.get('rows', 0)} rows -> {result['path']}")
             quality = result.get("quality", [])
@@ -188,6 +199,169 @@ def run(ctx: click.Context, pipeline_name: str) -> None:
         orch.close()
 
 
+@cli.command("run-all")
+@click.argument("pipelines", nargs=-1)
+@click.option("--parallel", "-j", type=int, default=None, help="Pipelines simultáneos")
+@click.option(
+    "--backend",
+    type=click.Choice(["thread", "process"]),
+    default=None,
+    help="Threads de este proceso o procesos worker (default: settings.dag_backend)",
+)
+@click.option("--dry-run", is_flag=True, help="Mostrar el orden de ejecución sin correr nada")
+@click.pass_context
+def run_all(
+    ctx: click.Context, pipelines: tuple, parallel: int | None, backend: str | None, dry_run: bool
+) -> None:
+    """Ejecutar pipelines en orden de dependencias (todos si no se nombran)."""
+    from ducklake.core.dag import DagRunner
+    from ducklake.core.orchestrator import Orchestrator
+
+    orch = Orchestrator(ctx.obj["config_path"], ctx.obj["data_path"])
+    try:
+        names = list(pipelines) or None
+        if dry_run:
+            for i, level in enumerate(DagRunner(orch, max_parallel=parallel).plan(names), 1):
+                click.echo(f"  {i}. {', '.join(level)}")
+            return
+        results = orch.run_all(names, max_parallel=parallel, backend=backend)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    finally:
+        orch.close()
+
+    for name, result in results.items():
+        if result["status"] == "success":
+            click.echo(f"  OK   {name}: {result.get('rows', 0)} rows ({result.get('duration', 0):.1f}s)")
+        else:
+            click.echo(f"  {result['status'].upper()[:4]:<4} {name}: {result.get('error', '')}", err=True)
+    failed = [n for n, r in results.items() if r["status"] != "success"]
+    if failed:
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.argument("sources", nargs=-1, required=True)
+@click.option("--debounce", default=2.0, help="Segundos sin cambios antes de ingerir")
+@click.option("--run-pipelines", is_flag=True, help="Correr los pipelines que dependen de cada fuente")
+@click.option("--polling", is_flag=True, help="Forzar polling en lugar de inotify")
+@click.option("--interval", default=1.0, help="Intervalo del polling en segundos")
+@click.pass_context
+def watch(
+    ctx: click.Context,
+    sources: tuple,
+    debounce: float,
+    run_pipelines: bool,
+    polling: bool,
+    interval: float,
+) -> None:
+    """Ingerir a RAW los archivos nuevos de fuentes CSV apenas aparecen."""
+    from ducklake.core.orchestrator import Orchestrator
+    from ducklake.core.watch import SourceWatch
+
+    orch = Orchestrator(ctx.obj["config_path"], ctx.obj["data_path"])
+    try:
+        watcher = SourceWatch(
+            orch,
+            list(sources),
+            debounce=debounce,
+            run_pipelines=run_pipelines,
+            polling=polling,
+            poll_interval=interval,
+        )
+    except ValueError as e:
+        orch.close()
+        raise click.ClickException(str(e))
+
+    click.echo(f"Vigilando: {', '.join(sources)} (Ctrl+C para salir)")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        orch.close()
+
+
+@cli.command()
+@click.option("--workers", "-w", default=None, type=int, help="Jobs simultáneos (default: settings)")
+@click.option("--history", is_flag=True, help="Mostrar los últimos horarios registrados y salir")
+@click.pass_context
+def scheduler(ctx: click.Context, workers: int | None, history: bool) -> None:
+    """Correr extracciones y pipelines según su schedule (cron)."""
+    from ducklake.core.orchestrator import Orchestrator
+    from ducklake.core.scheduler import Scheduler
+
+    orch = Orchestrator(ctx.obj["config_path"], ctx.obj["data_path"])
+    if history:
+        try:
+            runs = orch.catalog.get_schedule_runs(limit=50)
+        finally:
+            orch.close()
+        for r in runs:
+            delay = f"{r['delay']:.0f}s" if r["delay"] is not None else "-"
+            flag = " LATE" if r["late"] else ""
+            click.echo(
+                f"  {r['scheduled_at']:%Y-%m-%d %H:%M}  {r['status']:<8} {delay:>6}{flag}  "
+                f"{r['job_type']}:{r['job']}  {r['error'] or ''}"
+            )
+        return
+
+    try:
+        sched = Scheduler(orch, max_workers=workers)
+    except ValueError as e:
+        orch.close()
+        raise click.ClickException(str(e))
+
+    click.echo(
+        f"Scheduler: {len(sched.jobs)} job(s), {sched.max_workers} worker(s) (Ctrl+C para salir)"
+    )
+    try:
+        sched.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        orch.close()
+
+
+@cli.command("infer-schema")
+@click.argument("source_name")
+@click.option("--table", "-t", default=None, help="Tabla (default: la primera configurada)")
+@click.option("--sample-size", default=20_480, help="Filas a samplear por archivo (-1 = todas)")
+@click.option("--dry-run", is_flag=True, help="Mostrar el schema sin escribir sources.yaml")
+@click.pass_context
+def infer_schema(
+    ctx: click.Context, source_name: str, table: str | None, sample_size: int, dry_run: bool
+) -> None:
+    """Detectar el schema de una fuente CSV y fijarlo en sources.yaml.
+
+    Con el schema fijo (connection.columns) las extracciones no hacen sniffing
+    y todos los archivos se leen con los mismos tipos.
+    """
+    import yaml
+
+    from ducklake.connectors import get_connector
+    from ducklake.core.config import load_config, update_source_connection
+
+    config_path = ctx.obj["config_path"]
+    config = load_config(config_path)
+    source = next((s for s in config.sources if s.name == source_name), None)
+    if source is None or source.type != "csv":
+        raise click.ClickException(f"CSV source '{source_name}' not found in config")
+
+    connector = get_connector(source.model_dump())
+    tables = connector.get_tables()
+    table = table or (tables[0] if tables else source_name)
+    columns = connector.infer_schema(table, sample_size=sample_size)
+    if not columns:
+        raise click.ClickException(f"No CSV files found for '{source_name}'")
+
+    click.echo(yaml.safe_dump({"columns": columns}, sort_keys=False).rstrip())
+    if not dry_run:
+        path = update_source_connection(config_path, source_name, {"columns": columns})
+        click.echo(f"Schema fijado en {path} ({len(columns)} columnas)")
+
+
 @cli.command()
 @click.option("--extractions", "-e", is_flag=True, help="Mostrar extracciones recientes")
 @click.option("--pipelines", "-p", is_flag=True, help="Mostrar pipelines recientes")
@@ -258,6 +432,143 @@ def status(ctx: click.Context) -> None:
             click.echo(f"  {layer.upper():<10}     0 files       0.0 MB")
 
 
+@cli.command("profile-data")
+@click.argument("layer", type=click.Choice(["raw", "staging", "consume"]))
+@click.argument("table")
+@click.option("--exact", is_flag=True, help="Contar distintos exactos (más lento)")
+@click.option("--top-k", default=5, help="Valores más frecuentes por columna")
+@click.option("--bins", default=10, help="Buckets del histograma")
+@click.pass_context
+def profile_data(
+    ctx: click.Context, layer: str, table: str, exact: bool, top_k: int, bins: int
+) -> None:
+    """Perfilar una tabla (TABLE = dominio/tabla, o fuente/tabla en RAW)."""
+    from ducklake.core.orchestrator import Orchestrator
+
+    orch = Orchestrator(ctx.obj["config_path"], ctx.obj["data_path"])
+    try:
+        result = orch.profile_data(layer, table, exact=exact, top_k=top_k, bins=bins)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    finally:
+        orch.close()
+
+    profile = result["profile"]
+    click.echo(f"{layer}/{table}: {profile['rows']} filas")
+    click.echo(
+        f"{'Column':<24} {'Type':<12} {'Nulls%':>7} {'Distinct':>9} {'Min':<16} {'Max':<16}"
+    )
+    click.echo("-" * 88)
+    for col in profile["columns"]:
+        click.echo(
+            f"{col['column'][:24]:<24} {col['type'][:12]:<12} {col['null_pct']:>7.2f} "
+            f"{str(col.get('distinct', '-')):>9} {str(col.get('min'))[:16]:<16} "
+            f"{str(col.get('max'))[:16]:<16}"
+        )
+        if col.get("top_k"):
+            click.echo(f"{'':<24} top: {', '.join(map(str, col['top_k']))}")
+        if col.get("histogram"):
+            click.echo(f"{'':<24} hist: {' | '.join(map(str, col['histogram']))}")
+
+    if result["previous"] is None:
+        click.echo("\nPrimer perfil de la tabla (guardado en el catálogo)")
+    elif result["changes"]:
+        click.echo(f"\nCambios desde {result['previous']['profiled_at']:%Y-%m-%d %H:%M}:")
+        for change in result["changes"]:
+            click.echo(f"  {change}")
+    else:
+        click.echo("\nSin cambios relevantes desde el perfil anterior")
+
+
+@cli.command()
+@click.option("--dry-run", is_flag=True, help="Mostrar las acciones sin ejecutarlas")
+@click.pass_context
+def tier(ctx: click.Context, dry_run: bool) -> None:
+    """Aplicar la retención de RAW: recomprimir, mover al cold tier y borrar particiones viejas."""
+    from ducklake.core.orchestrator import Orchestrator
+
+    orch = Orchestrator(ctx.obj["config_path"], ctx.obj["data_path"])
+    try:
+        actions = orch.tier_raw(dry_run=dry_run)
+    finally:
+        orch.close()
+
+    if not actions:
+        click.echo("Nada para hacer: ninguna partición alcanzó los umbrales de retención")
+        return
+    for a in actions:
+        line = f"  {a['action']:<10} {a['source']}/{a['table']}/{a['partition']}"
+        if a.get("location") and a["location"] != a["path"]:
+            line += f" -> {a['location']}"
+        if not dry_run:
+            line += f"  ({a['bytes_before'] / 1e6:.1f} MB -> {a['bytes_after'] / 1e6:.1f} MB)"
+        click.echo(line)
+    if dry_run:
+        click.echo(f"{len(actions)} acción(es) pendientes (dry run)")
+    else:
+        saved = sum(a["bytes_before"] - a["bytes_after"] for a in actions)
+        click.echo(f"{len(actions)} acción(es), {saved / 1e6:.1f} MB menos en disco")
+
+
+@cli.command()
+@click.argument("table")
+@click.argument("key", nargs=-1, required=True)
+@click.option("--json", "as_json", is_flag=True, help="Imprimir filas como JSON (una por línea)")
+@click.pass_context
+def lookup(ctx: click.Context, table: str, key: tuple, as_json: bool) -> None:
+    """Buscar filas de STAGING por clave (TABLE = dominio/tabla, KEY = valores del índice)."""
+    import json
+    import time
+
+    from ducklake.layers import StagingLayer
+
+    domain, _, name = table.rpartition("/")
+    if not domain or not name:
+        raise click.BadParameter(f"Tabla inválida: {table}", param_hint="TABLE")
+
+    start = time.time()
+    layer = StagingLayer(ctx.obj["data_path"])
+    try:
+        relation = layer.lookup({"domain": domain, "table": name}, list(key))
+        columns, rows = relation.columns, relation.fetchall()
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    finally:
+        layer.conn.close()
+
+    for row in rows:
+        if as_json:
+            click.echo(json.dumps(dict(zip(columns, row)), default=str))
+        else:
+            click.echo("  ".join(f"{c}={v}" for c, v in zip(columns, row)))
+    click.echo(f"{len(rows)} fila(s) en {(time.time() - start) * 1000:.0f} ms", err=True)
+
+
+@cli.command()
+@click.option("--host", default="127.0.0.1", help="Interfaz donde escuchar")
+@click.option("--port", default=8765, help="Puerto HTTP")
+@click.option("--staging", is_flag=True, help="Exponer también las tablas de STAGING")
+@click.option("--cache-mb", default=256, help="Tamaño máximo del cache de resultados (MB)")
+@click.pass_context
+def serve(ctx: click.Context, host: str, port: int, staging: bool, cache_mb: int) -> None:
+    """Exponer las tablas de CONSUME por HTTP (Arrow IPC, Parquet o JSON)."""
+    from ducklake.core.config import load_config
+    from ducklake.core.server import serve as run_server
+
+    settings = load_config(ctx.obj["config_path"]).settings
+    layers = ("consume", "staging") if staging else ("consume",)
+    click.echo(f"Sirviendo {', '.join(layers)} en http://{host}:{port} (Ctrl+C para salir)")
+    run_server(
+        ctx.obj["data_path"],
+        host=host,
+        port=port,
+        layers=layers,
+        cache_bytes=cache_mb * 1024 * 1024,
+        memory_limit=settings.duckdb_memory_limit,
+        threads=settings.duckdb_threads,
+    )
+
+
 def main() -> None:
     """Entry point."""
     cli()
@@ -5,10 +5,12 @@ from typing import Any, Dict
 from ducklake.connectors.base import BaseConnector
 from ducklake.connectors.csv_connector import CSVConnector
 from ducklake.connectors.mysql import MySQLConnector
+from ducklake.connectors.postgres import PostgresConnector
 
 _CONNECTOR_MAP: Dict[str, type] = {
     "mysql": MySQLConnector,
     "csv": CSVConnector,
+    "postgres": PostgresConnector,
 }
 
 
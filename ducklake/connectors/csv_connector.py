@@ -1,22 +1,26 @@
 """Conector para archivos CSV."""
 
 import glob
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict
 
 import duckdb
-import pyarrow as pa
-import pyarrow.parquet as pq
 from loguru import logger
 
 from ducklake.core.base import BaseConnector
+from ducklake.utils.duckdb_helper import get_row_count
 
 
 class CSVConnector(BaseConnector):
     """Conector para extraer datos de archivos CSV a Parquet.
 
     Soporta archivos individuales y patrones glob.
-    Usa DuckDB para lectura eficiente de CSV grandes.
+    Usa DuckDB para lectura eficiente de CSV grandes. Con ``connection.columns``
+    el schema queda fijo: DuckDB no hace sniffing por archivo y todos los
+    archivos se parsean con los mismos tipos.
     """
 
     def __init__(self, config: Dict[str, Any]):
@@ -28,11 +32,22 @@ class CSVConnector(BaseConnector):
             self.encoding = conn_cfg.get("encoding", "utf-8")
             self.header = conn_cfg.get("header", True)
             self.skip_rows = conn_cfg.get("skip_rows", 0)
+            columns = conn_cfg.get("columns")
         else:
             self.delimiter = getattr(conn_cfg, "delimiter", ",")
             self.encoding = getattr(conn_cfg, "encoding", "utf-8")
             self.header = getattr(conn_cfg, "header", True)
             self.skip_rows = getattr(conn_cfg, "skip_rows", 0)
+            columns = getattr(conn_cfg, "columns", None)
+        # Schema fijo {columna: tipo}: si está, se lee sin sniffing (ver infer_schema)
+        self.columns: Dict[str, str] | None = dict(columns) if columns else None
+
+        extract_cfg = config.get("extract", {})
+        if not isinstance(extract_cfg, dict):
+            extract_cfg = extract_cfg.model_dump()
+        # Archivos convertidos en simultáneo en modo incremental
+        self.parallelism = int(extract_cfg.get("parallelism") or min(8, os.cpu_count() or 1))
+        self._ingested_files: list[Dict[str, Any]] = []
 
     def validate_connection(self) -> bool:
         """Validar que los archivos CSV existen."""
@@ -46,58 +61,301 @@ class CSVConnector(BaseConnector):
     def extract(self, table: str, output_path: str, **kwargs: Any) -> str:
         """Extraer CSV a Parquet usando DuckDB.
 
+        En modo ``full`` une todos los archivos en un único parquet. En modo
+        ``incremental`` solo convierte los archivos nuevos o modificados
+        respecto de ``ingested_files`` (estado registrado en el Catalog), en
+        paralelo y a un archivo part por CSV. En modo ``tail`` lee solo los
+        bytes agregados al final de cada archivo desde el último offset.
+
         Args:
             table: Nombre lógico (usado como label, el path real viene de config).
             output_path: Path donde guardar el parquet.
+            **kwargs: ``ingested_files`` con {path: {size, mtime, hash}}.
 
         Returns:
-            Path del archivo parquet creado.
+            Path del archivo parquet creado, o directorio con los archivos part.
         """
         # Si hay tablas configuradas, buscar por nombre; sino usar el path global
         csv_path = self._get_csv_path(table)
-        files = glob.glob(csv_path)
+        files = sorted(glob.glob(csv_path))
         if not files:
             raise FileNotFoundError(f"No CSV files found: {csv_path}")
 
+        self._ingested_files = []
+        mode = self.get_extract_mode()
+        if mode == "incremental":
+            return self._extract_incremental(
+                table, files, kwargs.get("ingested_files") or {}, output_path
+            )
+        if mode == "tail":
+            return self._extract_tail(table, files, kwargs.get("ingested_files") or {}, output_path)
+
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = duckdb.connect()
+        try:
+            rows = self._copy_to_parquet(conn, files, output_path)
+        finally:
+            conn.close()
+
+        logger.info(f"CSV extract: {table} -> {rows} rows -> {output_path}")
+        return output_path
+
+    def get_ingested_files(self) -> list[Dict[str, Any]]:
+        """Archivos convertidos en el último extract incremental."""
+        return list(self._ingested_files)
+
+    def _extract_incremental(
+        self,
+        table: str,
+        files: list[str],
+        known: Dict[str, Dict[str, Any]],
+        output_path: str,
+    ) -> str:
+        """Convertir solo archivos nuevos o modificados, uno por part, en paralelo.
+
+        Un archivo con igual size y mtime que el registrado se saltea sin leerlo.
+        Si cambió el mtime pero el hash del contenido es el mismo, solo se
+        actualiza su estado.
+
+        Returns:
+            Directorio con los archivos part (vacío si no hubo cambios).
+        """
+        output_dir = Path(output_path).with_suffix("")
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        pending = []
+        for f in files:
+            st = os.stat(f)
+            prev = known.get(f)
+            if prev and prev["size"] == st.st_size and prev["mtime"] == st.st_mtime:
+                continue
+            pending.append((f, st, prev))
+
+        if not pending:
+            logger.info(f"CSV extract: {table} -> no new or modified files")
+            return str(output_dir)
+
+        workers = min(self.parallelism, len(pending))
+        threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+
+        def convert(i: int) -> tuple[Dict[str, Any], int]:
+            f, st, prev = pending[i]
+            state = {
+                "path": f,
+                "size": st.st_size,
+                "mtime": st.st_mtime,
+                "hash": _file_hash(f),
+            }
+            if prev and prev.get("hash") == state["hash"]:
+                return state, 0
+            conn = duckdb.connect(config={"threads": threads_per_worker})
+            try:
+                rows = self._copy_to_parquet(conn, [f], str(output_dir / f"part-{i:04d}.parquet"))
+            finally:
+                conn.close()
+            return state, rows
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(convert, range(len(pending))))
+
+        self._ingested_files = [state for state, _ in results]
+        rows = sum(r for _, r in results)
+        converted = len(list(output_dir.glob("*.parquet")))
+        logger.info(
+            f"CSV extract: {table} -> {rows} rows from {converted} new/modified files "
+            f"({len(files) - len(pending)} unchanged) -> {output_dir}"
+        )
+        return str(output_dir)
+
+    def _extract_tail(
+        self,
+        table: str,
+        files: list[str],
+        known: Dict[str, Dict[str, Any]],
+        output_path: str,
+    ) -> str:
+        """Ingerir solo los bytes agregados a cada archivo desde el último offset.
+
+        El corte se hace en el último fin de línea fuera de comillas, así una
+        fila a medio escribir queda para la próxima corrida. Los bloques
+        siguientes se parsean con el schema detectado en la primera ingesta.
+        Si el archivo se truncó o se rotó (cambió su comienzo), se relee entero.
+
+        Returns:
+            Directorio con un archivo part por archivo con datos nuevos.
+        """
+        output_dir = Path(output_path).with_suffix("")
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        def tail(i: int) -> tuple[Dict[str, Any] | None, int]:
+            return self._tail_file(files[i], known.get(files[i]), output_dir, i)
+
+        workers = min(self.parallelism, len(files))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(tail, range(len(files))))
+
+        self._ingested_files = [state for state, _ in results if state is not None]
+        rows = sum(r for _, r in results)
+        logger.info(
+            f"CSV tail: {table} -> {rows} new rows from {len(self._ingested_files)} files "
+            f"-> {output_dir}"
+        )
+        return str(output_dir)
+
+    def _tail_file(
+        self, path: str, prev: Dict[str, Any] | None, output_dir: Path, index: int
+    ) -> tuple[Dict[str, Any] | None, int]:
+        """Convertir a parquet los bytes nuevos de un archivo.
+
+        Returns:
+            (nuevo estado del archivo o None si no hubo cambios, filas escritas).
+        """
+        st = os.stat(path)
+        offset = int(prev.get("offset") or 0) if prev else 0
+        schema = prev.get("schema") if prev else None
+        line_count = int(prev.get("lines") or 0) if prev else 0
+
+        if offset > 0:
+            if st.st_size < offset:
+                logger.warning(f"CSV tail: {path} truncated, re-reading from start")
+                offset = 0
+            elif _head_hash(path, offset) != prev.get("head_hash"):
+                logger.warning(f"CSV tail: {path} rotated, re-reading from start")
+                offset = 0
+            elif st.st_size == offset:
+                return None, 0
+        if offset == 0:
+            schema, line_count = self.columns, 0
+
+        chunk_path = output_dir / f"chunk-{index:04d}.csv"
+        end, new_lines = _copy_complete_lines(path, offset, st.st_size, str(chunk_path))
+        if end == offset:
+            chunk_path.unlink(missing_ok=True)
+            return None, 0
+
+        part_path = str(output_dir / f"part-{index:04d}.parquet")
         conn = duckdb.connect()
         try:
-            # DuckDB lee CSV de forma eficiente
-            options = [
-                f"delim='{self.delimiter}'",
-                f"header={'true' if self.header else 'false'}",
-            ]
-            if self.skip_rows > 0:
-                options.append(f"skip={self.skip_rows}")
-
-            opts_str = ", ".join(options)
-
-            if len(files) == 1:
-                read_expr = f"read_csv('{files[0]}', {opts_str})"
+            if offset == 0:
+                # Primera ingesta (o relectura): header y tipos se detectan una vez
+                rows = self._copy_to_parquet(conn, [str(chunk_path)], part_path)
+                described = conn.execute(
+                    "DESCRIBE SELECT * EXCLUDE (_ingestion_timestamp, _source_name) "
+                    f"FROM read_parquet('{part_path}')"
+                ).fetchall()
+                schema = {r[0]: r[1] for r in described}
             else:
-                file_list = ", ".join(f"'{f}'" for f in files)
-                read_expr = f"read_csv([{file_list}], {opts_str})"
-
-            # Agregar metadata
-            query = f"""
-                SELECT *,
-                    CURRENT_TIMESTAMP AS _ingestion_timestamp,
-                    '{self.name}' AS _source_name
-                FROM {read_expr}
-            """
-
-            result = conn.execute(query).arrow()
+                rows = self._copy_to_parquet(
+                    conn, [str(chunk_path)], part_path, columns=schema, header=False
+                )
         finally:
             conn.close()
+            chunk_path.unlink(missing_ok=True)
 
-        # Escribir a Parquet
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        pq.write_table(result, output_path, compression="snappy")
+        state = {
+            "path": path,
+            "size": st.st_size,
+            "mtime": st.st_mtime,
+            "hash": None,
+            "offset": end,
+            "lines": line_count + new_lines,
+            "head_hash": _head_hash(path, end),
+            "schema": schema,
+        }
+        return state, rows
 
-        logger.info(f"CSV extract: {table} -> {result.num_rows} rows -> {output_path}")
-        return output_path
+    def _copy_to_parquet(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        files: list[str],
+        output_path: str,
+        columns: Dict[str, str] | None = None,
+        header: bool | None = None,
+    ) -> int:
+        """Leer CSVs con DuckDB y escribirlos a Parquet sin pasar por Python.
+
+        Args:
+            conn: Conexión DuckDB.
+            files: Archivos CSV a leer.
+            output_path: Parquet destino.
+            columns: Schema explícito {columna: tipo} (default: el fijado en la
+                config). Si hay schema, DuckDB no hace auto-detección.
+            header: Si los archivos traen header (default: config). Los bloques
+                de modo tail se leen con ``header=False``.
+
+        Returns:
+            Cantidad de filas escritas.
+        """
+        opts_str = self._read_options(columns, header)
+
+        if len(files) == 1:
+            read_expr = f"read_csv('{files[0]}', {opts_str})"
+        else:
+            file_list = ", ".join(f"'{f}'" for f in files)
+            read_expr = f"read_csv([{file_list}], {opts_str})"
+
+        # Agregar metadata
+        query = f"""
+            SELECT *,
+                CURRENT_TIMESTAMP AS _ingestion_timestamp,
+                '{self.name}' AS _source_name
+            FROM {read_expr}
+        """
+        conn.execute(f"COPY ({query}) TO '{output_path}' (FORMAT parquet, COMPRESSION snappy)")
+        return get_row_count(conn, output_path)
+
+    def _read_options(
+        self, columns: Dict[str, str] | None = None, header: bool | None = None
+    ) -> str:
+        """Opciones de read_csv según la config (delimitador, header, schema fijo)."""
+        columns = columns if columns is not None else self.columns
+        header = self.header if header is None else header
+        options = [
+            f"delim='{self.delimiter}'",
+            f"header={'true' if header else 'false'}",
+        ]
+        if header and self.skip_rows > 0:
+            options.append(f"skip={self.skip_rows}")
+        if columns:
+            cols = ", ".join(f"'{name}': '{dtype}'" for name, dtype in columns.items())
+            options += ["auto_detect=false", f"columns={{{cols}}}"]
+        return ", ".join(options)
+
+    def infer_schema(self, table: str, sample_size: int = 20_480) -> Dict[str, str]:
+        """Detectar el schema de los CSV una sola vez, ignorando el schema fijado.
+
+        Se samplean todos los archivos del patrón para que los tipos sirvan
+        para cualquiera de ellos (el resultado va a ``connection.columns``).
+
+        Args:
+            table: Nombre lógico de la tabla.
+            sample_size: Filas a samplear por archivo (-1 = archivo completo).
+
+        Returns:
+            Dict con {columna: tipo DuckDB}.
+        """
+        files = sorted(glob.glob(self._get_csv_path(table)))
+        if not files:
+            return {}
+
+        file_list = ", ".join(f"'{f}'" for f in files)
+        opts = f"delim='{self.delimiter}', header={'true' if self.header else 'false'}"
+        if self.header and self.skip_rows > 0:
+            opts += f", skip={self.skip_rows}"
+        conn = duckdb.connect()
+        try:
+            rows = conn.execute(
+                f"DESCRIBE SELECT * FROM read_csv([{file_list}], {opts}, "
+                f"sample_size={sample_size})"
+            ).fetchall()
+        finally:
+            conn.close()
+        return {r[0]: r[1] for r in rows}
 
     def get_schema(self, table: str) -> Dict[str, str]:
-        """Obtener schema de un CSV leyendo las primeras filas."""
+        """Obtener schema de un CSV (el fijado en config, o leyendo las primeras filas)."""
+        if self.columns:
+            return dict(self.columns)
         csv_path = self._get_csv_path(table)
         files = glob.glob(csv_path)
         if not files:
@@ -138,3 +396,59 @@ class CSVConnector(BaseConnector):
                     return t.get("path", "")
         # Fallback al path global
         return self.csv_path or ""
+
+
+def _file_hash(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 del contenido de un archivo, leído por bloques."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_HEAD_BYTES = 64 * 1024
+
+
+def _head_hash(path: str, limit: int) -> str:
+    """Hash de los primeros bytes de un archivo (hasta ``limit``), para detectar rotación."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read(min(limit, _HEAD_BYTES))).hexdigest()
+
+
+def _copy_complete_lines(
+    path: str, start: int, stop: int, dest: str, chunk_size: int = 8 * 1024 * 1024
+) -> tuple[int, int]:
+    """Copiar bytes [start, stop) a ``dest`` hasta el último fin de línea seguro.
+
+    Un fin de línea es seguro si está fuera de un campo entre comillas (cantidad
+    par de comillas desde ``start``, que siempre es un inicio de registro).
+
+    Returns:
+        (offset absoluto hasta donde se copió, cantidad de líneas copiadas).
+    """
+    quotes = 0
+    newlines = 0
+    last_safe = start
+    lines_at_safe = 0
+    pos = start
+    with open(path, "rb") as src, open(dest, "wb") as out:
+        src.seek(start)
+        while pos < stop:
+            block = src.read(min(chunk_size, stop - pos))
+            if not block:
+                break
+            out.write(block)
+            # Buscar el último "\n" del bloque con paridad de comillas par
+            idx = block.rfind(b"\n")
+            while idx != -1:
+                if (quotes + block.count(b'"', 0, idx)) % 2 == 0:
+                    last_safe = pos + idx + 1
+                    lines_at_safe = newlines + block.count(b"\n", 0, idx + 1)
+                    break
+                idx = block.rfind(b"\n", 0, idx)
+            quotes += block.count(b'"')
+            newlines += block.count(b"\n")
+            pos += len(block)
+        out.truncate(last_safe - start)
+    return last_safe, lines_at_safe
@@ -1,50 +1,106 @@
 """Conector para MySQL."""
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from decimal import Decimal
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Tuple
 
-import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
+import pymysql
+import pymysql.cursors
 from loguru import logger
+from pymysql.constants import FIELD_TYPE
 
+from ducklake.connectors.pool import ConnectionPool, get_pool
 from ducklake.core.base import BaseConnector
+from ducklake.utils.parquet_helper import add_ingestion_metadata
+
+# Tipos MySQL (cursor.description) -> tipos Arrow.
+# Strings, blobs, JSON y enums se infieren del primer batch (str vs bytes).
+_MYSQL_TO_ARROW: Dict[int, pa.DataType] = {
+    FIELD_TYPE.TINY: pa.int64(),
+    FIELD_TYPE.SHORT: pa.int64(),
+    FIELD_TYPE.LONG: pa.int64(),
+    FIELD_TYPE.INT24: pa.int64(),
+    FIELD_TYPE.LONGLONG: pa.int64(),
+    FIELD_TYPE.YEAR: pa.int64(),
+    FIELD_TYPE.FLOAT: pa.float64(),
+    FIELD_TYPE.DOUBLE: pa.float64(),
+    FIELD_TYPE.DATE: pa.date32(),
+    FIELD_TYPE.NEWDATE: pa.date32(),
+    FIELD_TYPE.DATETIME: pa.timestamp("us"),
+    FIELD_TYPE.TIMESTAMP: pa.timestamp("us"),
+    FIELD_TYPE.TIME: pa.duration("us"),
+}
+
+_DECIMAL_TYPES = (FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL)
 
 
 class MySQLConnector(BaseConnector):
-    """Conector para extraer datos de MySQL a Parquet."""
+    """Conector para extraer datos de MySQL a Parquet.
+
+    Lee con un cursor server-side (sin buffer del lado cliente) en lotes de
+    ``extract.batch_size`` filas y escribe record batches con ``ParquetWriter``.
+    Con ``extract.split_column`` y ``extract.num_splits > 1`` divide la tabla en
+    rangos que se extraen en paralelo, cada uno con su propia conexión y su
+    propio archivo part.
+
+    Las conexiones salen de un pool por proceso (``connection.pool_size``), así
+    validate/extract/get_schema y las corridas siguientes reutilizan las mismas
+    sesiones en lugar de repetir el handshake TCP + auth.
+    """
 
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         conn_cfg = config.get("connection", {})
-        if isinstance(conn_cfg, dict):
-            self.connection_params = {
-                "host": conn_cfg.get("host", "localhost"),
-                "port": int(conn_cfg.get("port", 3306)),
-                "database": conn_cfg.get("database", ""),
-                "user": conn_cfg.get("user", ""),
-                "password": conn_cfg.get("password", ""),
-            }
-        else:
-            self.connection_params = {
-                "host": conn_cfg.host,
-                "port": conn_cfg.port,
-                "database": conn_cfg.database,
-                "user": conn_cfg.user,
-                "password": conn_cfg.password,
-            }
+        if not isinstance(conn_cfg, dict):
+            conn_cfg = conn_cfg.model_dump()
+        self.connection_params = {
+            "host": conn_cfg.get("host", "localhost"),
+            "port": int(conn_cfg.get("port") or 3306),
+            "database": conn_cfg.get("database", ""),
+            "user": conn_cfg.get("user", ""),
+            "password": conn_cfg.get("password", ""),
+            # Cada query ve datos frescos aunque la conexión se reutilice
+            "autocommit": True,
+        }
+        extract_cfg = config.get("extract", {})
+        if not isinstance(extract_cfg, dict):
+            extract_cfg = extract_cfg.model_dump()
+        parallelism = extract_cfg.get("parallelism") or extract_cfg.get("num_splits") or 1
+        self.pool_size = int(conn_cfg.get("pool_size") or max(4, parallelism))
+        self.pool_recycle = float(conn_cfg.get("pool_recycle") or 3600)
+        self._schemas: Dict[str, Dict[str, str]] = {}
 
     def _get_connection(self) -> Any:
         """Crear conexión pymysql."""
-        import pymysql
-
         return pymysql.connect(**self.connection_params)
 
+    def _pool(self) -> ConnectionPool:
+        """Pool compartido para estos parámetros de conexión."""
+        key = ("mysql",) + tuple(sorted(self.connection_params.items()))
+        return get_pool(
+            key,
+            self._get_connection,
+            size=self.pool_size,
+            check=_ping,
+            recycle_seconds=self.pool_recycle,
+        )
+
+    @contextmanager
+    def _connection(self) -> Iterator[Any]:
+        """Tomar una conexión del pool."""
+        with self._pool().connection() as conn:
+            yield conn
+
     def validate_connection(self) -> bool:
         """Validar conexión a MySQL."""
         try:
-            conn = self._get_connection()
-            conn.close()
+            with self._connection():
+                pass
             logger.info(f"MySQL connection OK: {self.name}")
             return True
         except Exception as e:
@@ -59,54 +115,344 @@ class MySQLConnector(BaseConnector):
             output_path: Path donde guardar el parquet.
 
         Returns:
-            Path del archivo parquet creado.
+            Path del archivo parquet creado, o directorio con los archivos part
+            si la extracción se dividió en rangos.
         """
         mode = self.get_extract_mode()
         extract_cfg = self.config.get("extract", {})
-        if isinstance(extract_cfg, dict):
-            batch_size = extract_cfg.get("batch_size", 10_000)
-            key_column = extract_cfg.get("key_column")
-        else:
-            batch_size = extract_cfg.batch_size
-            key_column = extract_cfg.key_column
+        if not isinstance(extract_cfg, dict):
+            extract_cfg = extract_cfg.model_dump()
+        batch_size = extract_cfg.get("batch_size") or 10_000
+        key_column = extract_cfg.get("key_column")
+        row_filter = extract_cfg.get("filter")
+        split_column = extract_cfg.get("split_column")
+        num_splits = extract_cfg.get("num_splits") or 1
 
         # Construir query
+        conditions = []
+        params: List[Any] = []
+        if row_filter:
+            conditions.append(f"({row_filter})")
         if mode == "incremental" and key_column:
             last_value = kwargs.get("last_value", "1970-01-01")
-            query = f"SELECT * FROM {table} WHERE {key_column} > %s"
-            params = [last_value]
-        else:
-            query = f"SELECT * FROM {table}"
-            params = None
+            conditions.append(f"{key_column} > %s")
+            params.append(last_value)
 
-        conn = self._get_connection()
-        try:
-            if params:
-                df = pd.read_sql(query, conn, params=params)
-            else:
-                df = pd.read_sql(query, conn)
-        finally:
-            conn.close()
+        ingestion_ts = datetime.now()
 
-        # Agregar metadata de ingestión
-        df["_ingestion_timestamp"] = pd.Timestamp.now()
-        df["_source_name"] = self.name
+        if split_column and num_splits > 1:
+            return self._extract_split(
+                table, output_path, conditions, params, extract_cfg, ingestion_ts
+            )
 
-        # Escribir a Parquet
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        pa_table = pa.Table.from_pandas(df)
-        pq.write_table(pa_table, output_path, compression="snappy")
+        query = f"SELECT * FROM {table}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        with self._connection() as conn:
+            rows = self._stream_query(conn, query, params, output_path, batch_size, ingestion_ts)
 
-        logger.info(f"MySQL extract: {table} -> {len(df)} rows -> {output_path}")
+        logger.info(f"MySQL extract: {table} -> {rows} rows -> {output_path}")
         return output_path
 
     def get_schema(self, table: str) -> Dict[str, str]:
-        """Obtener schema de una tabla MySQL."""
-        conn = self._get_connection()
-        try:
+        """Obtener schema de una tabla MySQL.
+
+        La primera llamada trae en una sola query los schemas de todas las
+        tablas configuradas; las siguientes salen del cache.
+        """
+        if table not in self._schemas:
+            tables = {t for t in self.get_tables() if isinstance(t, str)} | {table}
+            self._schemas.update(self.get_schemas(sorted(tables)))
+        return self._schemas.get(table, {})
+
+    def get_schemas(self, tables: List[str]) -> Dict[str, Dict[str, str]]:
+        """Obtener schemas de varias tablas con una única query a information_schema.
+
+        Args:
+            tables: Nombres de tablas de la base configurada.
+
+        Returns:
+            Dict con {tabla: {columna: tipo}}, tipos como en ``DESCRIBE``.
+        """
+        if not tables:
+            return {}
+        placeholders = ", ".join(["%s"] * len(tables))
+        with self._connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(f"DESCRIBE `{table}`")
-            schema = {row[0]: row[1] for row in cursor.fetchall()}
+            try:
+                cursor.execute(
+                    f"""
+                    SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE
+                    FROM information_schema.COLUMNS
+                    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN ({placeholders})
+                    ORDER BY TABLE_NAME, ORDINAL_POSITION
+                    """,
+                    list(tables),
+                )
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+
+        schemas: Dict[str, Dict[str, str]] = {t: {} for t in tables}
+        for table_name, column, column_type in rows:
+            schemas.setdefault(table_name, {})[column] = column_type
+        return schemas
+
+    # ------------------------------------------------------------------
+    # Extracción particionada por rangos
+    # ------------------------------------------------------------------
+
+    def _extract_split(
+        self,
+        table: str,
+        output_path: str,
+        conditions: List[str],
+        params: List[Any],
+        extract_cfg: Dict[str, Any],
+        ingestion_ts: datetime,
+    ) -> str:
+        """Extraer una tabla en N rangos de ``split_column`` en paralelo.
+
+        Cada rango se escribe en ``{output_dir}/part-NNNN.parquet``.
+
+        Returns:
+            Directorio con los archivos part.
+        """
+        split_column = extract_cfg["split_column"]
+        num_splits = extract_cfg["num_splits"]
+        batch_size = extract_cfg.get("batch_size") or 10_000
+        strategy = extract_cfg.get("split_strategy") or "minmax"
+        workers = extract_cfg.get("parallelism") or num_splits
+
+        with self._connection() as conn:
+            if strategy == "quantiles":
+                cuts = self._quantile_cuts(conn, table, split_column, num_splits, conditions, params)
+            else:
+                cuts = self._minmax_cuts(conn, table, split_column, num_splits, conditions, params)
+
+        ranges = _build_ranges(split_column, cuts)
+        output_dir = Path(output_path).with_suffix("")
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        def extract_range(i: int) -> int:
+            range_cond, range_params = ranges[i]
+            where = " AND ".join(conditions + [range_cond])
+            query = f"SELECT * FROM {table} WHERE {where}"
+            part_path = str(output_dir / f"part-{i:04d}.parquet")
+            with self._connection() as part_conn:
+                return self._stream_query(
+                    part_conn, query, params + range_params, part_path, batch_size, ingestion_ts
+                )
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            rows = sum(executor.map(extract_range, range(len(ranges))))
+
+        logger.info(
+            f"MySQL extract: {table} -> {rows} rows in {len(ranges)} parts "
+            f"({split_column}, {strategy}) -> {output_dir}"
+        )
+        return str(output_dir)
+
+    def _minmax_cuts(
+        self,
+        conn: Any,
+        table: str,
+        column: str,
+        num_splits: int,
+        conditions: List[str],
+        params: List[Any],
+    ) -> List[Any]:
+        """Puntos de corte equiespaciados entre MIN y MAX de la columna."""
+        query = f"SELECT MIN({column}), MAX({column}) FROM {table}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        cursor = conn.cursor()
+        cursor.execute(query, params or None)
+        low, high = cursor.fetchone()
+        cursor.close()
+        if low is None or high is None or low == high:
+            return []
+        return _interpolate_cuts(low, high, num_splits)
+
+    def _quantile_cuts(
+        self,
+        conn: Any,
+        table: str,
+        column: str,
+        num_splits: int,
+        conditions: List[str],
+        params: List[Any],
+        sample_size: int = 100_000,
+    ) -> List[Any]:
+        """Puntos de corte según cuantiles de una muestra aleatoria de la columna.
+
+        Útil cuando la columna tiene huecos o una distribución muy sesgada.
+        Sin ``TABLE_ROWS`` (tabla recién analizada, o nombre con schema que no
+        aparece en information_schema) no hay con qué calcular la fracción de
+        la muestra: se usan los cortes de MIN/MAX en vez de traer la columna
+        entera.
+        """
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            [table],
+        )
+        row = cursor.fetchone()
+        approx_rows = int(row[0]) if row and row[0] else 0
+        if not approx_rows:
+            cursor.close()
+            logger.warning(
+                f"MySQL extract: no TABLE_ROWS estimate for {table}, "
+                f"using min/max cuts on {column}"
+            )
+            return self._minmax_cuts(conn, table, column, num_splits, conditions, params)
+        fraction = min(1.0, sample_size / approx_rows)
+
+        where = [f"{column} IS NOT NULL"] + conditions
+        if fraction < 1.0:
+            where.append(f"RAND() < {fraction:.8f}")
+        cursor.execute(
+            f"SELECT {column} FROM {table} WHERE {' AND '.join(where)}", params or None
+        )
+        sample = sorted(r[0] for r in cursor.fetchall())
+        cursor.close()
+        if not sample:
+            return []
+
+        cuts: List[Any] = []
+        for i in range(1, num_splits):
+            value = sample[(i * len(sample)) // num_splits]
+            if (not cuts or value > cuts[-1]) and value > sample[0]:
+                cuts.append(value)
+        return cuts
+
+    # ------------------------------------------------------------------
+    # Streaming a Parquet
+    # ------------------------------------------------------------------
+
+    def _stream_query(
+        self,
+        conn: Any,
+        query: str,
+        params: List[Any],
+        output_path: str,
+        batch_size: int,
+        ingestion_ts: datetime,
+    ) -> int:
+        """Ejecutar una query con cursor server-side y escribirla a Parquet por lotes.
+
+        Returns:
+            Cantidad de filas escritas.
+        """
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        cursor = conn.cursor(pymysql.cursors.SSCursor)
+        writer: pq.ParquetWriter | None = None
+        rows = 0
+        try:
+            cursor.execute(query, params or None)
+            names = [d[0] for d in cursor.description]
+            types = [_arrow_type(d) for d in cursor.description]
+            schema: pa.Schema | None = None
+
+            while True:
+                chunk = cursor.fetchmany(batch_size)
+                if not chunk:
+                    break
+                columns = list(zip(*chunk))
+                if schema is None:
+                    schema = pa.schema(
+                        (name, t if t is not None else _infer_type(values))
+                        for name, t, values in zip(names, types, columns)
+                    )
+                batch = pa.RecordBatch.from_arrays(
+                    [pa.array(values, type=f.type) for values, f in zip(columns, schema)],
+                    schema=schema,
+                )
+                batch = add_ingestion_metadata(batch, ingestion_ts, self.name)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, batch.schema, compression="snappy")
+                writer.write_batch(batch)
+                rows += len(chunk)
+
+            if writer is None:
+                # Sin filas: parquet vacío con el schema de la query
+                schema = pa.schema(
+                    (name, t if t is not None else pa.string()) for name, t in zip(names, types)
+                )
+                empty = add_ingestion_metadata(
+                    pa.RecordBatch.from_pylist([], schema=schema), ingestion_ts, self.name
+                )
+                writer = pq.ParquetWriter(output_path, empty.schema, compression="snappy")
+                writer.write_batch(empty)
         finally:
-            conn.close()
-        return schema
+            cursor.close()
+            if writer is not None:
+                writer.close()
+        return rows
+
+
+def _ping(conn: Any) -> bool:
+    """Health check del pool: falla si el servidor cerró la sesión."""
+    conn.ping(reconnect=False)
+    return True
+
+
+def _arrow_type(description: Tuple[Any, ...]) -> pa.DataType | None:
+    """Tipo Arrow para una columna de cursor.description (None = inferir)."""
+    type_code = description[1]
+    if type_code in _DECIMAL_TYPES:
+        # description[4] es el largo de la columna: cota superior de la precisión
+        precision = int(description[4] or 65)
+        scale = int(description[5] or 0)
+        if precision <= 38:
+            return pa.decimal128(precision, scale)
+        return pa.decimal256(min(precision, 76), scale)
+    return _MYSQL_TO_ARROW.get(type_code)
+
+
+def _infer_type(values: Tuple[Any, ...]) -> pa.DataType:
+    """Inferir str vs bytes a partir del primer valor no nulo."""
+    for v in values:
+        if v is not None:
+            return pa.binary() if isinstance(v, (bytes, bytearray)) else pa.string()
+    return pa.string()
+
+
+def _interpolate_cuts(low: Any, high: Any, num_splits: int) -> List[Any]:
+    """Generar ``num_splits - 1`` cortes equiespaciados entre low y high.
+
+    Soporta enteros, decimales/float, fechas y timestamps.
+    """
+    cuts: List[Any] = []
+    for i in range(1, num_splits):
+        frac = i / num_splits
+        if isinstance(low, datetime):
+            value: Any = low + (high - low) * frac
+        elif isinstance(low, date):
+            value = low + timedelta(days=int((high - low).days * frac))
+        elif isinstance(low, int):
+            value = low + int((high - low) * frac)
+        elif isinstance(low, Decimal):
+            value = low + (high - low) * Decimal(frac)
+        else:
+            value = low + (high - low) * frac
+        if value > low and (not cuts or value > cuts[-1]):
+            cuts.append(value)
+    return cuts
+
+
+def _build_ranges(column: str, cuts: List[Any]) -> List[Tuple[str, List[Any]]]:
+    """Convertir puntos de corte en condiciones WHERE que cubren toda la tabla.
+
+    El primer rango incluye los NULL y el último no tiene cota superior, así
+    ninguna fila queda afuera aunque haya inserts durante la extracción.
+    """
+    if not cuts:
+        return [("1=1", [])]
+    ranges: List[Tuple[str, List[Any]]] = [(f"({column} < %s OR {column} IS NULL)", [cuts[0]])]
+    for lo, hi in zip(cuts, cuts[1:]):
+        ranges.append((f"{column} >= %s AND {column} < %s", [lo, hi]))
+    ranges.append((f"{column} >= %s", [cuts[-1]]))
+    return ranges
@@ -0,0 +1,150 @@
+"""Pool de conexiones compartido por los conectores de bases de datos."""
+
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Tuple
+
+from loguru import logger
+
+
+class PoolTimeoutError(TimeoutError):
+    """No se liberó ninguna conexión del pool dentro del timeout."""
+
+
+class ConnectionPool:
+    """Pool de conexiones con tamaño acotado, health check y reciclado.
+
+    Las conexiones se crean bajo demanda hasta ``size`` y se devuelven al pool
+    al terminar de usarlas. Antes de entregar una conexión ociosa se valida con
+    ``check``; si falla, o si estuvo ociosa más de ``recycle_seconds``, se
+    descarta y se abre una nueva.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int = 4,
+        check: Callable[[Any], bool] | None = None,
+        recycle_seconds: float = 3600.0,
+        timeout: float = 300.0,
+    ):
+        self.factory = factory
+        self.size = max(1, size)
+        self.check = check
+        self.recycle_seconds = recycle_seconds
+        self.timeout = timeout
+        self._idle: List[Tuple[Any, float]] = []
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self.created = 0
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Tomar una conexión del pool y devolverla al salir del bloque.
+
+        Si el bloque lanza una excepción la conexión se descarta, ya que puede
+        haber quedado con un resultado a medio leer.
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        except BaseException:
+            self.release(conn, discard=True)
+            raise
+        self.release(conn)
+
+    def acquire(self) -> Any:
+        """Obtener una conexión sana, esperando si el pool está lleno."""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                while self._idle:
+                    conn, idle_since = self._idle.pop()
+                    if time.monotonic() - idle_since > self.recycle_seconds:
+                        _close_quietly(conn)
+                        continue
+                    if self.check is not None and not _safe_check(self.check, conn):
+                        logger.debug("Pool: discarding unhealthy connection")
+                        _close_quietly(conn)
+                        continue
+                    self._in_use += 1
+                    return conn
+                if self._in_use < self.size:
+                    self._in_use += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(f"No connection available after {self.timeout}s")
+                self._cond.wait(remaining)
+
+        try:
+            conn = self.factory()
+        except BaseException:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        self.created += 1
+        return conn
+
+    def release(self, conn: Any, discard: bool = False) -> None:
+        """Devolver una conexión al pool (o cerrarla si ``discard``)."""
+        with self._cond:
+            self._in_use -= 1
+            if discard:
+                _close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Cerrar las conexiones ociosas."""
+        with self._cond:
+            for conn, _ in self._idle:
+                _close_quietly(conn)
+            self._idle.clear()
+
+
+_POOLS: Dict[Hashable, ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(key: Hashable, factory: Callable[[], Any], **kwargs: Any) -> ConnectionPool:
+    """Obtener (o crear) el pool del proceso para una clave de conexión.
+
+    Los pools viven a nivel módulo, así se reutilizan entre instancias de
+    conectores y entre ejecuciones del orquestador dentro del mismo proceso.
+    """
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = ConnectionPool(factory, **kwargs)
+            _POOLS[key] = pool
+        return pool
+
+
+def close_all_pools() -> None:
+    """Cerrar todas las conexiones ociosas de todos los pools."""
+    with _POOLS_LOCK:
+        for pool in _POOLS.values():
+            pool.close()
+        _POOLS.clear()
+
+
+def _safe_check(check: Callable[[Any], bool], conn: Any) -> bool:
+    try:
+        return bool(check(conn))
+    except Exception:
+        return False
+
+
+def _close_quietly(conn: Any) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+atexit.register(close_all_pools)
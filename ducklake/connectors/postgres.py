@@ -0,0 +1,277 @@
+"""Conector para PostgreSQL."""
+
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from loguru import logger
+
+from ducklake.core.base import BaseConnector
+from ducklake.utils.parquet_helper import add_ingestion_metadata
+
+# Tipos de information_schema.columns.data_type -> tipos Arrow.
+# Lo que no esté mapeado se lee como string (json, uuid, arrays, etc).
+_PG_TO_ARROW: Dict[str, pa.DataType] = {
+    "smallint": pa.int16(),
+    "integer": pa.int32(),
+    "bigint": pa.int64(),
+    "real": pa.float32(),
+    "double precision": pa.float64(),
+    "boolean": pa.bool_(),
+    "date": pa.date32(),
+    "timestamp without time zone": pa.timestamp("us"),
+    "timestamp with time zone": pa.timestamp("us", tz="UTC"),
+}
+
+
+class PostgresConnector(BaseConnector):
+    """Conector para extraer datos de PostgreSQL a Parquet.
+
+    Usa ``COPY (SELECT ...) TO STDOUT`` y parsea el stream con el lector CSV
+    incremental de Arrow: los datos fluyen por un pipe de tamaño acotado y se
+    escriben como record batches con ``ParquetWriter``, sin cargar la tabla
+    completa en memoria.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        conn_cfg = config.get("connection", {})
+        if not isinstance(conn_cfg, dict):
+            conn_cfg = conn_cfg.model_dump()
+        self.connection_params = {
+            "host": conn_cfg.get("host", "localhost"),
+            "port": int(conn_cfg.get("port") or 5432),
+            "dbname": conn_cfg.get("database", ""),
+            "user": conn_cfg.get("user", ""),
+            "password": conn_cfg.get("password", ""),
+        }
+        self.schema = conn_cfg.get("schema") or "public"
+        # Tamaño de cada bloque que parsea Arrow (bytes de CSV por record batch)
+        self.block_size = int(conn_cfg.get("block_size") or 8 * 1024 * 1024)
+
+    def _get_connection(self) -> Any:
+        """Crear conexión psycopg2."""
+        import psycopg2
+
+        return psycopg2.connect(**self.connection_params)
+
+    def validate_connection(self) -> bool:
+        """Validar conexión a PostgreSQL."""
+        try:
+            conn = self._get_connection()
+            conn.close()
+            logger.info(f"PostgreSQL connection OK: {self.name}")
+            return True
+        except Exception as e:
+            logger.error(f"PostgreSQL connection failed ({self.name}): {e}")
+            return False
+
+    def extract(self, table: str, output_path: str, **kwargs: Any) -> str:
+        """Extraer datos de PostgreSQL a Parquet via COPY en streaming.
+
+        Args:
+            table: Nombre de la tabla (opcionalmente ``schema.tabla``).
+            output_path: Path donde guardar el parquet.
+            **kwargs: ``last_value`` para modo incremental.
+
+        Returns:
+            Path del archivo parquet creado.
+        """
+        mode = self.get_extract_mode()
+        extract_cfg = self.config.get("extract", {})
+        if not isinstance(extract_cfg, dict):
+            extract_cfg = extract_cfg.model_dump()
+        key_column = extract_cfg.get("key_column")
+        row_filter = extract_cfg.get("filter")
+
+        conn = self._get_connection()
+        try:
+            columns = self._fetch_columns(conn, table)
+            if not columns:
+                raise ValueError(f"Table not found or without columns: {table}")
+
+            conditions: List[str] = []
+            params: List[Any] = []
+            if row_filter:
+                conditions.append(f"({row_filter})")
+            if mode == "incremental" and key_column:
+                conditions.append(f"{_quote_ident(key_column)} > %s")
+                params.append(kwargs.get("last_value", "1970-01-01"))
+
+            col_list = ", ".join(_quote_ident(name) for name, _ in columns)
+            select_sql = f"SELECT {col_list} FROM {self._qualified_name(table)}"
+            if conditions:
+                select_sql += " WHERE " + " AND ".join(conditions)
+
+            cursor = conn.cursor()
+            try:
+                # COPY no acepta parámetros: mogrify los escapa del lado cliente
+                if params:
+                    select_sql = cursor.mogrify(select_sql, params).decode()
+                copy_sql = f"COPY ({select_sql}) TO STDOUT WITH (FORMAT csv)"
+                rows = self._stream_copy(cursor, copy_sql, columns, output_path)
+            finally:
+                cursor.close()
+        finally:
+            conn.close()
+
+        logger.info(f"PostgreSQL extract: {table} -> {rows} rows -> {output_path}")
+        return output_path
+
+    def get_schema(self, table: str) -> Dict[str, str]:
+        """Obtener schema de una tabla PostgreSQL desde information_schema."""
+        conn = self._get_connection()
+        try:
+            return {name: data_type for name, (data_type, _, _) in self._fetch_columns(conn, table)}
+        finally:
+            conn.close()
+
+    def _stream_copy(
+        self,
+        cursor: Any,
+        copy_sql: str,
+        columns: List[Tuple[str, Tuple[str, Any, Any]]],
+        output_path: str,
+    ) -> int:
+        """Ejecutar COPY en un thread y escribir el stream a Parquet por batches.
+
+        El thread productor escribe en un pipe; el pipe aplica backpressure, por lo
+        que en memoria solo vive un bloque de ``block_size`` a la vez.
+        """
+        column_names = [name for name, _ in columns]
+        column_types = {name: _to_arrow_type(*info) for name, info in columns}
+
+        read_fd, write_fd = os.pipe()
+        reader = os.fdopen(read_fd, "rb")
+        sink = os.fdopen(write_fd, "wb")
+        errors: List[BaseException] = []
+
+        def produce() -> None:
+            try:
+                cursor.copy_expert(copy_sql, sink)
+            except BaseException as e:  # noqa: BLE001 - se re-lanza en el hilo principal
+                errors.append(e)
+            finally:
+                try:
+                    sink.close()
+                except OSError:
+                    pass
+
+        producer = threading.Thread(target=produce, name=f"pg-copy-{self.name}", daemon=True)
+        producer.start()
+
+        try:
+            rows = self._write_batches(reader, column_names, column_types, output_path)
+        except Exception:
+            # Cerrar el pipe desbloquea al productor; si COPY falló, ese es el error real
+            reader.close()
+            producer.join()
+            copy_error = next((e for e in errors if not isinstance(e, BrokenPipeError)), None)
+            if copy_error is not None:
+                raise copy_error
+            raise
+        finally:
+            reader.close()
+            producer.join()
+
+        if errors:
+            raise errors[0]
+        return rows
+
+    def _write_batches(
+        self,
+        reader: Any,
+        column_names: List[str],
+        column_types: Dict[str, pa.DataType],
+        output_path: str,
+    ) -> int:
+        """Parsear el CSV de COPY por bloques y escribirlo con ParquetWriter."""
+        ingestion_ts = datetime.now()
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+        if not reader.peek(1):
+            # Resultado vacío: parquet sin filas pero con el schema esperado
+            schema = pa.schema([(name, column_types[name]) for name in column_names])
+            empty = add_ingestion_metadata(
+                pa.RecordBatch.from_pylist([], schema=schema), ingestion_ts, self.name
+            )
+            pq.write_table(pa.Table.from_batches([empty]), output_path, compression="snappy")
+            return 0
+
+        stream = pacsv.open_csv(
+            reader,
+            read_options=pacsv.ReadOptions(column_names=column_names, block_size=self.block_size),
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            convert_options=pacsv.ConvertOptions(
+                column_types=column_types,
+                true_values=["t"],
+                false_values=["f"],
+                null_values=[""],
+                strings_can_be_null=True,
+                # COPY csv: NULL es vacío sin comillas, '' es string vacío
+                quoted_strings_can_be_null=False,
+            ),
+        )
+
+        rows = 0
+        writer: pq.ParquetWriter | None = None
+        try:
+            for batch in stream:
+                batch = add_ingestion_metadata(batch, ingestion_ts, self.name)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, batch.schema, compression="snappy")
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    def _fetch_columns(self, conn: Any, table: str) -> List[Tuple[str, Tuple[str, Any, Any]]]:
+        """Leer columnas (nombre, tipo, precisión, escala) en orden ordinal."""
+        schema, name = self._split_table(table)
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                """
+                SELECT column_name, data_type, numeric_precision, numeric_scale
+                FROM information_schema.columns
+                WHERE table_schema = %s AND table_name = %s
+                ORDER BY ordinal_position
+                """,
+                [schema, name],
+            )
+            return [(r[0], (r[1], r[2], r[3])) for r in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def _split_table(self, table: str) -> Tuple[str, str]:
+        """Separar ``schema.tabla``; sin schema usa el de la conexión."""
+        if "." in table:
+            schema, name = table.split(".", 1)
+            return schema, name
+        return self.schema, table
+
+    def _qualified_name(self, table: str) -> str:
+        schema, name = self._split_table(table)
+        return f"{_quote_ident(schema)}.{_quote_ident(name)}"
+
+
+def _quote_ident(name: str) -> str:
+    """Quotear un identificador PostgreSQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _to_arrow_type(data_type: str, precision: Any, scale: Any) -> pa.DataType:
+    """Mapear un tipo de information_schema a Arrow."""
+    if data_type == "numeric":
+        if precision and int(precision) <= 38:
+            return pa.decimal128(int(precision), int(scale or 0))
+        return pa.string()
+    return _PG_TO_ARROW.get(data_type, pa.string())
+
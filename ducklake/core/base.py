@@ -1,13 +1,16 @@
 """Base classes para conectores y capas."""
 
+import re
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 import duckdb
 from loguru import logger
 
+_PARTITION_DATE = re.compile(r"year=(\d{4})/month=(\d{1,2})/day=(\d{1,2})")
+
 
 class BaseConnector(ABC):
     """Clase base para todos los conectores de fuentes de datos."""
@@ -56,6 +59,18 @@ class BaseConnector(ABC):
         """Obtener lista de tablas configuradas."""
         return self.config.get("tables", [])
 
+    def get_ingested_files(self) -> list[Dict[str, Any]]:
+        """Estado de los archivos leídos en el último extract.
+
+        Los conectores basados en archivos lo sobreescriben para que el
+        orquestador registre en el Catalog qué se ingirió (path, size, mtime,
+        hash), una vez que los datos quedaron escritos en RAW.
+
+        Returns:
+            Lista de dicts con el estado de cada archivo (vacía por defecto).
+        """
+        return []
+
 
 class BaseLayer(ABC):
     """Clase base para capas del data lake (RAW, STAGING, CONSUME)."""
@@ -87,17 +102,19 @@ class BaseLayer(ABC):
             Query string o datos.
         """
 
-    def get_partition_path(self, base: str, date: datetime) -> str:
+    def get_partition_path(self, base: str, date: datetime, hourly: bool = False) -> str:
         """Generar path con particionado por fecha.
 
         Args:
             base: Path base.
             date: Fecha para la partición.
+            hourly: Agregar el nivel ``hour=HH``.
 
         Returns:
             Path particionado.
         """
-        return f"{base}/year={date.year}/month={date.month:02d}/day={date.day:02d}"
+        path = f"{base}/year={date.year}/month={date.month:02d}/day={date.day:02d}"
+        return f"{path}/hour={date.hour:02d}" if hourly else path
 
     def ensure_path(self, path: str) -> Path:
         """Crear directorios si no existen.
@@ -111,3 +128,25 @@ class BaseLayer(ABC):
         p = Path(path)
         p.parent.mkdir(parents=True, exist_ok=True)
         return p
+
+
+def select_list(columns: list[str] | None) -> str:
+    """Lista de columnas para un SELECT (``*`` si no hay proyección).
+
+    Args:
+        columns: Nombres de columnas o None.
+
+    Returns:
+        Columnas quoteadas separadas por coma, o ``*``.
+    """
+    if not columns:
+        return "*"
+    return ", ".join('"' + c.replace('"', '""') + '"' for c in columns)
+
+
+def partition_date(partition: str) -> date | None:
+    """Fecha de una partición RAW (``year=YYYY/month=MM/day=DD[/...]``, o un path con ella)."""
+    match = _PARTITION_DATE.search(partition)
+    if match is None:
+        return None
+    return date(*(int(g) for g in match.groups()))
@@ -1,13 +1,30 @@
 """Metadata catalog usando DuckDB."""
 
+import functools
+import json
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, TypeVar
 
 import duckdb
 from loguru import logger
 
 
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _synchronized(method: F) -> F:
+    """Serializar el acceso a la conexión del catálogo (pipelines en threads)."""
+
+    @functools.wraps(method)
+    def wrapper(self: "Catalog", *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
 class Catalog:
     """Catálogo de metadata para tracking de extracciones, pipelines y calidad.
 
@@ -17,6 +34,7 @@ class Catalog:
     def __init__(self, db_path: str):
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         self.conn = duckdb.connect(db_path)
+        self._lock = threading.RLock()
         self._init_tables()
 
     def _init_tables(self) -> None:
@@ -65,6 +83,101 @@ class Catalog:
             );
         """)
 
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS ingested_files (
+                source_name VARCHAR NOT NULL,
+                table_name VARCHAR NOT NULL,
+                file_path VARCHAR NOT NULL,
+                size_bytes BIGINT NOT NULL,
+                mtime DOUBLE NOT NULL,
+                content_hash VARCHAR,
+                ingested_at TIMESTAMP NOT NULL,
+                PRIMARY KEY (source_name, table_name, file_path)
+            );
+        """)
+        # Estado de ingesta tail: offset/líneas ya leídas, hash del comienzo
+        # del archivo (detección de rotación) y schema de la primera lectura
+        for column, dtype in [
+            ("byte_offset", "BIGINT"),
+            ("line_count", "BIGINT"),
+            ("head_hash", "VARCHAR"),
+            ("schema_json", "VARCHAR"),
+        ]:
+            self.conn.execute(
+                f"ALTER TABLE ingested_files ADD COLUMN IF NOT EXISTS {column} {dtype}"
+            )
+
+        # Perfiles de tablas (profile-data): una fila por columna y perfil
+        self.conn.execute("""
+            CREATE SEQUENCE IF NOT EXISTS seq_data_profiles START 1;
+            CREATE TABLE IF NOT EXISTS data_profiles (
+                id INTEGER DEFAULT nextval('seq_data_profiles') PRIMARY KEY,
+                layer VARCHAR NOT NULL,
+                table_name VARCHAR NOT NULL,
+                profiled_at TIMESTAMP NOT NULL,
+                row_count BIGINT NOT NULL,
+                approximate BOOLEAN NOT NULL,
+                column_name VARCHAR NOT NULL,
+                data_type VARCHAR NOT NULL,
+                null_count BIGINT,
+                distinct_count BIGINT,
+                min_value VARCHAR,
+                max_value VARCHAR,
+                stats_json VARCHAR
+            );
+        """)
+
+        # Versiones publicadas de tablas STAGING/CONSUME (ver core.snapshots)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS table_versions (
+                layer VARCHAR NOT NULL,
+                table_name VARCHAR NOT NULL,
+                version VARCHAR NOT NULL,
+                file_path VARCHAR NOT NULL,
+                rows BIGINT,
+                pipeline_name VARCHAR,
+                published_at TIMESTAMP NOT NULL,
+                status VARCHAR NOT NULL,
+                deleted_at TIMESTAMP,
+                PRIMARY KEY (layer, table_name, version)
+            );
+        """)
+
+        # Acciones de retención sobre particiones RAW (ducklake tier)
+        self.conn.execute("""
+            CREATE SEQUENCE IF NOT EXISTS seq_raw_tiering START 1;
+            CREATE TABLE IF NOT EXISTS raw_tiering (
+                id INTEGER DEFAULT nextval('seq_raw_tiering') PRIMARY KEY,
+                source_name VARCHAR NOT NULL,
+                table_name VARCHAR NOT NULL,
+                partition VARCHAR NOT NULL,
+                action VARCHAR NOT NULL,
+                location VARCHAR,
+                files INTEGER,
+                bytes_before BIGINT,
+                bytes_after BIGINT,
+                executed_at TIMESTAMP NOT NULL
+            );
+        """)
+
+        # Corridas del scheduler: una fila por horario (corrido, salteado o perdido)
+        self.conn.execute("""
+            CREATE SEQUENCE IF NOT EXISTS seq_schedule_runs START 1;
+            CREATE TABLE IF NOT EXISTS schedule_runs (
+                id INTEGER DEFAULT nextval('seq_schedule_runs') PRIMARY KEY,
+                job_type VARCHAR NOT NULL,
+                job_name VARCHAR NOT NULL,
+                scheduled_at TIMESTAMP NOT NULL,
+                started_at TIMESTAMP,
+                finished_at TIMESTAMP,
+                delay_seconds DOUBLE,
+                late BOOLEAN DEFAULT false,
+                status VARCHAR NOT NULL,
+                error_message VARCHAR
+            );
+        """)
+
+    @_synchronized
     def register_extraction(
         self,
         source: str,
@@ -87,6 +200,7 @@ class Catalog:
             [source, table, datetime.now(), rows, path, file_size, status, error, duration],
         )
 
+    @_synchronized
     def register_pipeline_run(
         self,
         pipeline_name: str,
@@ -108,6 +222,7 @@ class Catalog:
             [pipeline_name, datetime.now(), source_layer, dest_layer, rows, duration, status, error],
         )
 
+    @_synchronized
     def register_quality_check(
         self,
         pipeline_name: str,
@@ -126,6 +241,291 @@ class Catalog:
             [pipeline_name, table_name, check_type, datetime.now(), passed, details],
         )
 
+    @_synchronized
+    def register_ingested_files(
+        self, source: str, table: str, files: List[Dict[str, Any]]
+    ) -> None:
+        """Registrar (o actualizar) el estado de archivos ingeridos.
+
+        Args:
+            source: Nombre de la fuente.
+            table: Nombre de la tabla.
+            files: Lista de dicts con path, size, mtime y hash; en modo tail
+                también offset, lines, head_hash y schema.
+        """
+        now = datetime.now()
+        for f in files:
+            schema = f.get("schema")
+            self.conn.execute(
+                """
+                INSERT OR REPLACE INTO ingested_files
+                    (source_name, table_name, file_path, size_bytes, mtime,
+                     content_hash, ingested_at, byte_offset, line_count,
+                     head_hash, schema_json)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    source, table, f["path"], f["size"], f["mtime"], f.get("hash"), now,
+                    f.get("offset"), f.get("lines"), f.get("head_hash"),
+                    json.dumps(schema) if schema is not None else None,
+                ],
+            )
+
+    @_synchronized
+    def get_ingested_files(self, source: str, table: str) -> Dict[str, Dict[str, Any]]:
+        """Obtener el estado registrado de los archivos ingeridos de una tabla.
+
+        Returns:
+            Dict con {file_path: {path, size, mtime, hash, offset, lines,
+            head_hash, schema}}.
+        """
+        rows = self.conn.execute(
+            """
+            SELECT file_path, size_bytes, mtime, content_hash,
+                   byte_offset, line_count, head_hash, schema_json
+            FROM ingested_files
+            WHERE source_name = ? AND table_name = ?
+            """,
+            [source, table],
+        ).fetchall()
+        return {
+            r[0]: {
+                "path": r[0],
+                "size": r[1],
+                "mtime": r[2],
+                "hash": r[3],
+                "offset": r[4],
+                "lines": r[5],
+                "head_hash": r[6],
+                "schema": json.loads(r[7]) if r[7] else None,
+            }
+            for r in rows
+        }
+
+    @_synchronized
+    def register_profile(self, layer: str, table: str, profile: Dict[str, Any]) -> None:
+        """Guardar el perfil de una tabla (resultado de ``profile_table``)."""
+        now = datetime.now()
+        base = ("column", "type", "nulls", "distinct", "min", "max")
+        for col in profile["columns"]:
+            extra = {k: v for k, v in col.items() if k not in base}
+            self.conn.execute(
+                """
+                INSERT INTO data_profiles
+                    (layer, table_name, profiled_at, row_count, approximate, column_name,
+                     data_type, null_count, distinct_count, min_value, max_value, stats_json)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    layer, table, now, profile["rows"], profile["approximate"], col["column"],
+                    col["type"], col["nulls"], col.get("distinct"), col.get("min"),
+                    col.get("max"), json.dumps(extra),
+                ],
+            )
+
+    @_synchronized
+    def get_latest_profile(self, layer: str, table: str) -> Optional[Dict[str, Any]]:
+        """Obtener el último perfil guardado de una tabla (mismo formato que ``profile_table``)."""
+        rows = self.conn.execute(
+            """
+            SELECT profiled_at, row_count, approximate, column_name, data_type,
+                   null_count, distinct_count, min_value, max_value, stats_json
+            FROM data_profiles
+            WHERE layer = ? AND table_name = ? AND profiled_at = (
+                SELECT MAX(profiled_at) FROM data_profiles WHERE layer = ? AND table_name = ?
+            )
+            ORDER BY id
+            """,
+            [layer, table, layer, table],
+        ).fetchall()
+        if not rows:
+            return None
+        columns = []
+        for r in rows:
+            col = {"column": r[3], "type": r[4], "nulls": r[5]}
+            if r[6] is not None:
+                col.update({"distinct": r[6], "min": r[7], "max": r[8]})
+            col.update(json.loads(r[9]) if r[9] else {})
+            columns.append(col)
+        return {"profiled_at": rows[0][0], "rows": rows[0][1], "approximate": rows[0][2], "columns": columns}
+
+    @_synchronized
+    def register_table_version(
+        self,
+        layer: str,
+        table: str,
+        version: str,
+        file_path: str,
+        rows: int = 0,
+        pipeline_name: str | None = None,
+    ) -> None:
+        """Registrar la publicación de una versión; la anterior pasa a ``superseded``."""
+        self.conn.execute(
+            """
+            UPDATE table_versions SET status = 'superseded'
+            WHERE layer = ? AND table_name = ? AND status = 'current'
+            """,
+            [layer, table],
+        )
+        self.conn.execute(
+            """
+            INSERT OR REPLACE INTO table_versions
+                (layer, table_name, version, file_path, rows, pipeline_name, published_at, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 'current')
+            """,
+            [layer, table, version, file_path, rows, pipeline_name, datetime.now()],
+        )
+
+    @_synchronized
+    def mark_versions_deleted(self, layer: str, table: str, versions: List[str]) -> None:
+        """Marcar versiones borradas por el GC de snapshots."""
+        if not versions:
+            return
+        self.conn.execute(
+            """
+            UPDATE table_versions SET status = 'deleted', deleted_at = ?
+            WHERE layer = ? AND table_name = ? AND list_contains(?, version)
+            """,
+            [datetime.now(), layer, table, versions],
+        )
+
+    @_synchronized
+    def get_table_versions(self, layer: str, table: str) -> List[Dict[str, Any]]:
+        """Historial de versiones de una tabla, de la más nueva a la más vieja."""
+        rows = self.conn.execute(
+            """
+            SELECT version, file_path, rows, pipeline_name, published_at, status
+            FROM table_versions
+            WHERE layer = ? AND table_name = ?
+            ORDER BY version DESC
+            """,
+            [layer, table],
+        ).fetchall()
+        return [
+            {
+                "version": r[0],
+                "path": r[1],
+                "rows": r[2],
+                "pipeline": r[3],
+                "published_at": r[4],
+                "status": r[5],
+            }
+            for r in rows
+        ]
+
+    @_synchronized
+    def register_tier_action(
+        self,
+        source: str,
+        table: str,
+        partition: str,
+        action: str,
+        location: str | None,
+        files: int = 0,
+        bytes_before: int = 0,
+        bytes_after: int = 0,
+    ) -> None:
+        """Registrar una acción de retención (recompress, move o delete) sobre una partición RAW."""
+        self.conn.execute(
+            """
+            INSERT INTO raw_tiering
+                (source_name, table_name, partition, action, location, files,
+                 bytes_before, bytes_after, executed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [source, table, partition, action, location, files, bytes_before, bytes_after,
+             datetime.now()],
+        )
+
+    @_synchronized
+    def get_raw_partitions(self, source: str, table: str) -> Dict[str, Dict[str, Any]]:
+        """Estado de las particiones RAW tocadas por ``tier`` (sin las borradas).
+
+        Returns:
+            Dict con {partition: {location, action, executed_at}} según la
+            última acción de cada partición.
+        """
+        rows = self.conn.execute(
+            """
+            SELECT partition, location, action, executed_at
+            FROM raw_tiering
+            WHERE source_name = ? AND table_name = ?
+            QUALIFY row_number() OVER (PARTITION BY partition ORDER BY id DESC) = 1
+            """,
+            [source, table],
+        ).fetchall()
+        return {
+            r[0]: {"location": r[1], "action": r[2], "executed_at": r[3]}
+            for r in rows
+            if r[2] != "delete"
+        }
+
+    @_synchronized
+    def register_schedule_run(
+        self,
+        job_type: str,
+        job_name: str,
+        scheduled_at: datetime,
+        status: str,
+        started_at: datetime | None = None,
+        finished_at: datetime | None = None,
+        late: bool = False,
+        error: str | None = None,
+    ) -> None:
+        """Registrar un horario del scheduler.
+
+        ``status``: success/error (corrió), missed (el scheduler no estaba
+        corriendo o el job seguía en cola) o skipped (había otra corrida de la
+        misma fuente en curso).
+        """
+        delay = (started_at - scheduled_at).total_seconds() if started_at else None
+        self.conn.execute(
+            """
+            INSERT INTO schedule_runs
+                (job_type, job_name, scheduled_at, started_at, finished_at,
+                 delay_seconds, late, status, error_message)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [job_type, job_name, scheduled_at, started_at, finished_at, delay, late, status, error],
+        )
+
+    @_synchronized
+    def get_last_scheduled(self, job_type: str, job_name: str) -> Optional[datetime]:
+        """Último horario registrado de un job del scheduler (corrido o no)."""
+        result = self.conn.execute(
+            "SELECT MAX(scheduled_at) FROM schedule_runs WHERE job_type = ? AND job_name = ?",
+            [job_type, job_name],
+        ).fetchone()
+        return result[0] if result else None
+
+    @_synchronized
+    def get_schedule_runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Horarios del scheduler más recientes."""
+        rows = self.conn.execute(
+            """
+            SELECT job_type, job_name, scheduled_at, started_at, delay_seconds,
+                   late, status, error_message
+            FROM schedule_runs
+            ORDER BY scheduled_at DESC, id DESC
+            LIMIT ?
+            """,
+            [limit],
+        ).fetchall()
+        return [
+            {
+                "job_type": r[0],
+                "job": r[1],
+                "scheduled_at": r[2],
+                "started_at": r[3],
+                "delay": r[4],
+                "late": r[5],
+                "status": r[6],
+                "error": r[7],
+            }
+            for r in rows
+        ]
+
+    @_synchronized
     def get_last_extraction(self, source: str, table: str) -> Optional[datetime]:
         """Obtener timestamp de la última extracción exitosa."""
         result = self.conn.execute(
@@ -138,6 +538,7 @@ class Catalog:
         ).fetchone()
         return result[0] if result and result[0] else None
 
+    @_synchronized
     def get_recent_extractions(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Obtener las extracciones más recientes."""
         rows = self.conn.execute(
@@ -162,6 +563,7 @@ class Catalog:
             for r in rows
         ]
 
+    @_synchronized
     def get_recent_pipeline_runs(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Obtener las ejecuciones de pipelines más recientes."""
         rows = self.conn.execute(
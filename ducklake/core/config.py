@@ -7,7 +7,7 @@ from typing import Any, Dict, List, Literal, Optional
 
 import yaml
 from loguru import logger
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 
 # ---------------------------------------------------------------------------
@@ -15,9 +15,15 @@ from pydantic import BaseModel, Field, field_validator
 # ---------------------------------------------------------------------------
 
 class ConnectionConfig(BaseModel):
-    """Configuración de conexión a una fuente."""
+    """Configuración de conexión a una fuente.
+
+    Los campos extra (delimiter, schema, etc.) se preservan para el conector.
+    El puerto por defecto lo define cada conector (3306 MySQL, 5432 PostgreSQL).
+    """
+    model_config = ConfigDict(extra="allow")
+
     host: str = "localhost"
-    port: int = 3306
+    port: int | None = None
     database: str = ""
     user: str = ""
     password: str = ""
@@ -25,10 +31,17 @@ class ConnectionConfig(BaseModel):
 
 class ExtractConfig(BaseModel):
     """Configuración de extracción."""
-    mode: Literal["full", "incremental"] = "full"
+    mode: Literal["full", "incremental", "tail"] = "full"
     key_column: str | None = None
+    filter: str | None = None  # Condición WHERE aplicada en el servidor
     batch_size: int = 10_000
     schedule: str | None = None
+    # Extracción paralela por rangos de una columna numérica o fecha
+    split_column: str | None = None
+    num_splits: int = 1
+    split_strategy: Literal["minmax", "quantiles"] = "minmax"
+    parallelism: int | None = None  # Conexiones/archivos en simultáneo
+    raw_partition: Literal["day", "hour"] = "day"  # Granularidad de las particiones en RAW
 
 
 class SourceConfig(BaseModel):
@@ -42,6 +55,16 @@ class SourceConfig(BaseModel):
     extract: ExtractConfig = Field(default_factory=ExtractConfig)
 
 
+class AsofFeatureConfig(BaseModel):
+    """Tabla de features de STAGING para un ``asof_join``."""
+    domain: str
+    table: str
+    timestamp: str | None = None  # Default: el timestamp del label
+    keys: List[str] | None = None  # Default: las claves del label
+    columns: List[str] | None = None  # Default: todas menos claves y timestamp
+    prefix: str = ""  # Obligatorio si alguna columna se llama igual que otra de la salida
+
+
 class TransformConfig(BaseModel):
     """Configuración de una transformación."""
     type: str
@@ -49,6 +72,25 @@ class TransformConfig(BaseModel):
     condition: str | None = None
     keys: List[str] | None = None
     sql: str | None = None
+    group_by: List[str] | None = None
+    aggregations: List[str] | None = None
+    strategy: Literal["window", "bucketed"] | None = None  # Dedup: bucketed = fuera de memoria
+    buckets: int | None = None
+    parallelism: int | None = None
+    timestamp: str | None = None  # asof_join: columna de tiempo del label
+    features: List[AsofFeatureConfig] | None = None
+    strict: bool = False  # asof_join: solo features estrictamente anteriores al label
+    incremental: bool = False  # aggregate: rollup incremental (SUM/COUNT/MIN/MAX/AVG)
+    watermark_column: str | None = None  # Default: _ingestion_timestamp
+    full_refresh_every: int | None = None  # Recalcular y verificar cada N corridas (default 30)
+    key_name: str | None = None  # hash_key: columna de la surrogate key (default hash_key)
+    key_type: Literal["md5", "int64", "int128"] = "md5"  # hash_key: VARCHAR, UBIGINT o UUID
+
+    @model_validator(mode="after")
+    def _check_asof_join(self) -> "TransformConfig":
+        if self.type == "asof_join" and not (self.keys and self.timestamp):
+            raise ValueError("asof_join requires 'keys' and 'timestamp' (label time column)")
+        return self
 
 
 class QualityCheckConfig(BaseModel):
@@ -59,6 +101,25 @@ class QualityCheckConfig(BaseModel):
     values: List[Any] | None = None
     min_value: float | None = None
     max_value: float | None = None
+    # unique: fallar con la estimación de HyperLogLog si hay duplicados seguro
+    # (sino, check exacto por buckets del hash); distinct_count: pasar al exacto
+    # solo cerca de los límites
+    approximate: bool = False
+    max_error: float = Field(default=0.05, gt=0, lt=1)
+    bucket_keys: int | None = Field(default=None, gt=0)  # unique: claves por bucket (default 5M)
+
+
+class LlmExportConfig(BaseModel):
+    """Export de documentos para LLM/RAG en shards JSONL (destino CONSUME)."""
+    template: str  # str.format con las columnas de cada fila: "{titulo}\n\n{cuerpo}"
+    id_column: str  # Id del documento (numérico o string); define los rangos de shards
+    metadata_columns: List[str] = Field(default_factory=list)
+    chunk_size: int = 2000
+    chunk_overlap: int = 0
+    chunk_unit: Literal["chars", "tokens"] = "chars"  # tokens requiere tiktoken
+    shard_rows: int = 10_000  # Filas por shard (se re-parte al duplicarse)
+    compression: Literal["gzip", "none"] = "gzip"
+    parallelism: int | None = None
 
 
 class LayerRef(BaseModel):
@@ -66,6 +127,24 @@ class LayerRef(BaseModel):
     layer: str
     domain: str = ""
     table: str = ""
+    arrow_ipc: Literal["uncompressed", "lz4"] | None = None  # CONSUME: además escribir data.arrow
+    arrow_ipc_batch_rows: int | None = None  # Filas por batch de data.arrow (None = default)
+    llm_export: LlmExportConfig | None = None  # CONSUME: además escribir shards JSONL
+    index: List[str] | None = None  # STAGING: columnas clave con índice para lookups
+
+
+class ResourcesConfig(BaseModel):
+    """Recursos propios de un pipeline (pisan los de settings en su conexión)."""
+    memory_limit: str | None = None  # ej. "12GB"
+    threads: int | None = None
+    temp_directory: str | None = None  # Spill a disco (ej. un SSD local)
+
+
+class PartitionedConfig(BaseModel):
+    """Ejecución particionada de un pipeline RAW -> STAGING (map por fechas y merge)."""
+    group_days: int = Field(default=1, ge=1)  # Particiones de fecha por grupo del map
+    workers: int | None = None  # Grupos en simultáneo (default: min(4, CPUs))
+    backend: Literal["thread", "process"] = "thread"
 
 
 class PipelineConfig(BaseModel):
@@ -76,6 +155,20 @@ class PipelineConfig(BaseModel):
     destination: LayerRef
     transforms: List[TransformConfig] = Field(default_factory=list)
     quality_checks: List[QualityCheckConfig] = Field(default_factory=list)
+    select: List[str] | None = None  # Columnas de salida (habilita leer menos columnas)
+    resources: ResourcesConfig | None = None
+    depends_on: List[str] = Field(default_factory=list)  # Además de las dependencias por tablas
+    partitioned: PartitionedConfig | None = None
+    schedule: str | None = None  # Cron para ``ducklake scheduler``
+
+
+class RawRetentionConfig(BaseModel):
+    """Política de retención y cold tier de RAW (``ducklake tier``)."""
+    recompress_after_days: int | None = 30  # Reescribir con zstd + row groups grandes
+    compression_level: int = Field(default=19, ge=1, le=22)
+    row_group_size: int = 1_000_000
+    cold_path: str | None = None  # Mover las particiones recomprimidas a este directorio/mount
+    delete_after_days: int | None = None  # Horizonte de retención (None = nunca borrar)
 
 
 class SettingsConfig(BaseModel):
@@ -86,6 +179,18 @@ class SettingsConfig(BaseModel):
     log_file: str | None = None
     duckdb_memory_limit: str = "4GB"
     duckdb_threads: int = 4
+    # Versiones viejas de STAGING/CONSUME: se borran este tiempo después de ser reemplazadas
+    snapshot_retention_hours: float = 24
+    raw_retention: RawRetentionConfig = Field(default_factory=RawRetentionConfig)
+    # Runner del DAG (run-all): pipelines en paralelo y presupuesto total de recursos
+    max_parallel_pipelines: int = 1
+    dag_memory_budget: str | None = None  # None = duckdb_memory_limit * max_parallel_pipelines
+    dag_threads_budget: int | None = None  # None = duckdb_threads * max_parallel_pipelines
+    # thread: un proceso, una conexión por pipeline; process: un proceso worker por pipeline
+    dag_backend: Literal["thread", "process"] = "thread"
+    # ducklake scheduler: jobs simultáneos y demora tolerada antes de marcar un inicio tarde
+    scheduler_workers: int = 2
+    scheduler_grace_seconds: float = 60
 
 
 class DuckLakeConfig(BaseModel):
@@ -177,3 +282,41 @@ def load_config(config_path: str = "./config") -> DuckLakeConfig:
         f"Config loaded: {len(config.sources)} sources, {len(config.pipelines)} pipelines"
     )
     return config
+
+
+def update_source_connection(
+    config_path: str, source_name: str, values: Dict[str, Any]
+) -> Path:
+    """Actualizar claves de ``connection`` de una fuente en sources.yaml.
+
+    El archivo se lee sin resolver variables de entorno, así los ``${VAR}``
+    se preservan. Los comentarios del YAML no se conservan.
+
+    Args:
+        config_path: Directorio de configuración.
+        source_name: Nombre de la fuente.
+        values: Claves a setear dentro de ``connection``.
+
+    Returns:
+        Path del sources.yaml actualizado.
+
+    Raises:
+        ValueError: Si la fuente no existe en sources.yaml.
+    """
+    path = Path(config_path) / "sources.yaml"
+    with open(path, "r", encoding="utf-8") as f:
+        raw = yaml.safe_load(f) or {}
+
+    sources = raw.get("sources", []) if isinstance(raw, dict) else []
+    for src in sources:
+        if src.get("name") == source_name:
+            connection = src.get("connection") or {}
+            connection.update(values)
+            src["connection"] = connection
+            break
+    else:
+        raise ValueError(f"Source '{source_name}' not found in {path}")
+
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(raw, f, sort_keys=False, allow_unicode=True)
+    return path
@@ -0,0 +1,211 @@
+"""DAG de pipelines: dependencias por tablas y ejecución en paralelo con presupuesto de recursos."""
+
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from loguru import logger
+
+from ducklake.core import workers
+from ducklake.core.config import LayerRef, PipelineConfig
+from ducklake.utils.duckdb_helper import parse_memory_limit
+
+
+def _table_key(ref: LayerRef) -> Tuple[str, str, str]:
+    return (ref.layer, ref.domain, ref.table)
+
+
+def build_dag(pipelines: List[PipelineConfig]) -> Dict[str, Set[str]]:
+    """Calcular de qué pipelines depende cada pipeline.
+
+    Un pipeline depende del que escribe su tabla de origen (y las tablas de
+    features de un ``asof_join``), más los que liste en ``depends_on``.
+
+    Returns:
+        Dict ``{pipeline: {pipelines de los que depende}}``.
+
+    Raises:
+        ValueError: Si ``depends_on`` nombra un pipeline inexistente.
+    """
+    producers = {_table_key(p.destination): p.name for p in pipelines}
+    names = {p.name for p in pipelines}
+    deps: Dict[str, Set[str]] = {}
+    for p in pipelines:
+        reads = [_table_key(p.source)]
+        for t in p.transforms:
+            reads += [("staging", f.domain, f.table) for f in t.features or []]
+        deps[p.name] = {producers[k] for k in reads if k in producers} - {p.name}
+        unknown = set(p.depends_on) - names
+        if unknown:
+            raise ValueError(f"Pipeline '{p.name}' depends on unknown pipelines: {sorted(unknown)}")
+        deps[p.name] |= set(p.depends_on)
+    return deps
+
+
+def topological_levels(deps: Dict[str, Set[str]]) -> List[List[str]]:
+    """Agrupar los pipelines en niveles: cada nivel solo depende de los anteriores.
+
+    Raises:
+        ValueError: Si hay un ciclo.
+    """
+    remaining = {name: set(d) & deps.keys() for name, d in deps.items()}
+    levels = []
+    while remaining:
+        level = sorted(name for name, d in remaining.items() if not d)
+        if not level:
+            raise ValueError(f"Dependency cycle between pipelines: {sorted(remaining)}")
+        levels.append(level)
+        for name in level:
+            del remaining[name]
+        for d in remaining.values():
+            d.difference_update(level)
+    return levels
+
+
+def downstream(deps: Dict[str, Set[str]], roots: Set[str]) -> Set[str]:
+    """``roots`` más todos los pipelines que dependen de ellos (directa o indirectamente)."""
+    selected = set(roots)
+    changed = True
+    while changed:
+        added = {name for name, d in deps.items() if name not in selected and d & selected}
+        selected |= added
+        changed = bool(added)
+    return selected
+
+
+class DagRunner:
+    """Ejecuta pipelines respetando dependencias, en paralelo dentro de un presupuesto.
+
+    Cada pipeline ocupa la memoria y los threads de su ``resources`` (o los
+    de settings). Los pipelines listos se recorren en orden (nivel, nombre)
+    y arranca cada uno que entre en lo que queda del presupuesto; uno que
+    no entra espera a que terminen otros. Un pipeline que pide más que todo
+    el presupuesto corre solo.
+
+    Backends: ``thread`` corre los pipelines en threads de este proceso, cada
+    uno con su conexión; ``process`` los corre en procesos worker (ver
+    ``workers``), útil cuando hay muchos pipelines chicos y el overhead de
+    Python pesa más que la query.
+    """
+
+    def __init__(
+        self,
+        orchestrator: Any,
+        max_parallel: int | None = None,
+        memory_budget: str | None = None,
+        threads_budget: int | None = None,
+        backend: str | None = None,
+    ):
+        settings = orchestrator.config.settings
+        self.orchestrator = orchestrator
+        self.backend = backend or settings.dag_backend
+        if self.backend not in ("thread", "process"):
+            raise ValueError(f"Unknown DAG backend: {self.backend}")
+        self.max_parallel = max_parallel or settings.max_parallel_pipelines
+        memory_budget = memory_budget or settings.dag_memory_budget
+        self.memory_budget = (
+            parse_memory_limit(memory_budget)
+            if memory_budget
+            else parse_memory_limit(settings.duckdb_memory_limit) * self.max_parallel
+        )
+        self.threads_budget = (
+            threads_budget or settings.dag_threads_budget or settings.duckdb_threads * self.max_parallel
+        )
+
+    def plan(self, names: List[str] | None = None) -> List[List[str]]:
+        """Niveles de ejecución de los pipelines seleccionados (todos si ``names`` es None)."""
+        return topological_levels(self._selected_deps(names))
+
+    def run(self, names: List[str] | None = None) -> Dict[str, Dict[str, Any]]:
+        """Ejecutar los pipelines seleccionados (todos si ``names`` es None).
+
+        Si un pipeline falla, los que dependen de él no se ejecutan
+        (``status: skipped``).
+
+        Returns:
+            Dict ``{pipeline: resultado}``.
+        """
+        deps = self._selected_deps(names)
+        order = [name for level in topological_levels(deps) for name in level]
+        needs = {name: self.orchestrator.pipeline_resources(name) for name in order}
+        results: Dict[str, Dict[str, Any]] = {}
+        running: Dict[Future, str] = {}
+        used = {"memory": 0, "threads": 0}
+        pool, submit, collect = self._executor()
+
+        with pool:
+            while len(results) < len(order):
+                for name in order:
+                    if name in results or name in running.values():
+                        continue
+                    failed = [d for d in deps[name] if results.get(d, {}).get("status") in ("error", "skipped")]
+                    if failed:
+                        logger.warning(f"Skipping {name}: dependency failed ({', '.join(sorted(failed))})")
+                        results[name] = {
+                            "status": "skipped",
+                            "pipeline": name,
+                            "error": f"Dependency failed: {', '.join(sorted(failed))}",
+                        }
+                        continue
+                    if any(d not in results for d in deps[name]):
+                        continue
+                    if not self._fits(needs[name], used, len(running)):
+                        continue
+                    used["memory"] += needs[name]["memory"]
+                    used["threads"] += needs[name]["threads"]
+                    running[submit(name)] = name
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    used["memory"] -= needs[name]["memory"]
+                    used["threads"] -= needs[name]["threads"]
+                    try:
+                        results[name] = collect(future)
+                    except Exception as e:
+                        results[name] = {"status": "error", "pipeline": name, "error": str(e)}
+        return {name: results[name] for name in order}
+
+    def _executor(self) -> Tuple[Executor, Callable[[str], Future], Callable[[Future], Dict[str, Any]]]:
+        """Pool del backend y cómo mandarle un pipeline y leer su resultado."""
+        orch = self.orchestrator
+        if self.backend == "process":
+            pool: Executor = workers.process_pool(orch, self.max_parallel)
+
+            def submit(name: str) -> Future:
+                return pool.submit(workers.run_in_worker, name, workers.catalog_snapshot(orch, name))
+
+            def collect(future: Future) -> Dict[str, Any]:
+                return workers.replay(orch.catalog, *future.result())
+
+            return pool, submit, collect
+
+        pool = ThreadPoolExecutor(max_workers=self.max_parallel)
+        isolated = self.max_parallel > 1
+
+        def submit_thread(name: str) -> Future:
+            return pool.submit(orch.run_pipeline, name, isolated=isolated)
+
+        return pool, submit_thread, Future.result
+
+    def _fits(self, need: Dict[str, int], used: Dict[str, int], running: int) -> bool:
+        if running == 0:
+            if need["memory"] > self.memory_budget or need["threads"] > self.threads_budget:
+                logger.warning(f"Pipeline needs more than the DAG budget ({need}); running it alone")
+            return True
+        return (
+            running < self.max_parallel
+            and used["memory"] + need["memory"] <= self.memory_budget
+            and used["threads"] + need["threads"] <= self.threads_budget
+        )
+
+    def _selected_deps(self, names: List[str] | None) -> Dict[str, Set[str]]:
+        """Dependencias restringidas a los pipelines seleccionados."""
+        deps = build_dag(self.orchestrator.config.pipelines)
+        if names is None:
+            return deps
+        unknown = set(names) - deps.keys()
+        if unknown:
+            raise ValueError(f"Unknown pipelines: {sorted(unknown)}")
+        return {name: deps[name] & set(names) for name in names}
@@ -1,5 +1,7 @@
 """Pipeline orchestrator."""
 
+import glob
+import shutil
 import time
 from pathlib import Path
 from typing import Any, Dict
@@ -7,10 +9,19 @@ from typing import Any, Dict
 from loguru import logger
 
 from ducklake.connectors import get_connector
+from ducklake.core import snapshots
 from ducklake.core.catalog import Catalog
 from ducklake.core.config import DuckLakeConfig, load_config
+from ducklake.core.dag import DagRunner
+from ducklake.core.projection import project_columns, required_columns, source_key_columns
+from ducklake.core.tiering import run_tiering
 from ducklake.layers import ConsumeLayer, RawLayer, StagingLayer
-from ducklake.utils.duckdb_helper import create_connection
+from ducklake.transformations.partitioned import group_files
+from ducklake.transformations.validation import compare_profiles, profile_table
+from ducklake.utils.duckdb_helper import create_connection, parse_memory_limit
+
+# Buckets del hash para --sample: resolución de 0.0001%
+SAMPLE_MODULUS = 1_000_000
 
 
 class Orchestrator:
@@ -22,10 +33,17 @@ class Orchestrator:
     - Registrar todo en el Catalog
     """
 
-    def __init__(self, config_path: str = "./config", data_path: str = "./data"):
+    def __init__(
+        self,
+        config_path: str = "./config",
+        data_path: str = "./data",
+        catalog: Catalog | None = None,
+    ):
         self.config = load_config(config_path)
+        self.config_path = config_path
         self.data_path = data_path
-        self.catalog = Catalog(f"{data_path}/catalog.duckdb")
+        # Los workers del backend ``process`` pasan un catálogo propio (ver ``workers``)
+        self.catalog = catalog or Catalog(f"{data_path}/catalog.duckdb")
 
         # Conexión DuckDB compartida
         settings = self.config.settings
@@ -75,20 +93,53 @@ class Orchestrator:
 
                 # Pasar last_value para incremental
                 kwargs: Dict[str, Any] = {}
-                if connector.get_extract_mode() == "incremental":
+                if connector.get_extract_mode() in ("incremental", "tail"):
                     last_date = self.catalog.get_last_extraction(source_name, table)
                     if last_date:
                         kwargs["last_value"] = str(last_date)
+                    kwargs["ingested_files"] = self.catalog.get_ingested_files(
+                        source_name, table
+                    )
+
+                extracted_path = connector.extract(table, temp_path, **kwargs)
+
+                extracted = Path(extracted_path)
+                if extracted.is_dir() and not any(extracted.glob("*.parquet")):
+                    # Incremental sin datos nuevos: nada que escribir en RAW
+                    self.catalog.register_ingested_files(
+                        source_name, table, connector.get_ingested_files()
+                    )
+                    shutil.rmtree(extracted_path, ignore_errors=True)
+                    self.catalog.register_extraction(
+                        source=source_name,
+                        table=table,
+                        rows=0,
+                        path="",
+                        status="success",
+                        duration=time.time() - start,
+                    )
+                    results[table] = {"status": "success", "path": "", "rows": 0}
+                    logger.info(f"  {table}: no new data")
+                    continue
+
+                # Mover a RAW layer (archivo único o directorio de parts)
+                raw_path = self.raw.write(
+                    extracted_path,
+                    {
+                        "source": source_name,
+                        "table": table,
+                        "partition": source_config["extract"]["raw_partition"],
+                    },
+                )
+                self.catalog.register_ingested_files(
+                    source_name, table, connector.get_ingested_files()
+                )
 
-                connector.extract(table, temp_path, **kwargs)
-
-                # Mover a RAW layer
-                raw_path = self.raw.write(temp_path, {"source": source_name, "table": table})
-
-                # Contar filas
-                row_count = self.conn.execute(
-                    f"SELECT COUNT(*) FROM read_parquet('{raw_path}')"
-                ).fetchone()[0]
+                # Contar filas (cursor propio: el scheduler corre extracciones en threads)
+                with self.conn.cursor() as cursor:
+                    row_count = cursor.execute(
+                        f"SELECT COUNT(*) FROM read_parquet('{raw_path}')"
+                    ).fetchone()[0]
 
                 duration = time.time() - start
 
@@ -99,7 +150,7 @@ class Orchestrator:
                     rows=row_count,
                     path=raw_path,
                     status="success",
-                    file_size=Path(raw_path).stat().st_size,
+                    file_size=sum(Path(f).stat().st_size for f in glob.glob(raw_path)),
                     duration=duration,
                 )
 
@@ -107,6 +158,8 @@ class Orchestrator:
                 logger.success(f"  {table}: {row_count} rows extracted")
 
                 # Limpiar temporal
+                if Path(extracted_path).is_dir():
+                    shutil.rmtree(extracted_path, ignore_errors=True)
                 Path(temp_path).unlink(missing_ok=True)
 
             except Exception as e:
@@ -125,16 +178,39 @@ class Orchestrator:
 
         return results
 
-    def run_pipeline(self, pipeline_name: str) -> Dict[str, Any]:
+    def run_pipeline(
+        self,
+        pipeline_name: str,
+        sample: float | None = None,
+        limit_files: int | None = None,
+        isolated: bool = False,
+    ) -> Dict[str, Any]:
         """Ejecutar un pipeline (RAW->STAGING o STAGING->CONSUME).
 
+        Con ``sample`` o ``limit_files`` corre en modo desarrollo: lee una
+        muestra determinística y escribe en ``{data}/_scratch``, sin tocar las
+        salidas reales ni el catálogo.
+
+        Un pipeline a STAGING con ``partitioned`` procesa los grupos de
+        particiones de RAW en paralelo y después los combina (en modo
+        desarrollo corre sin particionar).
+
+        Si el pipeline declara ``resources`` (o con ``isolated``, como lo usa
+        el runner del DAG para correr pipelines en paralelo) se ejecuta en una
+        conexión propia con esos límites, que se cierra al terminar; la
+        conexión compartida no cambia.
+
         Args:
             pipeline_name: Nombre del pipeline (como en pipelines.yaml).
+            sample: Porcentaje de filas a leer (0-100).
+            limit_files: Leer solo los N archivos RAW más recientes.
+            isolated: Usar una conexión propia aunque no declare ``resources``.
 
         Returns:
             Dict con status, output path, rows, duration.
         """
         logger.info(f"Running pipeline: {pipeline_name}")
+        dev_mode = sample is not None or limit_files is not None
 
         pipeline_config = self._get_pipeline_config(pipeline_name)
         if not pipeline_config:
@@ -145,18 +221,61 @@ class Orchestrator:
         dest_layer = p_dict["destination"]["layer"]
         source_layer = p_dict["source"]["layer"]
 
+        conn = self.conn
+        raw, staging, consume = self.raw, self.staging, self.consume
+        if p_dict.get("resources") or isolated:
+            conn = self._pipeline_connection(p_dict.get("resources"))
+            raw = RawLayer(self.data_path, conn)
+            staging = StagingLayer(self.data_path, conn)
+            consume = ConsumeLayer(self.data_path, conn)
+        real_staging = staging
+        if dev_mode:
+            scratch = f"{self.data_path}/_scratch"
+            staging = StagingLayer(scratch, conn)
+            consume = ConsumeLayer(scratch, conn)
+
         try:
             if dest_layer == "staging":
                 # RAW -> STAGING
-                raw_query = self.raw.read(p_dict["source"])
-                result = self.staging.process(p_dict, raw_query)
+                p_dict["source"]["locations"] = self._cold_locations(p_dict["source"])
+                source = self._project_source(raw, p_dict)
+                if limit_files:
+                    source["files"] = raw.list_files(source)[-limit_files:]
+                raw_query = self._sample_query(raw.read(source), p_dict, sample)
+                if p_dict.get("partitioned") and not dev_mode:
+                    group_days = p_dict["partitioned"]["group_days"]
+                    groups = group_files(raw.list_files(source), group_days)
+                    if not groups:
+                        raise ValueError(f"No RAW files for {source['domain']}/{source['table']}")
+                    group_queries = [raw.read({**source, "files": files}) for files in groups]
+                    result = staging.process_partitioned(p_dict, raw_query, group_queries)
+                else:
+                    result = staging.process(p_dict, raw_query)
             elif dest_layer == "consume":
                 # STAGING -> CONSUME
-                staging_query = self.staging.read(p_dict["source"])
-                result = self.consume.process(p_dict, staging_query)
+                if p_dict.get("partitioned"):
+                    raise ValueError("partitioned execution requires a RAW -> STAGING pipeline")
+                source = self._project_source(real_staging, p_dict)
+                staging_query = self._sample_query(real_staging.read(source), p_dict, sample)
+                # Las tablas de features de un asof_join se leen siempre del STAGING real
+                for t in p_dict.get("transforms", []):
+                    for feature in t.get("features") or []:
+                        feature["query"] = real_staging.read(
+                            {"domain": feature["domain"], "table": feature["table"]}
+                        )
+                result = consume.process(p_dict, staging_query)
             else:
                 raise ValueError(f"Unsupported destination layer: {dest_layer}")
 
+            if dev_mode:
+                layer = staging if dest_layer == "staging" else consume
+                snapshots.collect_garbage(
+                    layer.table_dir(p_dict["destination"]),
+                    self.config.settings.snapshot_retention_hours * 3600,
+                )
+                logger.info(f"Sample run of {pipeline_name}: output in {result.get('path')}")
+                return result
+
             self.catalog.register_pipeline_run(
                 pipeline_name=pipeline_name,
                 source_layer=source_layer,
@@ -165,6 +284,7 @@ class Orchestrator:
                 status="success",
                 duration=result.get("duration", 0),
             )
+            self._publish_version(pipeline_name, p_dict["destination"], result)
 
             # Registrar quality checks
             for qr in result.get("quality", []):
@@ -179,6 +299,9 @@ class Orchestrator:
             return result
 
         except Exception as e:
+            if dev_mode:
+                logger.error(f"Sample run of {pipeline_name} failed: {e}")
+                return {"status": "error", "pipeline": pipeline_name, "error": str(e)}
             self.catalog.register_pipeline_run(
                 pipeline_name=pipeline_name,
                 source_layer=source_layer,
@@ -189,6 +312,179 @@ class Orchestrator:
             )
             logger.error(f"Pipeline {pipeline_name} failed: {e}")
             return {"status": "error", "pipeline": pipeline_name, "error": str(e)}
+        finally:
+            if conn is not self.conn:
+                conn.close()
+
+    def run_all(
+        self,
+        names: list[str] | None = None,
+        max_parallel: int | None = None,
+        backend: str | None = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Ejecutar pipelines en orden de dependencias (ver ``DagRunner``).
+
+        Args:
+            names: Pipelines a correr (None = todos).
+            max_parallel: Pipelines simultáneos (default: ``settings.max_parallel_pipelines``).
+            backend: ``thread`` o ``process`` (default: ``settings.dag_backend``).
+
+        Returns:
+            Dict ``{pipeline: resultado}``.
+        """
+        return DagRunner(self, max_parallel=max_parallel, backend=backend).run(names)
+
+    def pipeline_resources(self, pipeline_name: str) -> Dict[str, Any]:
+        """Memoria (bytes) y threads que usa un pipeline: sus ``resources`` o los de settings."""
+        settings = self.config.settings
+        resources = self._get_pipeline_config(pipeline_name).resources
+        memory = (resources and resources.memory_limit) or settings.duckdb_memory_limit
+        return {
+            "memory": parse_memory_limit(memory),
+            "threads": (resources and resources.threads) or settings.duckdb_threads,
+        }
+
+    def _pipeline_connection(self, resources: Dict[str, Any] | None) -> Any:
+        """Conexión propia de un pipeline: settings con sus ``resources`` encima."""
+        settings = self.config.settings
+        resources = resources or {}
+        if resources:
+            logger.info(f"Pipeline resources: {resources}")
+        return create_connection(
+            memory_limit=resources.get("memory_limit") or settings.duckdb_memory_limit,
+            threads=resources.get("threads") or settings.duckdb_threads,
+            temp_directory=resources.get("temp_directory"),
+        )
+
+    def profile_data(
+        self,
+        layer: str,
+        table_ref: str,
+        exact: bool = False,
+        top_k: int = 5,
+        bins: int = 10,
+    ) -> Dict[str, Any]:
+        """Perfilar una tabla del lake y compararla con su perfil anterior.
+
+        El perfil se calcula en un solo scan (ver ``profile_table``) y se
+        guarda en el Catalog; la comparación usa el perfil guardado, sin
+        volver a leer los datos viejos.
+
+        Args:
+            layer: ``raw``, ``staging`` o ``consume``.
+            table_ref: ``source/table`` (RAW) o ``domain/table``.
+            exact: Contar distintos exactos en lugar de HyperLogLog.
+            top_k: Valores más frecuentes por columna.
+            bins: Buckets de los histogramas.
+
+        Returns:
+            Dict con el perfil, el perfil anterior (o None) y los cambios.
+        """
+        layers = {"raw": self.raw, "staging": self.staging, "consume": self.consume}
+        if layer not in layers:
+            raise ValueError(f"Unknown layer: {layer}")
+        group, _, table = table_ref.rpartition("/")
+        if not group or not table:
+            raise ValueError(f"Table must be '<domain>/<table>': {table_ref}")
+        ref = {"domain": group, "table": table}
+        if layer == "raw":
+            ref["locations"] = self._cold_locations(ref)
+        query = layers[layer].read(ref)
+
+        start = time.time()
+        profile = profile_table(self.conn, f"({query})", approximate=not exact, top_k=top_k, bins=bins)
+        logger.info(
+            f"Profiled {layer}/{table_ref}: {profile['rows']} rows, "
+            f"{len(profile['columns'])} columns in {time.time() - start:.2f}s"
+        )
+
+        previous = self.catalog.get_latest_profile(layer, table_ref)
+        self.catalog.register_profile(layer, table_ref, profile)
+        changes = compare_profiles(previous, profile) if previous else []
+        return {"profile": profile, "previous": previous, "changes": changes}
+
+    def tier_raw(self, dry_run: bool = False) -> list[Dict[str, Any]]:
+        """Aplicar la retención de RAW (``settings.raw_retention``); ver ``tiering``."""
+        return run_tiering(self.raw, self.catalog, self.config.settings.raw_retention, dry_run=dry_run)
+
+    def _cold_locations(self, source: Dict[str, Any]) -> list[str]:
+        """Directorios de las particiones de una tabla RAW que ``tier`` movió fuera de RAW."""
+        raw_dir = Path(self.data_path) / "raw" / source["domain"] / source["table"]
+        return [
+            info["location"]
+            for partition, info in self.catalog.get_raw_partitions(
+                source["domain"], source["table"]
+            ).items()
+            if Path(info["location"]) != raw_dir / partition
+        ]
+
+    def _publish_version(
+        self, pipeline_name: str, destination: Dict[str, Any], result: Dict[str, Any]
+    ) -> None:
+        """Registrar la versión publicada en el Catalog y borrar versiones vencidas."""
+        layer_name = destination["layer"]
+        layer = self.staging if layer_name == "staging" else self.consume
+        table = f"{destination.get('domain', '')}/{destination['table']}"
+        self.catalog.register_table_version(
+            layer_name,
+            table,
+            result["version"],
+            result["path"],
+            rows=result.get("rows", 0),
+            pipeline_name=pipeline_name,
+        )
+        retention = self.config.settings.snapshot_retention_hours * 3600
+        deleted = snapshots.collect_garbage(layer.table_dir(destination), retention)
+        self.catalog.mark_versions_deleted(layer_name, table, deleted)
+
+    def _project_source(self, layer: Any, p_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Agregar a la fuente del pipeline solo las columnas que necesita.
+
+        Analiza transforms y ``select`` con el parser de DuckDB; si no se puede
+        acotar (``SELECT *``, SQL no parseable) se leen todas las columnas.
+        """
+        source = dict(p_dict["source"])
+        needed = required_columns(layer.conn, p_dict.get("transforms", []), p_dict.get("select"))
+        if needed is None:
+            return source
+        try:
+            schema = [
+                r[0] for r in layer.conn.execute(f"DESCRIBE {layer.read(source)}").fetchall()
+            ]
+        except Exception as e:
+            logger.debug(f"Projection skipped for {p_dict['name']}: {e}")
+            return source
+        columns = project_columns(schema, needed)
+        if columns:
+            logger.info(f"Projection: reading {len(columns)}/{len(schema)} columns")
+            source["columns"] = columns
+        return source
+
+    def _sample_query(self, query: str, p_dict: Dict[str, Any], sample: float | None) -> str:
+        """Filtrar una lectura a un porcentaje determinístico de filas.
+
+        Si el pipeline deduplica, la muestra se toma por hash de las claves:
+        todas las versiones de una clave quedan dentro o fuera, y tablas que
+        comparten clave muestrean las mismas entidades (los joins siguen
+        matcheando). Sin claves se usa el hash de la fila completa.
+
+        La resolución es de 0.0001% (hash módulo un millón); porcentajes
+        menores se rechazan en vez de devolver una muestra vacía.
+        """
+        if sample is None:
+            return query
+        if not 0 < sample <= 100:
+            raise ValueError(f"Sample must be in (0, 100]: {sample}")
+        threshold = round(sample * SAMPLE_MODULUS / 100)
+        if threshold == 0:
+            raise ValueError(f"Sample below the {100 / SAMPLE_MODULUS}% resolution: {sample}")
+        keys = source_key_columns(p_dict.get("transforms", []))
+        hashed = ", ".join(keys) if keys else "__sample"
+        logger.info(f"Sampling {sample}% by hash({hashed})")
+        return (
+            f"SELECT * FROM ({query}) AS __sample "
+            f"WHERE hash({hashed}) % {SAMPLE_MODULUS} < {threshold}"
+        )
 
     def _get_source_config(self, name: str) -> Dict[str, Any] | None:
         """Buscar configuración de una fuente por nombre."""
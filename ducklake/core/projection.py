@@ -0,0 +1,160 @@
+"""Análisis de SQL con el parser de DuckDB (projection pushdown y referencias)."""
+
+import json
+from typing import Any, Dict, Iterator, List, Set
+
+import duckdb
+from loguru import logger
+
+
+def parse_sql(conn: duckdb.DuckDBPyConnection, sql: str) -> Dict[str, Any] | None:
+    """Parsear SQL con el parser de DuckDB (``json_serialize_sql``).
+
+    Returns:
+        Árbol JSON de la query, o None si no es un SELECT válido.
+    """
+    serialized = conn.execute("SELECT json_serialize_sql(?)", [sql]).fetchone()[0]
+    tree = json.loads(serialized)
+    if tree.get("error"):
+        logger.debug(f"Cannot parse SQL ({tree.get('error_message')})")
+        return None
+    return tree
+
+
+def iter_nodes(tree: Any) -> Iterator[Dict[str, Any]]:
+    """Recorrer todos los nodos (dicts) de un árbol de ``json_serialize_sql``."""
+    stack: List[Any] = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            yield node
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def sql_column_refs(conn: duckdb.DuckDBPyConnection, sql: str) -> Set[str] | None:
+    """Obtener las columnas referenciadas por una query usando el parser de DuckDB.
+
+    Args:
+        conn: Conexión DuckDB.
+        sql: Query SELECT completa.
+
+    Returns:
+        Nombres referenciados (en minúsculas), o None si la query usa
+        ``*``/``COLUMNS()`` o no se pudo parsear. Incluye cada parte de los
+        nombres calificados: en ``s.city`` no se sabe si ``s`` es una tabla o
+        una columna struct, y sobrar nombres no afecta la proyección.
+    """
+    tree = parse_sql(conn, sql)
+    if tree is None:
+        return None
+
+    refs: Set[str] = set()
+    for node in iter_nodes(tree):
+        node_class = node.get("class")
+        if node_class == "STAR":
+            return None
+        if node_class == "COLUMN_REF":
+            refs.update(name.lower() for name in node["column_names"])
+    return refs
+
+
+def _expr_refs(conn: duckdb.DuckDBPyConnection, *exprs: str) -> Set[str] | None:
+    """Columnas referenciadas por expresiones sueltas (condiciones, agregaciones)."""
+    return sql_column_refs(conn, "SELECT " + ", ".join(f"({e})" for e in exprs))
+
+
+def required_columns(
+    conn: duckdb.DuckDBPyConnection,
+    transforms: List[Dict[str, Any]],
+    select: List[str] | None = None,
+) -> Set[str] | None:
+    """Calcular qué columnas de la fuente necesita un pipeline.
+
+    Recorre las transformaciones desde el final hacia el comienzo: parte de las
+    columnas de salida (``select``), deshace los renames y suma las columnas
+    referenciadas por renames, casts, filtros y claves de dedup. Un custom SQL o una agregación
+    redefine el conjunto: su entrada solo necesita las columnas que referencia.
+
+    Args:
+        conn: Conexión DuckDB (solo se usa para parsear SQL).
+        transforms: Lista de transformaciones del pipeline.
+        select: Columnas de salida del pipeline (None = todas).
+
+    Returns:
+        Nombres de columnas de la fuente (en minúsculas), o None si hacen falta
+        todas.
+    """
+    needed: Set[str] | None = {c.lower() for c in select} if select else None
+
+    for t in reversed(transforms):
+        t_type = t.get("type")
+        if t_type == "rename":
+            if needed is not None:
+                # El rename referencia explícitamente todas sus columnas origen
+                columns = t.get("columns") or {}
+                renames = {new.lower(): old.lower() for old, new in columns.items()}
+                needed = {renames.get(c, c) for c in needed} | set(renames.values())
+        elif t_type == "cast":
+            if needed is not None:
+                needed |= {c.lower() for c in t.get("columns") or {}}
+        elif t_type == "custom_sql":
+            # La salida del custom SQL reemplaza a su entrada
+            needed = sql_column_refs(conn, t["sql"].replace("__INPUT__", "__input__"))
+        elif t_type == "aggregate":
+            exprs = (t.get("group_by") or []) + (t.get("aggregations") or [])
+            if t.get("incremental"):
+                exprs.append(t.get("watermark_column") or "_ingestion_timestamp")
+            needed = _expr_refs(conn, *exprs)
+        elif needed is not None:
+            if t_type == "filter":
+                refs = _expr_refs(conn, t["condition"])
+                needed = None if refs is None else needed | refs
+            elif t_type == "deduplicate":
+                needed |= {k.lower() for k in t.get("keys") or []}
+                needed.add("_ingestion_timestamp")
+            elif t_type == "hash_key":
+                needed |= {k.lower() for k in t.get("keys") or []}
+            elif t_type == "asof_join":
+                if not t.get("timestamp"):
+                    raise ValueError("asof_join requires 'timestamp' (label time column)")
+                needed |= {k.lower() for k in t.get("keys") or []}
+                needed.add(t["timestamp"].lower())
+    return needed
+
+
+def source_key_columns(transforms: List[Dict[str, Any]]) -> List[str] | None:
+    """Claves del primer ``deduplicate`` expresadas con los nombres de la fuente.
+
+    Deshace los renames previos. Si antes del dedup hay un custom SQL o una
+    agregación no se puede saber de qué columnas salen las claves.
+
+    Returns:
+        Columnas de la fuente, o None si no hay dedup o no se pueden resolver.
+    """
+    origin: Dict[str, str] = {}
+    for t in transforms:
+        t_type = t.get("type")
+        if t_type == "rename":
+            for old, new in (t.get("columns") or {}).items():
+                origin[new] = origin.pop(old, old)
+        elif t_type in ("custom_sql", "aggregate"):
+            return None
+        elif t_type == "deduplicate" and t.get("keys"):
+            return [origin.get(k, k) for k in t["keys"]]
+    return None
+
+
+def project_columns(schema: List[str], needed: Set[str] | None) -> List[str] | None:
+    """Filtrar el schema de la fuente a las columnas necesarias, en su orden original.
+
+    Returns:
+        Columnas a leer, o None si hay que leer todas.
+    """
+    if needed is None:
+        return None
+    columns = [c for c in schema if c.lower() in needed]
+    if not columns or len(columns) == len(schema):
+        return None
+    return columns
@@ -1,10 +1,16 @@
 """Data quality checks."""
 
+import math
 from typing import Any, Dict, List
 
 import duckdb
 from loguru import logger
 
+from ducklake.transformations.enrichment import build_key_collision_sql
+
+# unique con approximate: claves por bucket del conteo exacto (acota el hash table)
+UNIQUE_BUCKET_KEYS = 5_000_000
+
 
 class QualityChecker:
     """Ejecuta validaciones de calidad de datos sobre tablas DuckDB."""
@@ -53,18 +59,99 @@ class QualityChecker:
         return {"type": "not_null", "passed": passed, "details": details}
 
     def _check_unique(self, table: str, check: Dict[str, Any]) -> Dict[str, Any]:
-        """Verificar unicidad de columnas."""
+        """Verificar unicidad de columnas.
+
+        Con ``approximate`` primero se estima la cantidad de claves distintas
+        con ``approx_count_distinct`` (memoria constante). Si la estimación
+        queda por debajo del total de filas por más que ``max_error`` hay
+        duplicados seguro y el check falla sin contar exacto. HyperLogLog no
+        puede probar unicidad: en otro caso se cuenta exacto, pero por
+        buckets del hash de las claves (``hash(claves) % n``, uno por query)
+        de a ~``bucket_keys`` claves, así el hash table nunca tiene todas las
+        claves a la vez. Un duplicado cae siempre en el mismo bucket.
+        """
         columns = check.get("columns", [])
         cols_str = ", ".join(columns)
-        result = self.conn.execute(f"""
-            SELECT COUNT(*) - COUNT(DISTINCT ({cols_str})) AS duplicates
-            FROM {table}
-        """).fetchone()
-        dup_count = result[0]
+        if not check.get("approximate"):
+            dup_count = self.conn.execute(f"""
+                SELECT COUNT(*) - COUNT(DISTINCT ({cols_str})) AS duplicates
+                FROM {table}
+            """).fetchone()[0]
+            passed = dup_count == 0
+            details = "OK" if passed else f"{dup_count} duplicates on ({cols_str})"
+            return {"type": "unique", "passed": passed, "details": details}
+
+        max_error = check.get("max_error") or 0.05
+        rows, estimate = self.conn.execute(
+            f"SELECT COUNT(*), approx_count_distinct(({cols_str})) FROM {table}"
+        ).fetchone()
+        if estimate < rows * (1 - max_error):
+            details = (
+                f"~{rows - estimate} duplicates on ({cols_str}) "
+                f"(approx: ~{estimate} distinct / {rows} rows)"
+            )
+            return {"type": "unique", "passed": False, "details": details}
+
+        bucket_keys = check.get("bucket_keys") or UNIQUE_BUCKET_KEYS
+        buckets = max(1, math.ceil(estimate / bucket_keys))
+        logger.debug(f"Unique ({cols_str}): ~{estimate}/{rows} distinct, {buckets} bucket(s)")
+        dup_count = 0
+        for bucket in range(buckets):
+            where = f"WHERE hash({cols_str}) % {buckets} = {bucket}" if buckets > 1 else ""
+            dup_count += self.conn.execute(f"""
+                SELECT COUNT(*) - COUNT(DISTINCT ({cols_str})) FROM {table} {where}
+            """).fetchone()[0]
         passed = dup_count == 0
         details = "OK" if passed else f"{dup_count} duplicates on ({cols_str})"
+        if buckets > 1:
+            details += f" (exact in {buckets} hash buckets)"
         return {"type": "unique", "passed": passed, "details": details}
 
+    def _check_distinct_count(self, table: str, check: Dict[str, Any]) -> Dict[str, Any]:
+        """Verificar que la cantidad de valores distintos esté dentro de un rango.
+
+        Con ``approximate`` el check pasa con la estimación si queda dentro
+        del rango con margen ``max_error``; cerca de los límites se cuenta
+        exacto.
+        """
+        column = check["column"]
+        min_val = check.get("min_value")
+        max_val = check.get("max_value")
+
+        def in_range(value: float, margin: float) -> bool:
+            above = min_val is None or value >= min_val * (1 + margin)
+            below = max_val is None or value <= max_val * (1 - margin)
+            return above and below
+
+        if check.get("approximate"):
+            estimate = self.conn.execute(
+                f"SELECT approx_count_distinct({column}) FROM {table}"
+            ).fetchone()[0]
+            if in_range(estimate, check.get("max_error") or 0.05):
+                details = f"OK (approx: ~{estimate} distinct in {column})"
+                return {"type": "distinct_count", "passed": True, "details": details}
+
+        count = self.conn.execute(f"SELECT COUNT(DISTINCT {column}) FROM {table}").fetchone()[0]
+        passed = in_range(count, 0)
+        details = "OK" if passed else f"{count} distinct values in {column} out of range"
+        return {"type": "distinct_count", "passed": passed, "details": details}
+
+    def _check_key_collisions(self, table: str, check: Dict[str, Any]) -> Dict[str, Any]:
+        """Verificar que una surrogate key (``column``) no tenga colisiones.
+
+        Una colisión es una clave que corresponde a más de una combinación de
+        las columnas de las que sale (``columns``).
+        """
+        column = check["column"]
+        columns = check.get("columns", [])
+        sql = build_key_collision_sql(columns, column, table)
+        collisions, example = self.conn.execute(
+            f"SELECT COUNT(*), ANY_VALUE({column})::VARCHAR FROM ({sql})"
+        ).fetchone()
+        passed = collisions == 0
+        details = "OK" if passed else f"{collisions} colliding keys in {column} (e.g. {example})"
+        return {"type": "key_collisions", "passed": passed, "details": details}
+
     def _check_valid_values(self, table: str, check: Dict[str, Any]) -> Dict[str, Any]:
         """Verificar que una columna solo tenga valores válidos."""
         column = check["column"]
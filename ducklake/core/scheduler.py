@@ -0,0 +1,210 @@
+"""``ducklake scheduler``: extracciones y pipelines según sus horarios cron."""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Set
+
+from loguru import logger
+
+from ducklake.utils.cron import CronSchedule
+
+# Horarios perdidos que se registran por job al arrancar (el resto solo se loguea)
+MAX_MISSED = 1000
+
+
+class ScheduledJob:
+    """Un job del scheduler: la extracción de una fuente o un pipeline."""
+
+    def __init__(self, job_type: str, name: str, schedule: str, locks: Set[str]):
+        self.job_type = job_type
+        self.name = name
+        try:
+            self.cron = CronSchedule(schedule)
+        except ValueError as e:
+            raise ValueError(f"Invalid schedule for {job_type} '{name}': {e}") from None
+        self.locks = locks
+        self.next_at: datetime | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.job_type}:{self.name}"
+
+
+class Scheduler:
+    """Corre las extracciones (``extract.schedule`` de sources.yaml) y los
+    pipelines (``schedule`` de pipelines.yaml) cuando les toca.
+
+    - Los jobs corren en un pool de ``max_workers`` threads; un job que
+      espera lugar en el pool arranca tarde y, si la demora supera
+      ``grace_seconds``, queda marcado como ``late`` en el Catalog.
+    - Dos corridas de la misma fuente no se superponen: la extracción de una
+      fuente, los pipelines que la leen de RAW y las corridas anteriores del
+      mismo job toman el mismo lock. Un horario que encuentra su lock tomado
+      (en cola o corriendo) se registra como ``skipped``.
+    - Al arrancar, los horarios que pasaron desde el último registrado de
+      cada job (el scheduler estaba apagado) se registran como ``missed``;
+      no se recuperan.
+
+    Args:
+        orchestrator: Orquestador (extracciones, pipelines y Catalog).
+        max_workers: Jobs simultáneos.
+        grace_seconds: Demora tolerada antes de marcar un inicio como tarde.
+        clock: Hora actual (para tests).
+    """
+
+    def __init__(
+        self,
+        orchestrator: Any,
+        max_workers: int | None = None,
+        grace_seconds: float | None = None,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        settings = orchestrator.config.settings
+        self.orchestrator = orchestrator
+        self.catalog = orchestrator.catalog
+        self.max_workers = max_workers or settings.scheduler_workers
+        self.grace_seconds = (
+            settings.scheduler_grace_seconds if grace_seconds is None else grace_seconds
+        )
+        self.clock = clock
+        self.jobs = self._load_jobs()
+        self._held: Dict[str, str] = {}  # lock -> job que lo tiene
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._futures: List[Future] = []
+
+        now = self.clock()
+        for job in self.jobs:
+            self._record_missed(job, now)
+            job.next_at = job.cron.next_after(now)
+
+    def _load_jobs(self) -> List[ScheduledJob]:
+        config = self.orchestrator.config
+        jobs = [
+            ScheduledJob("extract", s.name, s.extract.schedule, {f"source:{s.name}"})
+            for s in config.sources
+            if s.enabled and s.extract.schedule
+        ]
+        for p in config.pipelines:
+            if p.schedule:
+                locks = {f"pipeline:{p.name}"}
+                if p.source.layer == "raw":
+                    locks.add(f"source:{p.source.domain}")
+                jobs.append(ScheduledJob("pipeline", p.name, p.schedule, locks))
+        return jobs
+
+    def _record_missed(self, job: ScheduledJob, now: datetime) -> None:
+        last = self.catalog.get_last_scheduled(job.job_type, job.name)
+        if last is None:
+            return
+        missed = []
+        t = job.cron.next_after(last)
+        while t <= now and len(missed) < MAX_MISSED:
+            missed.append(t)
+            t = job.cron.next_after(t)
+        for scheduled_at in missed:
+            self.catalog.register_schedule_run(job.job_type, job.name, scheduled_at, "missed")
+        if missed:
+            logger.warning(f"{job.key}: {len(missed)} missed run(s) since {last}")
+
+    def run(self, stop: threading.Event | None = None) -> None:
+        """Correr los jobs a horario hasta que se setee ``stop``."""
+        stop = stop or threading.Event()
+        if not self.jobs:
+            logger.warning("No scheduled sources or pipelines")
+        for job in self.jobs:
+            logger.info(f"Scheduled {job.key} ({job.cron.expression}), next at {job.next_at}")
+        try:
+            while not stop.is_set():
+                self.tick()
+                next_at = min((j.next_at for j in self.jobs), default=None)
+                timeout = (next_at - self.clock()).total_seconds() if next_at else 60.0
+                stop.wait(min(max(timeout, 0.1), 60.0))
+        finally:
+            self.close()
+
+    def tick(self, now: datetime | None = None) -> List[str]:
+        """Encolar los jobs cuyo horario llegó.
+
+        Si pasó más de un horario del mismo job desde el tick anterior, solo
+        corre el último; los anteriores quedan como ``missed``.
+
+        Returns:
+            Jobs encolados en este tick.
+        """
+        now = now or self.clock()
+        submitted = []
+        for job in self.jobs:
+            due = []
+            while job.next_at <= now:
+                due.append(job.next_at)
+                job.next_at = job.cron.next_after(job.next_at)
+            if not due:
+                continue
+            for scheduled_at in due[:-1]:
+                self.catalog.register_schedule_run(job.job_type, job.name, scheduled_at, "missed")
+            if self._submit(job, due[-1]):
+                submitted.append(job.key)
+        return submitted
+
+    def _submit(self, job: ScheduledJob, scheduled_at: datetime) -> bool:
+        with self._lock:
+            busy = {self._held[k] for k in job.locks if k in self._held}
+            if not busy:
+                self._held.update({k: job.key for k in job.locks})
+        if busy:
+            running = ", ".join(sorted(busy))
+            logger.warning(f"{job.key} at {scheduled_at:%H:%M}: skipped, {running} still running")
+            self.catalog.register_schedule_run(
+                job.job_type, job.name, scheduled_at, "skipped", error=f"Overlaps with {running}"
+            )
+            return False
+        self._futures = [f for f in self._futures if not f.done()]
+        self._futures.append(self._pool.submit(self._execute, job, scheduled_at))
+        return True
+
+    def _execute(self, job: ScheduledJob, scheduled_at: datetime) -> None:
+        started_at = self.clock()
+        late = (started_at - scheduled_at).total_seconds() > self.grace_seconds
+        if late:
+            logger.warning(f"{job.key} ({scheduled_at}) started {started_at - scheduled_at} late")
+        error = None
+        try:
+            if job.job_type == "extract":
+                results = self.orchestrator.run_extraction(job.name)
+                errors = [
+                    f"{t}: {r['error']}" for t, r in results.items() if r["status"] != "success"
+                ]
+                error = "; ".join(errors) or None
+            else:
+                result = self.orchestrator.run_pipeline(job.name, isolated=True)
+                if result["status"] != "success":
+                    error = result.get("error") or result["status"]
+        except Exception as e:
+            error = str(e)
+        finally:
+            with self._lock:
+                for k in job.locks:
+                    self._held.pop(k, None)
+        if error:
+            logger.error(f"{job.key} failed: {error}")
+        self.catalog.register_schedule_run(
+            job.job_type,
+            job.name,
+            scheduled_at,
+            "error" if error else "success",
+            started_at=started_at,
+            finished_at=self.clock(),
+            late=late,
+            error=error,
+        )
+
+    def wait(self) -> None:
+        """Esperar a que terminen los jobs encolados."""
+        for future in list(self._futures):
+            future.result()
+
+    def close(self) -> None:
+        """Esperar los jobs en curso y cerrar el pool."""
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,421 @@
+"""Servidor HTTP de consultas sobre CONSUME (y opcionalmente STAGING)."""
+
+import io
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, List, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import duckdb
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from loguru import logger
+
+from ducklake.core import snapshots
+from ducklake.core.projection import iter_nodes, parse_sql
+
+CONTENT_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+    "json": "application/json",
+}
+
+# Filas por record batch al leer resultados
+_BATCH_ROWS = 65_536
+
+
+class QueryError(ValueError):
+    """Consulta inválida (SQL no permitido, tabla o formato desconocidos)."""
+
+
+class QueryCache:
+    """Cache LRU de respuestas serializadas, acotado por bytes totales."""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> bytes | None:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: Hashable, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+
+class QueryService:
+    """Ejecuta consultas de solo lectura sobre las tablas de CONSUME/STAGING.
+
+    Cada tabla se expone como una vista ``{layer}_{domain}.{table}`` (por
+    ejemplo ``consume_bi.ventas_diarias``). Solo se aceptan SELECT y el
+    acceso a archivos queda limitado al directorio de datos.
+
+    Las respuestas se cachean con una clave que incluye la query, los
+    parámetros, el formato y el tamaño/mtime de los archivos que lee: cuando
+    un pipeline reescribe una tabla la clave cambia y la entrada vieja deja
+    de usarse (y termina desalojada por el LRU).
+    """
+
+    def __init__(
+        self,
+        data_path: str,
+        layers: Sequence[str] = ("consume",),
+        cache_bytes: int = 256 * 1024 * 1024,
+        memory_limit: str = "4GB",
+        threads: int = 4,
+    ):
+        self.data_path = Path(data_path).resolve()
+        self.layers = tuple(layers)
+        self.cache = QueryCache(cache_bytes)
+        self.conn = duckdb.connect()
+        self.conn.execute(f"SET memory_limit = '{memory_limit}'")
+        self.conn.execute(f"SET threads = {threads}")
+        self.conn.execute(f"SET allowed_directories = ['{self.data_path}/']")
+        self.conn.execute("SET enable_external_access = false")
+        self.conn.execute("SET lock_configuration = true")
+        self._tables: Dict[Tuple[str, str], Path] = {}
+        self._lock = threading.Lock()
+        self.refresh_tables()
+
+    def refresh_tables(self) -> Dict[Tuple[str, str], Path]:
+        """Registrar como vistas las tablas nuevas en disco.
+
+        Cada vista apunta a la versión publicada de la tabla; si un pipeline
+        publicó otra, la vista se recrea (las consultas en curso terminan
+        sobre la versión que resolvieron).
+
+        Returns:
+            Mapa ``(schema, tabla) -> archivo parquet``.
+        """
+        with self._lock:
+            for layer in self.layers:
+                for table_dir in sorted((self.data_path / layer).glob("*/*")):
+                    path = snapshots.current_file(table_dir)
+                    if not table_dir.is_dir() or not path.exists():
+                        continue
+                    schema = f"{layer}_{table_dir.parent.name}"
+                    table = table_dir.name
+                    if self._tables.get((schema, table)) == path:
+                        continue
+                    self.conn.execute(f'CREATE SCHEMA IF NOT EXISTS "{schema}"')
+                    self.conn.execute(
+                        f'CREATE OR REPLACE VIEW "{schema}"."{table}" AS '
+                        f"SELECT * FROM read_parquet('{path}')"
+                    )
+                    self._tables[(schema, table)] = path
+            return dict(self._tables)
+
+    def list_tables(self) -> List[Dict[str, Any]]:
+        """Listar las tablas expuestas."""
+        return [
+            {"name": f"{schema}.{table}", "path": str(path)}
+            for (schema, table), path in sorted(self.refresh_tables().items())
+        ]
+
+    def table_query(
+        self,
+        layer: str,
+        domain: str,
+        table: str,
+        filters: Dict[str, Any] | None = None,
+        columns: List[str] | None = None,
+        limit: int | None = None,
+    ) -> Tuple[str, List[Any]]:
+        """Construir una consulta parametrizada tabla + filtros por igualdad.
+
+        Returns:
+            SQL y lista de parámetros.
+        """
+        schema = f"{layer}_{domain}"
+        if (schema, table) not in self.refresh_tables():
+            raise KeyError(f"{schema}.{table}")
+        cols = ", ".join(_quote(c) for c in columns) if columns else "*"
+        sql = f"SELECT {cols} FROM {_quote(schema)}.{_quote(table)}"
+        params: List[Any] = []
+        if filters:
+            sql += " WHERE " + " AND ".join(f"{_quote(c)} = ?" for c in filters)
+            params = list(filters.values())
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return sql, params
+
+    def execute(
+        self, sql: str, params: List[Any] | None = None, fmt: str = "arrow"
+    ) -> Tuple[Iterator[bytes], bool]:
+        """Ejecutar una consulta y serializar el resultado en streaming.
+
+        Args:
+            sql: SELECT (puede usar parámetros ``?`` o ``$1``).
+            params: Valores de los parámetros.
+            fmt: ``arrow`` (IPC stream), ``parquet`` o ``json``.
+
+        Returns:
+            Iterador de chunks de bytes y si la respuesta vino del cache.
+        """
+        if fmt not in CONTENT_TYPES:
+            raise QueryError(f"Unknown format: {fmt}")
+        params = list(params or [])
+        files = self._files_read(sql)
+
+        key = None
+        if files is not None:
+            key = (sql, json.dumps(params, default=str), fmt, _fingerprint(files))
+            body = self.cache.get(key)
+            if body is not None:
+                return iter([body]), True
+
+        cursor = self.conn.cursor()
+        try:
+            result = cursor.execute(sql, params)
+            # to_arrow_reader reemplaza a fetch_record_batch en DuckDB >= 1.4
+            if hasattr(result, "to_arrow_reader"):
+                reader = result.to_arrow_reader(_BATCH_ROWS)
+            else:
+                reader = result.fetch_record_batch(_BATCH_ROWS)
+        except duckdb.Error as e:
+            cursor.close()
+            raise QueryError(str(e)) from e
+        return self._stream(cursor, reader, fmt, key), False
+
+    def _stream(
+        self, cursor: Any, reader: pa.RecordBatchReader, fmt: str, key: Hashable | None
+    ) -> Iterator[bytes]:
+        """Serializar batches a medida que llegan; si entra en el cache, guardarlo."""
+        cached: List[bytes] | None = [] if key is not None else None
+        size = 0
+        try:
+            for chunk in _ENCODERS[fmt](reader):
+                if not chunk:
+                    continue
+                if cached is not None:
+                    size += len(chunk)
+                    if size > self.cache.max_bytes:
+                        cached = None
+                    else:
+                        cached.append(chunk)
+                yield chunk
+        finally:
+            cursor.close()
+        if cached is not None:
+            self.cache.put(key, b"".join(cached))
+
+    def _files_read(self, sql: str) -> List[Path] | None:
+        """Archivos que lee la query, o None si no se pueden determinar (sin cache).
+
+        Raises:
+            QueryError: Si no es un único SELECT.
+        """
+        tree = parse_sql(self.conn, sql)
+        if tree is None or len(tree.get("statements", [])) != 1:
+            raise QueryError("Only a single SELECT statement is allowed")
+
+        tables = self.refresh_tables()
+        files: List[Path] = []
+        for node in iter_nodes(tree):
+            if node.get("type") == "TABLE_FUNCTION":
+                return None
+            if node.get("type") == "BASE_TABLE":
+                path = tables.get((node.get("schema_name"), node.get("table_name")))
+                if path is not None:
+                    files.append(path)
+        return sorted(set(files))
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def _fingerprint(files: List[Path]) -> Tuple[Tuple[str, int, int], ...]:
+    result = []
+    for f in files:
+        try:
+            st = f.stat()
+            result.append((str(f), st.st_size, st.st_mtime_ns))
+        except FileNotFoundError:
+            result.append((str(f), -1, -1))
+    return tuple(result)
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class _ChunkSink(io.RawIOBase):
+    """Destino de escritura que acumula bytes hasta que se drenan."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _encode_arrow(reader: pa.RecordBatchReader) -> Iterator[bytes]:
+    sink = _ChunkSink()
+    with ipc.new_stream(pa.PythonFile(sink, mode="w"), reader.schema) as writer:
+        yield sink.drain()
+        for batch in reader:
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _encode_parquet(reader: pa.RecordBatchReader) -> Iterator[bytes]:
+    sink = _ChunkSink()
+    with pq.ParquetWriter(pa.PythonFile(sink, mode="w"), reader.schema) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _encode_json(reader: pa.RecordBatchReader) -> Iterator[bytes]:
+    yield b"["
+    first = True
+    for batch in reader:
+        rows = batch.to_pylist()
+        if not rows:
+            continue
+        body = ",".join(json.dumps(r, default=str, ensure_ascii=False) for r in rows)
+        yield (body if first else "," + body).encode()
+        first = False
+    yield b"]"
+
+
+_ENCODERS = {"arrow": _encode_arrow, "parquet": _encode_parquet, "json": _encode_json}
+
+
+def make_handler(service: QueryService) -> type:
+    """Crear la clase de handler HTTP ligada a un ``QueryService``.
+
+    Endpoints:
+    - ``GET /tables``: tablas expuestas.
+    - ``GET /tables/{layer}/{domain}/{table}?col=valor&columns=a,b&limit=N&format=json``
+    - ``POST /query`` con JSON ``{"sql": ..., "params": [...], "format": "arrow"}``
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "DuckLake"
+
+        def do_GET(self) -> None:  # noqa: N802 - API de http.server
+            url = urlparse(self.path)
+            parts = [p for p in url.path.split("/") if p]
+            if parts == ["tables"]:
+                self._send_json(200, service.list_tables())
+                return
+            if len(parts) != 4 or parts[0] != "tables":
+                self._send_json(404, {"error": f"Not found: {url.path}"})
+                return
+
+            args = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            fmt = args.pop("format", "json")
+            columns = args.pop("columns", None)
+            limit = args.pop("limit", None)
+            try:
+                sql, params = service.table_query(
+                    *parts[1:],
+                    filters=args,
+                    columns=columns.split(",") if columns else None,
+                    limit=int(limit) if limit else None,
+                )
+            except KeyError:
+                self._send_json(404, {"error": f"Unknown table: {'/'.join(parts[1:])}"})
+                return
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            self._run(sql, params, fmt)
+
+        def do_POST(self) -> None:  # noqa: N802 - API de http.server
+            if urlparse(self.path).path.rstrip("/") != "/query":
+                self._send_json(404, {"error": f"Not found: {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                sql = body["sql"]
+            except (ValueError, KeyError):
+                self._send_json(400, {"error": "Expected JSON body with 'sql'"})
+                return
+            self._run(sql, body.get("params") or [], body.get("format", "arrow"))
+
+        def _run(self, sql: str, params: List[Any], fmt: str) -> None:
+            try:
+                chunks, hit = service.execute(sql, params, fmt)
+            except QueryError as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            # HTTP/1.0 sin Content-Length: el cuerpo se transmite hasta cerrar
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPES[fmt])
+            self.send_header("X-DuckLake-Cache", "hit" if hit else "miss")
+            self.end_headers()
+            try:
+                for chunk in chunks:
+                    self.wfile.write(chunk)
+            except (BrokenPipeError, ConnectionResetError):
+                logger.debug("Serve: client disconnected")
+            except duckdb.Error as e:
+                logger.error(f"Serve: query failed while streaming: {e}")
+
+        def _send_json(self, status: int, payload: Any) -> None:
+            body = json.dumps(payload, default=str).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            logger.debug(f"Serve: {self.address_string()} {format % args}")
+
+    return Handler
+
+
+def serve(
+    data_path: str,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    layers: Sequence[str] = ("consume",),
+    cache_bytes: int = 256 * 1024 * 1024,
+    memory_limit: str = "4GB",
+    threads: int = 4,
+) -> None:
+    """Levantar el servidor HTTP (bloquea hasta Ctrl+C)."""
+    service = QueryService(data_path, layers, cache_bytes, memory_limit, threads)
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    logger.info(f"Serving {', '.join(layers)} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
@@ -0,0 +1,103 @@
+"""Versiones (snapshots) de tablas de STAGING/CONSUME con puntero atómico.
+
+Cada escritura va a un directorio nuevo ``{tabla}/versions/{version}/`` y
+recién cuando está completo se publica reemplazando el archivo ``CURRENT``
+con ``os.replace`` (atómico). Un lector resuelve el puntero una vez y lee
+esa versión hasta terminar, aunque mientras tanto se publique otra.
+
+Las tablas escritas antes del versionado (``{tabla}/data.parquet`` sin
+``CURRENT``) se siguen leyendo igual.
+"""
+
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+from loguru import logger
+
+POINTER = "CURRENT"
+VERSIONS_DIR = "versions"
+DATA_FILE = "data.parquet"
+
+
+def new_version(table_dir: str | Path) -> Path:
+    """Crear el directorio de una versión nueva (sin publicarla).
+
+    El nombre empieza con el timestamp, así el orden alfabético es el de
+    creación.
+    """
+    version = f"{datetime.now():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+    path = Path(table_dir) / VERSIONS_DIR / version
+    path.mkdir(parents=True)
+    return path
+
+
+def publish(table_dir: str | Path, version: str) -> None:
+    """Publicar una versión como la actual (swap atómico del puntero)."""
+    table_dir = Path(table_dir)
+    if not (table_dir / VERSIONS_DIR / version).is_dir():
+        raise ValueError(f"Version not found: {table_dir}/{VERSIONS_DIR}/{version}")
+    tmp = table_dir / f"{POINTER}.{uuid.uuid4().hex}.tmp"
+    tmp.write_text(version)
+    os.replace(tmp, table_dir / POINTER)
+    logger.debug(f"Published {table_dir.name} version {version}")
+
+
+def current_version(table_dir: str | Path) -> str | None:
+    """Versión publicada de una tabla (None si no está versionada)."""
+    pointer = Path(table_dir) / POINTER
+    try:
+        return pointer.read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def current_file(table_dir: str | Path, name: str = DATA_FILE) -> Path:
+    """Path de un archivo de la versión actual (o del layout sin versiones)."""
+    version = current_version(table_dir)
+    if version is None:
+        return Path(table_dir) / name
+    return Path(table_dir) / VERSIONS_DIR / version / name
+
+
+def list_versions(table_dir: str | Path) -> List[str]:
+    """Versiones en disco de una tabla, de la más vieja a la más nueva."""
+    versions_dir = Path(table_dir) / VERSIONS_DIR
+    if not versions_dir.exists():
+        return []
+    return sorted(p.name for p in versions_dir.iterdir() if p.is_dir())
+
+
+def collect_garbage(table_dir: str | Path, retention_seconds: float) -> List[str]:
+    """Borrar versiones que dejaron de ser la actual hace más de ``retention_seconds``.
+
+    Una versión anterior a la actual dejó de leerse cuando se creó la
+    siguiente; las posteriores sin publicar (corridas que fallaron o que
+    todavía están escribiendo) se cuentan desde su propia creación. La
+    versión actual nunca se borra.
+
+    Returns:
+        Versiones borradas.
+    """
+    table_dir = Path(table_dir)
+    current = current_version(table_dir)
+    versions = list_versions(table_dir)
+    now = time.time()
+    deleted = []
+    for i, version in enumerate(versions):
+        if version == current:
+            continue
+        if current is not None and version < current:
+            retired_at = (table_dir / VERSIONS_DIR / versions[i + 1]).stat().st_mtime
+        else:
+            retired_at = (table_dir / VERSIONS_DIR / version).stat().st_mtime
+        if now - retired_at > retention_seconds:
+            shutil.rmtree(table_dir / VERSIONS_DIR / version, ignore_errors=True)
+            deleted.append(version)
+    if deleted:
+        logger.info(f"Snapshot GC {table_dir.name}: removed {len(deleted)} version(s)")
+    return deleted
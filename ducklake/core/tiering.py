@@ -0,0 +1,174 @@
+"""Retención y cold tier de RAW: recompresión, movimiento y borrado de particiones."""
+
+import shutil
+import uuid
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List
+
+from loguru import logger
+
+from ducklake.core.base import partition_date
+from ducklake.core.catalog import Catalog
+from ducklake.core.config import RawRetentionConfig
+from ducklake.layers.raw import RawLayer
+
+
+def run_tiering(
+    raw: RawLayer,
+    catalog: Catalog,
+    policy: RawRetentionConfig,
+    today: date | None = None,
+    dry_run: bool = False,
+) -> List[Dict[str, Any]]:
+    """Aplicar la política de retención a todas las tablas de RAW.
+
+    Por partición, según su antigüedad:
+
+    - pasado ``delete_after_days`` se borra (esté en RAW o en el cold tier);
+    - pasado ``recompress_after_days`` se reescribe en un solo archivo zstd con
+      row groups grandes y, si hay ``cold_path``, queda en
+      ``{cold_path}/raw/{source}/{table}/...``.
+
+    Cada acción se registra en el Catalog (``raw_tiering``); los pipelines
+    leen de ahí la ubicación de las particiones movidas.
+
+    Args:
+        raw: Capa RAW (su conexión se usa para reescribir).
+        catalog: Catálogo donde registrar las acciones.
+        policy: Política de retención (``settings.raw_retention``).
+        today: Fecha de referencia (default: hoy).
+        dry_run: Solo devolver el plan, sin tocar archivos ni el catálogo.
+
+    Returns:
+        Lista de acciones ``{source, table, partition, action, location, ...}``.
+    """
+    today = today or date.today()
+    actions: List[Dict[str, Any]] = []
+    for source in sorted(raw.list_sources()):
+        for table in sorted(raw.list_tables(source)):
+            for action in _plan_table(raw, catalog, policy, source, table, today):
+                if not dry_run:
+                    _execute(raw, catalog, policy, action)
+                actions.append(action)
+    return actions
+
+
+def _plan_table(
+    raw: RawLayer,
+    catalog: Catalog,
+    policy: RawRetentionConfig,
+    source: str,
+    table: str,
+    today: date,
+) -> List[Dict[str, Any]]:
+    """Acciones a aplicar sobre las particiones de una tabla."""
+    table_dir = Path(raw.base_path) / "raw" / source / table
+    state = catalog.get_raw_partitions(source, table)
+    partitions = {
+        p.relative_to(table_dir).as_posix(): p
+        for p in raw.list_partitions({"domain": source, "table": table})
+    }
+    for partition, info in state.items():
+        if partition not in partitions and Path(info["location"]).is_dir():
+            partitions[partition] = Path(info["location"])
+
+    cold_dir = Path(policy.cold_path) / "raw" / source / table if policy.cold_path else None
+    plan = []
+    for partition, path in sorted(partitions.items()):
+        day = partition_date(partition)
+        if day is None:
+            continue
+        age = (today - day).days
+        base = {"source": source, "table": table, "partition": partition, "path": str(path)}
+        target = cold_dir / partition if cold_dir else table_dir / partition
+
+        if policy.delete_after_days is not None and age > policy.delete_after_days:
+            plan.append({**base, "action": "delete", "location": None})
+        elif policy.recompress_after_days is not None and age > policy.recompress_after_days:
+            if partition not in state:
+                plan.append({**base, "action": "recompress", "location": str(target)})
+            elif cold_dir and path != target:
+                # Ya recomprimida; se configuró el cold tier después
+                plan.append({**base, "action": "move", "location": str(target)})
+    return plan
+
+
+def _execute(
+    raw: RawLayer, catalog: Catalog, policy: RawRetentionConfig, action: Dict[str, Any]
+) -> None:
+    """Ejecutar una acción del plan y registrarla en el Catalog."""
+    path = Path(action["path"])
+    files = sorted(path.glob("*.parquet"))
+    action["bytes_before"] = sum(f.stat().st_size for f in files)
+
+    if action["action"] == "delete":
+        shutil.rmtree(path)
+        _prune_empty_parents(path)
+        action["bytes_after"] = 0
+    else:
+        target = Path(action["location"])
+        if action["action"] == "recompress":
+            _recompress(raw, files, target, policy)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(path), str(target))
+        if target != path:
+            shutil.rmtree(path, ignore_errors=True)
+            _prune_empty_parents(path)
+        action["bytes_after"] = sum(f.stat().st_size for f in target.glob("*.parquet"))
+
+    catalog.register_tier_action(
+        action["source"],
+        action["table"],
+        action["partition"],
+        action["action"],
+        action["location"],
+        files=len(files),
+        bytes_before=action["bytes_before"],
+        bytes_after=action["bytes_after"],
+    )
+    logger.info(
+        f"RAW tier {action['action']}: {action['source']}/{action['table']}/"
+        f"{action['partition']} ({action['bytes_before']} -> {action['bytes_after']} bytes)"
+    )
+
+
+def _recompress(
+    raw: RawLayer, files: List[Path], target: Path, policy: RawRetentionConfig
+) -> None:
+    """Reescribir los archivos de una partición en ``target/data.parquet``.
+
+    Se escribe en un directorio temporal del mismo filesystem que el destino
+    y se reemplaza la partición con renames, así nunca queda a medio escribir.
+    """
+    work_root = (Path(policy.cold_path) if policy.cold_path else Path(raw.base_path)) / "_tmp"
+    work_dir = work_root / f"tier-{uuid.uuid4().hex}"
+    work_dir.mkdir(parents=True)
+    try:
+        file_list = ", ".join(f"'{f}'" for f in files)
+        raw.conn.execute(f"""
+            COPY (
+                SELECT * FROM read_parquet([{file_list}], hive_partitioning = false, union_by_name = true)
+            ) TO '{work_dir / 'data.parquet'}' (
+                FORMAT PARQUET, COMPRESSION zstd,
+                COMPRESSION_LEVEL {policy.compression_level},
+                ROW_GROUP_SIZE {policy.row_group_size}
+            )
+        """)
+        old = work_root / f"old-{uuid.uuid4().hex}"
+        if target.exists():
+            target.rename(old)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        work_dir.rename(target)
+        shutil.rmtree(old, ignore_errors=True)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _prune_empty_parents(path: Path) -> None:
+    """Borrar los directorios ``month=``/``year=`` que quedaron vacíos."""
+    parent = path.parent
+    while "=" in parent.name and parent.exists() and not any(parent.iterdir()):
+        parent.rmdir()
+        parent = parent.parent
@@ -0,0 +1,124 @@
+"""``ducklake watch``: ingesta por micro-batches al aparecer archivos CSV."""
+
+import fnmatch
+import threading
+import time
+from typing import Any, Dict, List, Set, Tuple
+
+from loguru import logger
+
+from ducklake.core.dag import build_dag, downstream
+from ducklake.utils.fswatch import create_watcher
+
+
+class SourceWatch:
+    """Vigila los paths de fuentes CSV e ingiere los archivos nuevos a RAW.
+
+    Cada evento de una fuente posterga su ingesta ``debounce`` segundos: un
+    archivo que se sigue escribiendo, o una tanda de archivos que llega
+    junta, se ingiere en un solo micro-batch; una fuente con eventos
+    continuos (un archivo en modo tail) se ingiere igual cada ``max_wait``
+    segundos. La ingesta es la extracción incremental (o tail) de siempre:
+    solo se convierten los archivos nuevos o modificados y cada micro-batch
+    queda como archivos part en RAW.
+
+    Args:
+        orchestrator: Orquestador (extracciones, pipelines y Catalog).
+        sources: Fuentes a vigilar (CSV con ``extract.mode`` incremental o tail).
+        debounce: Segundos sin eventos antes de ingerir.
+        max_wait: Demora máxima desde el primer evento pendiente.
+        run_pipelines: Correr después los pipelines que leen la fuente y los
+            que dependen de ellos.
+        polling: Forzar polling en lugar de inotify.
+        poll_interval: Intervalo del polling en segundos.
+    """
+
+    def __init__(
+        self,
+        orchestrator: Any,
+        sources: List[str],
+        debounce: float = 2.0,
+        max_wait: float = 30.0,
+        run_pipelines: bool = False,
+        polling: bool = False,
+        poll_interval: float = 1.0,
+    ):
+        self.orchestrator = orchestrator
+        self.debounce = debounce
+        self.max_wait = max_wait
+        self.run_pipelines = run_pipelines
+        self.patterns: Dict[str, str] = {}
+        for name in sources:
+            config = orchestrator._get_source_config(name)
+            if config is None:
+                raise ValueError(f"Source '{name}' not found in config")
+            if config["type"] != "csv" or not config.get("path"):
+                raise ValueError(f"Source '{name}' is not a CSV source with a path")
+            if config["extract"]["mode"] not in ("incremental", "tail"):
+                raise ValueError(f"Source '{name}' must use extract.mode incremental or tail")
+            self.patterns[name] = config["path"]
+        self.watcher = create_watcher(list(self.patterns.values()), poll_interval, polling)
+        # Fuente -> (momento del primer evento pendiente, momento de ingerir)
+        self._pending: Dict[str, Tuple[float, float]] = {}
+
+    def run(self, stop: threading.Event | None = None) -> None:
+        """Ingerir lo que ya haya y después vigilar hasta que se setee ``stop``."""
+        stop = stop or threading.Event()
+        logger.info(f"Watching {', '.join(self.patterns)} ({type(self.watcher).__name__})")
+        for name in self.patterns:
+            self.ingest(name)
+        while not stop.is_set():
+            self.tick()
+
+    def tick(self, timeout: float | None = None) -> Dict[str, Dict[str, Any]]:
+        """Esperar eventos e ingerir las fuentes cuyo debounce venció.
+
+        Returns:
+            Resultado de cada fuente ingerida en este tick.
+        """
+        if timeout is None:
+            due = [due_at for _, due_at in self._pending.values()]
+            timeout = max(min(due) - time.monotonic(), 0.05) if due else 1.0
+        changed = self.watcher.wait(timeout)
+        now = time.monotonic()
+        for name, pattern in self.patterns.items():
+            if any(fnmatch.fnmatch(path, pattern) for path in changed):
+                first = self._pending.get(name, (now, now))[0]
+                self._pending[name] = (first, min(now + self.debounce, first + self.max_wait))
+
+        results = {}
+        for name, (_, due_at) in list(self._pending.items()):
+            if due_at <= now:
+                del self._pending[name]
+                results[name] = self.ingest(name)
+        return results
+
+    def ingest(self, source: str) -> Dict[str, Any]:
+        """Micro-batch de una fuente y, si hubo filas nuevas, sus pipelines.
+
+        Los errores se loguean y se devuelven: el watch sigue corriendo.
+        """
+        start = time.time()
+        try:
+            extraction = self.orchestrator.run_extraction(source)
+        except Exception as e:
+            logger.error(f"Micro-batch {source} failed: {e}")
+            return {"error": str(e), "rows": 0}
+        rows = sum(r.get("rows", 0) for r in extraction.values() if r["status"] == "success")
+        result: Dict[str, Any] = {"extraction": extraction, "rows": rows}
+        if rows:
+            logger.info(f"Micro-batch {source}: {rows} rows in {time.time() - start:.1f}s")
+            if self.run_pipelines:
+                pipelines = self.pipelines_for(source)
+                if pipelines:
+                    result["pipelines"] = self.orchestrator.run_all(sorted(pipelines))
+        return result
+
+    def pipelines_for(self, source: str) -> Set[str]:
+        """Pipelines que leen la fuente en RAW y los que dependen de ellos."""
+        pipelines = self.orchestrator.config.pipelines
+        roots = {p.name for p in pipelines if p.source.layer == "raw" and p.source.domain == source}
+        return downstream(build_dag(pipelines), roots)
+
+    def close(self) -> None:
+        self.watcher.close()
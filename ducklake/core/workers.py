@@ -0,0 +1,106 @@
+"""Ejecución de pipelines en procesos separados (backend ``process`` del DAG).
+
+Cada worker es un proceso con su propio Orchestrator y su propia conexión
+DuckDB (con los límites de settings, o de ``resources`` si el pipeline los
+declara). El archivo del Catalog lo tiene abierto el proceso padre, así que
+los workers no lo abren: usan un ``CatalogRecorder`` que guarda las
+escrituras, y el padre las aplica al recibir el resultado. Lo que un
+pipeline necesita leer del Catalog (ubicación de particiones RAW movidas
+por ``tier``) lo resuelve el padre antes de mandarlo.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from loguru import logger
+
+from ducklake.core.catalog import Catalog
+from ducklake.utils.logger import setup_logger
+
+Record = Tuple[str, tuple, Dict[str, Any]]
+
+# Orchestrator del proceso worker (uno por proceso, se reusa entre pipelines)
+_orchestrator: Any = None
+
+
+class CatalogRecorder:
+    """Catalog de un worker: registra las escrituras para aplicarlas en el padre.
+
+    Las lecturas solo pueden ser de particiones RAW ya resueltas por el padre.
+    """
+
+    def __init__(self, raw_partitions: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]]):
+        self.raw_partitions = raw_partitions
+        self.records: List[Record] = []
+
+    def get_raw_partitions(self, source: str, table: str) -> Dict[str, Dict[str, Any]]:
+        if (source, table) not in self.raw_partitions:
+            raise RuntimeError(f"RAW partitions of {source}/{table} were not resolved for this worker")
+        return self.raw_partitions[(source, table)]
+
+    def __getattr__(self, name: str) -> Any:
+        if not name.startswith(("register_", "mark_")):
+            raise AttributeError(f"Catalog.{name} is not available in pipeline workers")
+
+        def record(*args: Any, **kwargs: Any) -> None:
+            self.records.append((name, args, kwargs))
+
+        return record
+
+    def close(self) -> None:
+        pass
+
+
+def catalog_snapshot(orchestrator: Any, pipeline_name: str) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """Lecturas del Catalog que necesita un pipeline, resueltas en el padre."""
+    source = orchestrator._get_pipeline_config(pipeline_name).source
+    if source.layer != "raw":
+        return {}
+    key = (source.domain, source.table)
+    return {key: orchestrator.catalog.get_raw_partitions(*key)}
+
+
+def process_pool(orchestrator: Any, max_workers: int) -> ProcessPoolExecutor:
+    """Pool de procesos worker para un Orchestrator.
+
+    Usa ``spawn``: un fork después de abrir conexiones DuckDB (con sus
+    threads) no es seguro.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(orchestrator.config_path, orchestrator.data_path, orchestrator.config.settings.log_level),
+    )
+
+
+def run_in_worker(
+    pipeline_name: str, raw_partitions: Dict[Tuple[str, str], Dict[str, Any]]
+) -> Tuple[Dict[str, Any], List[Record]]:
+    """Correr un pipeline en el worker.
+
+    Returns:
+        Resultado de ``run_pipeline`` y las escrituras al Catalog pendientes.
+    """
+    recorder = CatalogRecorder(raw_partitions)
+    _orchestrator.catalog = recorder
+    result = _orchestrator.run_pipeline(pipeline_name)
+    return result, recorder.records
+
+
+def replay(catalog: Catalog, result: Dict[str, Any], records: List[Record]) -> Dict[str, Any]:
+    """Aplicar al Catalog las escrituras de un worker y devolver su resultado."""
+    for method, args, kwargs in records:
+        getattr(catalog, method)(*args, **kwargs)
+    logger.debug(f"Applied {len(records)} catalog record(s) from worker")
+    return result
+
+
+def _init_worker(config_path: str, data_path: str, log_level: str) -> None:
+    """Crear el Orchestrator del proceso (sin abrir el Catalog)."""
+    from ducklake.core.orchestrator import Orchestrator
+
+    global _orchestrator
+    setup_logger(level=log_level)
+    _orchestrator = Orchestrator(config_path, data_path, catalog=CatalogRecorder({}))
@@ -1,6 +1,9 @@
 """CONSUME Layer (Gold): Tablas listas para BI, ML, LLM y exports."""
 
+import hashlib
+import json
 import time
+import uuid
 from pathlib import Path
 from typing import Any, Dict
 
@@ -8,7 +11,17 @@ import duckdb
 import pyarrow.parquet as pq
 from loguru import logger
 
-from ducklake.core.base import BaseLayer
+from ducklake.core import snapshots
+from ducklake.core.base import BaseLayer, select_list
+from ducklake.transformations.rollup import (
+    build_diff_sql,
+    build_final_sql,
+    build_merge_sql,
+    build_partial_sql,
+    decompose_aggregations,
+)
+from ducklake.utils.arrow_ipc import IPC_BATCH_ROWS, write_arrow_ipc
+from ducklake.utils.llm_export import export_llm_shards
 
 
 class ConsumeLayer(BaseLayer):
@@ -26,15 +39,21 @@ class ConsumeLayer(BaseLayer):
 
         Args:
             data: DuckDB relation o DataFrame.
-            destination: Dict con 'use_case' (bi/ml/llm/exports) y 'table'.
+            destination: Dict con 'use_case' (bi/ml/llm/exports), 'table' y
+                opcionalmente 'arrow_ipc' (``uncompressed``/``lz4``) para
+                escribir también ``data.arrow``, cargable con memory-mapping
+                (``arrow_ipc_batch_rows``: filas por record batch).
+
+        El parquet y el ``data.arrow`` van a una versión nueva que se publica
+        al final (ver ``snapshots``): los dashboards siguen leyendo la
+        versión anterior mientras se reconstruye la tabla.
 
         Returns:
             Path del parquet generado.
         """
-        use_case = destination.get("domain", destination.get("use_case", "bi"))
-        table = destination["table"]
-        dest_path = f"{self.base_path}/consume/{use_case}/{table}/data.parquet"
-        Path(dest_path).parent.mkdir(parents=True, exist_ok=True)
+        table_dir = self.table_dir(destination)
+        version_dir = snapshots.new_version(table_dir)
+        dest_path = str(version_dir / snapshots.DATA_FILE)
 
         if isinstance(data, duckdb.DuckDBPyRelation):
             data.write_parquet(dest_path, compression="snappy")
@@ -43,6 +62,14 @@ class ConsumeLayer(BaseLayer):
             pa_table = pa.Table.from_pandas(data)
             pq.write_table(pa_table, dest_path, compression="snappy")
 
+        if destination.get("arrow_ipc"):
+            compression = None if destination["arrow_ipc"] == "uncompressed" else "lz4"
+            ipc_path = str(Path(dest_path).with_suffix(".arrow"))
+            batch_rows = destination.get("arrow_ipc_batch_rows") or IPC_BATCH_ROWS
+            write_arrow_ipc(dest_path, ipc_path, compression, batch_rows)
+            logger.info(f"CONSUME write: {ipc_path}")
+
+        snapshots.publish(table_dir, version_dir.name)
         logger.info(f"CONSUME write: {dest_path}")
         return dest_path
 
@@ -55,14 +82,16 @@ class ConsumeLayer(BaseLayer):
         Returns:
             Query SQL string.
         """
-        use_case = source.get("domain", source.get("use_case", "bi"))
-        table = source["table"]
-        path = f"{self.base_path}/consume/{use_case}/{table}/data.parquet"
+        path = snapshots.current_file(self.table_dir(source))
         return f"SELECT * FROM read_parquet('{path}')"
 
     def process(self, pipeline_config: Dict[str, Any], staging_query: str) -> Dict[str, Any]:
         """Procesar datos de STAGING a CONSUME.
 
+        Si el destino tiene ``llm_export``, además del parquet se renderizan los
+        documentos en shards JSONL comprimidos bajo ``shards/`` (solo se
+        reescriben los shards que cambiaron).
+
         Args:
             pipeline_config: Config del pipeline.
             staging_query: Query SQL para leer desde STAGING.
@@ -75,16 +104,46 @@ class ConsumeLayer(BaseLayer):
         destination = pipeline_config["destination"]
         transforms = pipeline_config.get("transforms", [])
 
+        dest_dir = self.table_dir(destination)
+        rollup_idx = next(
+            (
+                i for i, t in enumerate(transforms)
+                if t.get("type") == "aggregate" and t.get("incremental")
+            ),
+            None,
+        )
+        rollup = None
+        if rollup_idx is not None:
+            # Rollup incremental: lo previo se aplica solo a filas nuevas
+            prefix = transforms[:rollup_idx]
+            staging_query, rollup = self._incremental_rollup(
+                staging_query, prefix, transforms[rollup_idx], dest_dir
+            )
+            transforms = transforms[rollup_idx + 1:]
+
         # Aplicar transformaciones custom si las hay
         if transforms:
             final_query = self._apply_consume_transforms(staging_query, transforms)
         else:
             final_query = staging_query
+        if pipeline_config.get("select"):
+            final_query = f"SELECT {select_list(pipeline_config['select'])} FROM ({final_query})"
 
         relation = self.conn.sql(final_query)
         row_count = self.conn.execute(f"SELECT COUNT(*) FROM ({final_query})").fetchone()[0]
 
         dest_path = self.write(relation, destination)
+        if rollup is not None:
+            self._commit_rollup(dest_dir, rollup)
+
+        llm_export = None
+        if destination.get("llm_export"):
+            llm_export = export_llm_shards(
+                self.conn,
+                f"read_parquet('{dest_path}')",
+                str(dest_dir / "shards"),
+                destination["llm_export"],
+            )
         duration = time.time() - start
 
         logger.success(
@@ -93,8 +152,11 @@ class ConsumeLayer(BaseLayer):
         return {
             "status": "success",
             "path": dest_path,
+            "version": Path(dest_path).parent.name,
             "rows": row_count,
             "duration": duration,
+            **({"llm_export": llm_export} if llm_export else {}),
+            **({"rollup": rollup["summary"]} if rollup else {}),
         }
 
     def _apply_consume_transforms(
@@ -118,6 +180,10 @@ class ConsumeLayer(BaseLayer):
                     FROM {prev}
                     GROUP BY {group_by}
                 )"""
+            elif t["type"] == "asof_join":
+                described = self.conn.execute(f"DESCRIBE {query} SELECT * FROM {prev}")
+                label_columns = [r[0] for r in described.fetchall()]
+                query += f", {step} AS ({self._build_asof_join(prev, t, label_columns)})"
             else:
                 continue
             prev = step
@@ -125,6 +191,172 @@ class ConsumeLayer(BaseLayer):
         query += f" SELECT * FROM {prev}"
         return query
 
+    def _incremental_rollup(
+        self,
+        staging_query: str,
+        prefix: list[Dict[str, Any]],
+        transform: Dict[str, Any],
+        dest_dir: Path,
+    ) -> tuple[str, Dict[str, Any]]:
+        """Actualizar el estado de un rollup con las filas nuevas de STAGING.
+
+        El estado (``_rollup/``) guarda agregados parciales por grupo; se
+        calculan parciales solo de las filas con ``watermark_column`` mayor a
+        la última corrida y se mergean. Cada ``full_refresh_every`` corridas
+        (o si cambia la definición) se recalcula todo y se compara contra el
+        resultado incremental, logueando los grupos que difieran.
+
+        Returns:
+            Query con el resultado final del aggregate y el rollup pendiente
+            de confirmar con ``_commit_rollup``.
+        """
+        group_by = transform.get("group_by") or []
+        aggregations = transform["aggregations"]
+        wm_col = f'"{transform.get("watermark_column") or "_ingestion_timestamp"}"'
+        every = transform.get("full_refresh_every") or 30
+
+        state_dir = dest_dir / "_rollup"
+        state_dir.mkdir(parents=True, exist_ok=True)
+        state_file = state_dir / "state.json"
+        state = json.loads(state_file.read_text()) if state_file.exists() else {}
+        signature = hashlib.sha256(
+            json.dumps([group_by, aggregations, prefix], sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+        def source(where: str = "") -> str:
+            base = f"SELECT * FROM ({staging_query}){where}"
+            return f"({self._apply_consume_transforms(base, prefix) if prefix else base})"
+
+        full_query = f"SELECT {', '.join(group_by + aggregations)} FROM {source()}"
+        if group_by:
+            full_query += f" GROUP BY {', '.join(group_by)}"
+        described = self.conn.execute(f"DESCRIBE {full_query}").fetchall()
+        names = [r[0] for r in described]
+        types = {r[0]: r[1] for r in described}
+        group_names, agg_names = names[:len(group_by)], names[len(group_by):]
+        aggs = decompose_aggregations(self.conn, aggregations, agg_names)
+
+        watermark = self.conn.execute(f"SELECT MAX({wm_col}) FROM ({staging_query})").fetchone()[0]
+        has_state = state.get("signature") == signature and (state_dir / state["file"]).exists()
+        runs = state.get("runs_since_full", 0) + 1 if has_state else 0
+        full = not has_state or runs >= every
+
+        new_file = f"state-{uuid.uuid4().hex}.parquet"
+        mismatched = None
+        if has_state:
+            old_state = f"read_parquet('{state_dir / state['file']}')"
+            where = f" WHERE {wm_col} > '{state['watermark']}'" if state["watermark"] else ""
+            partial = build_partial_sql(group_by, group_names, aggs, source(where))
+            state_sql = build_merge_sql(group_names, aggs, [old_state, f"({partial})"])
+        if full:
+            incremental_sql = state_sql if has_state else None
+            state_sql = build_partial_sql(group_by, group_names, aggs, source())
+            if incremental_sql is not None:
+                diff = build_diff_sql(
+                    group_names,
+                    agg_names,
+                    types,
+                    f"({build_final_sql(group_names, aggs, types, f'({incremental_sql})')})",
+                    f"({build_final_sql(group_names, aggs, types, f'({state_sql})')})",
+                )
+                mismatched = self.conn.execute(diff).fetchone()[0]
+                if mismatched:
+                    logger.warning(
+                        f"Rollup verification: {mismatched} groups differ from full recompute "
+                        "(late or updated rows); state replaced"
+                    )
+            runs = 0
+
+        self.conn.execute(f"COPY ({state_sql}) TO '{state_dir / new_file}' (FORMAT PARQUET)")
+        final = build_final_sql(
+            group_names, aggs, types, f"read_parquet('{state_dir / new_file}')"
+        )
+        logger.info(
+            f"Rollup {'full recompute' if full else 'incremental update'}: {dest_dir.name}"
+        )
+        pending = {
+            "state": {
+                "signature": signature,
+                "file": new_file,
+                "watermark": watermark if watermark is not None else state.get("watermark"),
+                "runs_since_full": runs,
+            },
+            "summary": {"mode": "full" if full else "incremental", "mismatched_groups": mismatched},
+        }
+        return final, pending
+
+    def _commit_rollup(self, dest_dir: Path, rollup: Dict[str, Any]) -> None:
+        """Confirmar el nuevo estado del rollup (el state.json es el punto de commit)."""
+        state_dir = dest_dir / "_rollup"
+        tmp = state_dir / "state.json.tmp"
+        tmp.write_text(json.dumps(rollup["state"], default=str))
+        tmp.replace(state_dir / "state.json")
+        # Borrar el estado anterior (y los de corridas que fallaron antes del commit)
+        for old in state_dir.glob("state-*.parquet"):
+            if old.name != rollup["state"]["file"]:
+                old.unlink(missing_ok=True)
+
+    def table_dir(self, ref: Dict[str, Any]) -> Path:
+        """Directorio de una tabla de CONSUME (versiones, ``_rollup/`` y ``shards/``)."""
+        use_case = ref.get("domain", ref.get("use_case", "bi"))
+        return Path(self.base_path) / "consume" / use_case / ref["table"]
+
+    def _build_asof_join(
+        self, source: str, transform: Dict[str, Any], label_columns: list[str]
+    ) -> str:
+        """Construir un point-in-time join contra tablas de features de STAGING.
+
+        Cada fila del label toma, por clave, la última fila de cada tabla de
+        features cuyo timestamp no es posterior al del label (``strict``: anterior),
+        así ningún feature usa información del futuro. DuckDB resuelve el
+        ASOF JOIN ordenando y particionando ambas entradas por clave.
+
+        Una columna de feature (con su ``prefix``) que se llama igual que una
+        del label o de un feature anterior es un error: DuckDB la renombraría
+        en silencio.
+        """
+        keys = transform["keys"]
+        label_ts = transform["timestamp"]
+        op = ">" if transform.get("strict") else ">="
+
+        selects = ["l.*"]
+        joins = []
+        seen = {c.lower(): "the label" for c in label_columns}
+        for i, feature in enumerate(transform.get("features") or []):
+            alias = f"f{i}"
+            f_keys = feature.get("keys") or keys
+            f_ts = feature.get("timestamp") or label_ts
+            f_query = feature.get("query") or "SELECT * FROM read_parquet('{}')".format(
+                snapshots.current_file(
+                    Path(self.base_path) / "staging" / feature["domain"] / feature["table"]
+                )
+            )
+            columns = feature.get("columns") or [
+                r[0]
+                for r in self.conn.execute(f"DESCRIBE {f_query}").fetchall()
+                if r[0] not in f_keys and r[0] != f_ts
+            ]
+            prefix = feature.get("prefix") or ""
+            name = f"{feature['domain']}.{feature['table']}"
+            for c in columns:
+                other = seen.get(f"{prefix}{c}".lower())
+                if other:
+                    raise ValueError(
+                        f"asof_join: column '{prefix}{c}' from feature {name} collides with "
+                        f"{other}; set a prefix for the feature"
+                    )
+                seen[f"{prefix}{c}".lower()] = f"feature {name}"
+            selects += [f'{alias}."{c}" AS "{prefix}{c}"' for c in columns]
+            f_cols = ", ".join(f'"{c}"' for c in dict.fromkeys([*f_keys, f_ts, *columns]))
+            conditions = [f'l."{lk}" = {alias}."{fk}"' for lk, fk in zip(keys, f_keys)]
+            conditions.append(f'l."{label_ts}" {op} {alias}."{f_ts}"')
+            joins.append(
+                f"ASOF LEFT JOIN (SELECT {f_cols} FROM ({f_query})) {alias} "
+                f"ON {' AND '.join(conditions)}"
+            )
+
+        return f"SELECT {', '.join(selects)} FROM {source} l {' '.join(joins)}"
+
     def list_use_cases(self) -> list[str]:
         """Listar use cases disponibles en CONSUME."""
         consume_path = Path(self.base_path) / "consume"
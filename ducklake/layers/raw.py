@@ -1,5 +1,6 @@
 """RAW Layer (Bronze): Datos crudos append-only, particionados por fecha."""
 
+import glob
 import shutil
 from datetime import datetime
 from pathlib import Path
@@ -7,52 +8,107 @@ from typing import Any, Dict
 
 from loguru import logger
 
-from ducklake.core.base import BaseLayer
+from ducklake.core.base import BaseLayer, select_list
 
 
 class RawLayer(BaseLayer):
     """RAW Layer: recibe datos de conectores y los almacena como Parquet particionado.
 
-    Filosofía: append-only, nunca borrar, máxima fidelidad con la fuente.
+    Filosofía: append-only, máxima fidelidad con la fuente (solo ``ducklake tier``
+    reescribe, mueve o borra particiones viejas según la retención configurada).
     Path: data/raw/{source}/{table}/year=YYYY/month=MM/day=DD/data.parquet
+    Extracciones en varias partes: .../day=DD/part-{HHMMSSffffff}-NNNN.parquet
+    Fuentes con ``extract.raw_partition: hour``: .../day=DD/hour=HH/...
+    Todas las particiones de una tabla tienen la misma profundidad: la lectura
+    con hive_partitioning falla si se mezclan ``day=DD/`` y ``day=DD/hour=HH/``.
     """
 
     def write(self, source_path: str, destination: Dict[str, Any]) -> str:
         """Escribir datos a RAW layer copiando el parquet extraído.
 
         Args:
-            source_path: Path del parquet origen (extraído por un connector).
-            destination: Dict con 'source' y 'table'.
+            source_path: Path del parquet origen (extraído por un connector), o
+                directorio con archivos part.
+            destination: Dict con 'source', 'table' y opcionalmente 'partition'
+                (``day`` o ``hour``).
 
         Returns:
-            Path donde se guardó el archivo.
+            Path donde se guardó el archivo, o glob de los archivos part escritos.
+
+        Raises:
+            ValueError: Si la tabla ya tiene particiones de la otra granularidad.
         """
         source_name = destination["source"]
         table = destination["table"]
         date = datetime.now()
+        hourly = destination.get("partition") == "hour"
 
         base = f"{self.base_path}/raw/{source_name}/{table}"
-        partition_path = self.get_partition_path(base, date)
+        self._check_partition_depth(base, hourly)
+        partition_path = self.get_partition_path(base, date, hourly=hourly)
         Path(partition_path).mkdir(parents=True, exist_ok=True)
 
+        if Path(source_path).is_dir():
+            return self._write_parts(Path(source_path), partition_path, date)
+
         dest_file = f"{partition_path}/data.parquet"
         shutil.copy2(source_path, dest_file)
 
         logger.info(f"RAW write: {dest_file}")
         return dest_file
 
+    def _check_partition_depth(self, base: str, hourly: bool) -> None:
+        """Rechazar particiones horarias en una tabla con particiones diarias (o al revés)."""
+        other_level = "year=*/month=*/day=*/*.parquet" if hourly else "year=*/month=*/day=*/hour=*"
+        existing = next(glob.iglob(f"{base}/{other_level}"), None)
+        if existing is not None:
+            current, requested = ("day", "hour") if hourly else ("hour", "day")
+            raise ValueError(
+                f"RAW table {base} already has {current}-level partitions ({existing}); "
+                f"cannot write {requested}-level partitions to it. Keep extract.raw_partition: "
+                f"{current} or move the existing partitions out of the table first."
+            )
+
+    def _write_parts(self, source_dir: Path, partition_path: str, date: datetime) -> str:
+        """Copiar los archivos part de una extracción a la partición.
+
+        Los nombres llevan la hora de la escritura, así varias extracciones del
+        mismo día se acumulan sin pisarse.
+
+        Returns:
+            Glob que matchea solo los archivos escritos en esta llamada.
+        """
+        stamp = date.strftime("%H%M%S%f")
+        parts = sorted(source_dir.glob("*.parquet"))
+        for i, part in enumerate(parts):
+            shutil.copy2(part, f"{partition_path}/part-{stamp}-{i:04d}.parquet")
+
+        logger.info(f"RAW write: {len(parts)} parts -> {partition_path}")
+        return f"{partition_path}/part-{stamp}-*.parquet"
+
     def read(self, source: Dict[str, Any]) -> str:
         """Construir query DuckDB para leer datos de RAW.
 
         Args:
-            source: Dict con 'source', 'table' y opcionalmente 'date_from'/'date_to'.
+            source: Dict con 'source', 'table' y opcionalmente 'date_from'/'date_to',
+                'columns' (proyección: solo esas columnas se leen del Parquet),
+                'files' (leer solo esos archivos en lugar de toda la tabla) y
+                'locations' (directorios de particiones movidas al cold tier).
 
         Returns:
             Query SQL string para DuckDB read_parquet.
         """
-        pattern = f"{self.base_path}/raw/{source['domain']}/{source['table']}/**/*.parquet"
-
-        query = f"SELECT * FROM read_parquet('{pattern}', hive_partitioning=true)"
+        files = source.get("files")
+        if not files and source.get("locations"):
+            # Con particiones movidas al cold tier se listan los archivos de ambos lados
+            files = self.list_files(source)
+        if files:
+            target = "[" + ", ".join(f"'{f}'" for f in files) + "]"
+        else:
+            target = f"'{self._pattern(source)}'"
+
+        cols = select_list(source.get("columns"))
+        query = f"SELECT {cols} FROM read_parquet({target}, hive_partitioning=true)"
 
         filters = []
         if "date_from" in source and source["date_from"]:
@@ -65,6 +121,25 @@ class RawLayer(BaseLayer):
 
         return query
 
+    def list_files(self, source: Dict[str, Any]) -> list[str]:
+        """Listar los archivos Parquet de una tabla RAW, de más viejo a más nuevo.
+
+        Incluye los de ``source['locations']`` (particiones en el cold tier);
+        el orden es por partición, sin importar dónde esté cada una.
+        """
+        files = glob.glob(self._pattern(source), recursive=True)
+        for location in source.get("locations") or []:
+            files += glob.glob(f"{location}/*.parquet")
+        table_root = f"/{source['table']}/"
+        return sorted(files, key=lambda f: f.rsplit(table_root, 1)[-1])
+
+    def list_partitions(self, source: Dict[str, Any]) -> list[Path]:
+        """Directorios de partición (con archivos Parquet) de una tabla RAW."""
+        return sorted({Path(f).parent for f in glob.glob(self._pattern(source), recursive=True)})
+
+    def _pattern(self, source: Dict[str, Any]) -> str:
+        return f"{self.base_path}/raw/{source['domain']}/{source['table']}/**/*.parquet"
+
     def list_sources(self) -> list[str]:
         """Listar fuentes disponibles en RAW."""
         raw_path = Path(self.base_path) / "raw"
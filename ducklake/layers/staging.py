@@ -1,22 +1,38 @@
 """STAGING Layer (Silver): Limpieza, normalización y calidad de datos."""
 
+import os
+import shutil
 import time
+import uuid
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 import duckdb
 import pyarrow.parquet as pq
 from loguru import logger
 
-from ducklake.core.base import BaseLayer
+from ducklake.core import snapshots
+from ducklake.core.base import BaseLayer, select_list
 from ducklake.core.quality import QualityChecker
+from ducklake.transformations import partitioned
+from ducklake.transformations.cleaning import bucketed_dedup
+from ducklake.transformations.enrichment import hash_key_expr
+from ducklake.transformations.rollup import (
+    build_final_sql,
+    build_merge_sql,
+    build_partial_sql,
+    decompose_aggregations,
+)
+from ducklake.utils import key_index
+from ducklake.utils.duckdb_helper import parse_memory_limit
 
 
 class StagingLayer(BaseLayer):
     """STAGING Layer: limpia, normaliza y valida datos provenientes de RAW.
 
     Filosofía: reemplazar particiones, idempotente.
-    Path: data/staging/{domain}/{table}/data.parquet
+    Path: data/staging/{domain}/{table}/versions/{version}/data.parquet
+    (la versión actual se publica en ``{table}/CURRENT``, ver ``snapshots``).
     """
 
     def write(self, data: Any, destination: Dict[str, Any]) -> str:
@@ -24,15 +40,18 @@ class StagingLayer(BaseLayer):
 
         Args:
             data: DuckDB relation o DataFrame.
-            destination: Dict con 'domain' y 'table'.
+            destination: Dict con 'domain', 'table' y opcionalmente 'index'
+                (columnas clave) para escribir también el índice de lookups.
+
+        Cada escritura crea una versión nueva y la publica al final, así los
+        lectores concurrentes siguen viendo la versión anterior completa.
 
         Returns:
             Path del parquet generado.
         """
-        domain = destination.get("domain", "default")
-        table = destination["table"]
-        dest_path = f"{self.base_path}/staging/{domain}/{table}/data.parquet"
-        Path(dest_path).parent.mkdir(parents=True, exist_ok=True)
+        table_dir = self.table_dir(destination)
+        version_dir = snapshots.new_version(table_dir)
+        dest_path = str(version_dir / snapshots.DATA_FILE)
 
         if isinstance(data, duckdb.DuckDBPyRelation):
             data.write_parquet(dest_path, compression="snappy")
@@ -42,22 +61,47 @@ class StagingLayer(BaseLayer):
             pa_table = pa.Table.from_pandas(data)
             pq.write_table(pa_table, dest_path, compression="snappy")
 
+        if destination.get("index"):
+            key_index.build_key_index(self.conn, dest_path, destination["index"])
+
+        snapshots.publish(table_dir, version_dir.name)
         logger.info(f"STAGING write: {dest_path}")
         return dest_path
 
+    def table_dir(self, ref: Dict[str, Any]) -> Path:
+        """Directorio de una tabla de STAGING (contiene sus versiones)."""
+        return Path(self.base_path) / "staging" / ref.get("domain", "default") / ref["table"]
+
+    def lookup(self, source: Dict[str, Any], values: List[Any]) -> duckdb.DuckDBPyRelation:
+        """Buscar filas por clave usando el índice de la tabla.
+
+        Solo se leen los row groups que contienen la clave, en lugar de
+        escanear todo ``data.parquet``.
+
+        Args:
+            source: Dict con 'domain' y 'table'.
+            values: Valores de las columnas clave (en el orden de ``index``).
+
+        Returns:
+            Relation con las filas de esa clave.
+        """
+        path = snapshots.current_file(self.table_dir(source))
+        if not path.exists():
+            raise ValueError(f"STAGING table not found: {source.get('domain')}/{source['table']}")
+        return key_index.lookup(self.conn, str(path), values)
+
     def read(self, source: Dict[str, Any]) -> str:
         """Construir query para leer datos de STAGING.
 
         Args:
-            source: Dict con 'domain' y 'table'.
+            source: Dict con 'domain', 'table' y opcionalmente 'columns'.
 
         Returns:
             Query SQL string.
         """
-        domain = source.get("domain", "default")
-        table = source["table"]
-        path = f"{self.base_path}/staging/{domain}/{table}/data.parquet"
-        return f"SELECT * FROM read_parquet('{path}')"
+        # Se resuelve la versión actual una sola vez: la query queda fija a ese archivo
+        path = snapshots.current_file(self.table_dir(source))
+        return f"SELECT {select_list(source.get('columns'))} FROM read_parquet('{path}')"
 
     def process(self, pipeline_config: Dict[str, Any], raw_query: str) -> Dict[str, Any]:
         """Procesar datos de RAW a STAGING aplicando transformaciones y quality checks.
@@ -70,13 +114,146 @@ class StagingLayer(BaseLayer):
             Dict con status, path, rows, duration.
         """
         start = time.time()
+        work_dir = f"{self.base_path}/_tmp/staging-{uuid.uuid4().hex}"
+        try:
+            return self._process(pipeline_config, raw_query, work_dir, start)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def process_partitioned(
+        self, pipeline_config: Dict[str, Any], raw_query: str, group_queries: List[str]
+    ) -> Dict[str, Any]:
+        """Procesar por grupos de particiones de RAW en paralelo (map) y combinar (merge).
+
+        El resultado es el mismo que ``process`` sobre ``raw_query``, pero
+        cada worker del map solo necesita memoria para su grupo (ver
+        ``transformations.partitioned``). Los workers se reparten la memoria
+        y los threads de esta conexión.
+
+        Args:
+            pipeline_config: Config del pipeline (con ``partitioned``).
+            raw_query: Query de lectura de RAW completa (define el schema).
+            group_queries: Query de lectura de cada grupo de particiones.
+
+        Returns:
+            Dict con status, path, rows, duration y resumen del map.
+        """
+        start = time.time()
+        work_dir = f"{self.base_path}/_tmp/staging-{uuid.uuid4().hex}"
+        try:
+            merge_query, transforms, summary = self._map_partitions(
+                pipeline_config, raw_query, group_queries, work_dir
+            )
+            result = self._process(
+                {**pipeline_config, "transforms": transforms}, merge_query, work_dir, start
+            )
+            return {**result, "partitioned": summary}
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _map_partitions(
+        self,
+        pipeline_config: Dict[str, Any],
+        raw_query: str,
+        group_queries: List[str],
+        work_dir: str,
+    ) -> Tuple[str, List[Dict[str, Any]], Dict[str, Any]]:
+        """Map de ``process_partitioned``: un parquet parcial por grupo.
+
+        Returns:
+            Query que lee el merge, transformaciones que faltan aplicar y
+            resumen del map.
+        """
+        options = pipeline_config["partitioned"]
+        prefix, reducer, rest = partitioned.split_transforms(pipeline_config.get("transforms", []))
+        map_dir = Path(work_dir) / "map"
+        map_dir.mkdir(parents=True)
+        partials = f"read_parquet('{map_dir}/*.parquet')"
+
+        full_prefix = self._apply_transforms(raw_query, prefix)
+        aggs = None
+        if reducer is not None and reducer["type"] == "aggregate":
+            group_by = reducer["group_by"]
+            full_agg = (
+                f"SELECT {', '.join(group_by + reducer['aggregations'])} FROM ({full_prefix}) "
+                f"GROUP BY {', '.join(group_by)}"
+            )
+            described = self.conn.execute(f"DESCRIBE {full_agg}").fetchall()
+            names = [r[0] for r in described]
+            types = {r[0]: r[1] for r in described}
+            group_names = names[:len(group_by)]
+            try:
+                aggs = decompose_aggregations(
+                    self.conn, reducer["aggregations"], names[len(group_by):]
+                )
+            except ValueError as e:
+                logger.info(f"Aggregate runs in the merge step only: {e}")
+
+        if aggs is not None:
+            # Agregados parciales por grupo, combinados en el merge
+            schema = self._schema(full_prefix)
+
+            def map_sql(query: str) -> str:
+                rows = partitioned.conform_sql(self._apply_transforms(query, prefix), schema)
+                return build_partial_sql(group_by, group_names, aggs, f"({rows})")
+
+            merged = build_merge_sql(group_names, aggs, [partials])
+            merge_query = build_final_sql(group_names, aggs, types, f"({merged})")
+        else:
+            map_transforms = list(prefix)
+            if reducer is not None:
+                rest = [reducer] + rest
+                if reducer["type"] == "deduplicate":
+                    # Dedup local (en memoria, el grupo es chico); el merge respeta la estrategia
+                    map_transforms.append({**reducer, "strategy": None})
+            schema = self._schema(self._apply_transforms(raw_query, map_transforms))
+
+            def map_sql(query: str) -> str:
+                rows = self._apply_transforms(query, map_transforms)
+                return partitioned.conform_sql(rows, schema)
+
+            merge_query = f"SELECT * FROM {partials}"
+
+        workers = options.get("workers") or min(4, os.cpu_count() or 1)
+        memory, threads = self.conn.execute(
+            "SELECT current_setting('memory_limit'), current_setting('threads')"
+        ).fetchone()
+        worker_memory = f"{max(parse_memory_limit(memory) // workers // 2**20, 64)}MiB"
+        tasks = [
+            (map_sql(query), str(map_dir / f"group-{i:05d}.parquet"))
+            for i, query in enumerate(group_queries)
+        ]
+        map_rows = partitioned.run_map(
+            tasks,
+            workers,
+            worker_memory,
+            max(int(threads) // workers, 1),
+            options.get("backend") or "thread",
+        )
+        logger.info(
+            f"Partition map: {len(tasks)} groups, {map_rows} rows "
+            f"({workers} workers, {worker_memory} each)"
+        )
+        summary = {"groups": len(tasks), "workers": workers, "map_rows": map_rows}
+        return merge_query, rest, summary
+
+    def _schema(self, query: str) -> List[Tuple[str, str]]:
+        return [(r[0], r[1]) for r in self.conn.execute(f"DESCRIBE {query}").fetchall()]
+
+    def _process(
+        self, pipeline_config: Dict[str, Any], raw_query: str, work_dir: str, start: float
+    ) -> Dict[str, Any]:
+        """Cuerpo de ``process``; ``work_dir`` guarda los intermedios temporales."""
         pipeline_name = pipeline_config["name"]
         transforms = pipeline_config.get("transforms", [])
         quality_checks = pipeline_config.get("quality_checks", [])
         destination = pipeline_config["destination"]
 
+        # Dedups bucketed se materializan antes; el resto se encadena como CTEs
+        raw_query, transforms = self._materialize_bucketed_dedups(raw_query, transforms, work_dir)
+
         # Aplicar transformaciones via SQL
-        final_query = self._apply_transforms(raw_query, transforms)
+        final_query = self._apply_transforms(raw_query, transforms, pipeline_config.get("select"))
 
         # Ejecutar y materializar
         result = self.conn.execute(final_query)
@@ -103,22 +280,67 @@ class StagingLayer(BaseLayer):
         return {
             "status": "success",
             "path": dest_path,
+            "version": Path(dest_path).parent.name,
             "rows": row_count,
             "duration": duration,
             "quality": quality_results,
         }
 
-    def _apply_transforms(self, base_query: str, transforms: List[Dict[str, Any]]) -> str:
+    def _materialize_bucketed_dedups(
+        self, base_query: str, transforms: List[Dict[str, Any]], work_dir: str
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """Ejecutar los ``deduplicate`` con ``strategy: bucketed`` fuera de memoria.
+
+        Cada dedup bucketed corta la cadena: las transformaciones previas se
+        materializan particionadas por hash de las claves y las siguientes
+        leen el resultado deduplicado.
+
+        Returns:
+            Query base y transformaciones restantes.
+        """
+        remaining = list(transforms)
+        step = 0
+        while True:
+            idx = next(
+                (
+                    i for i, t in enumerate(remaining)
+                    if t.get("type") == "deduplicate" and t.get("strategy") == "bucketed"
+                ),
+                None,
+            )
+            if idx is None:
+                return base_query, remaining
+            transform = remaining[idx]
+            base_query = bucketed_dedup(
+                self.conn,
+                self._apply_transforms(base_query, remaining[:idx]),
+                transform["keys"],
+                f"{work_dir}/dedup_{step}",
+                buckets=transform.get("buckets") or 16,
+                parallelism=transform.get("parallelism"),
+            )
+            remaining = remaining[idx + 1:]
+            step += 1
+
+    def _apply_transforms(
+        self,
+        base_query: str,
+        transforms: List[Dict[str, Any]],
+        select: List[str] | None = None,
+    ) -> str:
         """Construir query SQL encadenando transformaciones como CTEs.
 
         Args:
             base_query: Query SQL base (lectura de RAW).
             transforms: Lista de transformaciones.
+            select: Columnas de salida (None = todas).
 
         Returns:
             Query SQL completa con CTEs.
         """
         if not transforms:
+            if select:
+                return f"SELECT {select_list(select)} FROM ({base_query})"
             return base_query
 
         query = f"WITH base AS ({base_query})"
@@ -158,6 +380,14 @@ class StagingLayer(BaseLayer):
                     WHERE {condition}
                 )"""
 
+            elif t_type == "hash_key":
+                key = hash_key_expr(transform["keys"], transform.get("key_type") or "md5")
+                query += f"""
+                , {step} AS (
+                    SELECT *, {key} AS {transform.get("key_name") or "hash_key"}
+                    FROM {prev_step}
+                )"""
+
             elif t_type == "deduplicate":
                 keys = ", ".join(transform["keys"])
                 query += f"""
@@ -171,6 +401,16 @@ class StagingLayer(BaseLayer):
                     ) sub WHERE __rn = 1
                 )"""
 
+            elif t_type == "aggregate":
+                group_by = ", ".join(transform["group_by"])
+                aggs = ", ".join(transform["aggregations"])
+                query += f"""
+                , {step} AS (
+                    SELECT {group_by}, {aggs}
+                    FROM {prev_step}
+                    GROUP BY {group_by}
+                )"""
+
             elif t_type == "custom_sql":
                 sql = transform["sql"]
                 query += f"""
@@ -185,9 +425,12 @@ class StagingLayer(BaseLayer):
             prev_step = step
 
         # Query final: excluir columnas internas
-        query += f" SELECT * EXCLUDE (__rn) FROM {prev_step}"
-        # Si no hubo dedup, __rn no existe, usar try
-        if not any(t.get("type") == "deduplicate" for t in transforms):
-            query = query.replace(" EXCLUDE (__rn)", "")
+        if select:
+            query += f" SELECT {select_list(select)} FROM {prev_step}"
+        else:
+            query += f" SELECT * EXCLUDE (__rn) FROM {prev_step}"
+            # Si no hubo dedup, __rn no existe, usar try
+            if not any(t.get("type") == "deduplicate" for t in transforms):
+                query = query.replace(" EXCLUDE (__rn)", "")
 
         return query
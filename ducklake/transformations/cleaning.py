@@ -1,7 +1,13 @@
 """Funciones de limpieza de datos."""
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any, Dict, List
 
+import duckdb
+from loguru import logger
+
 
 def build_rename_sql(columns: Dict[str, str], source: str = "input") -> str:
     """Construir SQL para renombrar columnas.
@@ -64,3 +70,70 @@ def build_filter_sql(condition: str, source: str = "input") -> str:
         Query SQL.
     """
     return f"SELECT * FROM {source} WHERE {condition}"
+
+
+def bucketed_dedup(
+    conn: duckdb.DuckDBPyConnection,
+    source_query: str,
+    keys: List[str],
+    work_dir: str,
+    buckets: int = 16,
+    parallelism: int | None = None,
+    order_by: str = "_ingestion_timestamp DESC",
+) -> str:
+    """Deduplicar fuera de memoria particionando por hash de las claves.
+
+    Escribe la entrada en ``buckets`` particiones Parquet según
+    ``hash(keys) % buckets`` y deduplica cada una por separado (en paralelo).
+    Como todas las filas de una misma clave caen en el mismo bucket, el
+    resultado es el mismo que ``build_dedup_sql`` sobre la entrada completa,
+    pero cada ventana solo necesita memoria para un bucket.
+
+    Args:
+        conn: Conexión DuckDB.
+        source_query: Query SQL de entrada.
+        keys: Columnas clave para deduplicación.
+        work_dir: Directorio temporal para buckets y resultados.
+        buckets: Cantidad de particiones por hash.
+        parallelism: Buckets deduplicados en simultáneo (default: min(4, CPUs)).
+        order_by: Orden para elegir qué fila mantener.
+
+    Returns:
+        Query SQL que lee el resultado deduplicado (sin columna ``__rn``).
+    """
+    keys_str = ", ".join(keys)
+    bucket_dir = Path(work_dir) / "buckets"
+    out_dir = Path(work_dir) / "dedup"
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    conn.execute(f"""
+        COPY (
+            SELECT *, hash({keys_str}) % {int(buckets)} AS __bucket FROM ({source_query})
+        ) TO '{bucket_dir}' (FORMAT PARQUET, PARTITION_BY (__bucket))
+    """)
+
+    bucket_paths = sorted(bucket_dir.glob("__bucket=*")) if bucket_dir.exists() else []
+    if not bucket_paths:
+        # Entrada vacía: un archivo sin filas con el schema de la entrada
+        empty = out_dir / "bucket-empty.parquet"
+        conn.execute(f"COPY (SELECT * FROM ({source_query}) LIMIT 0) TO '{empty}' (FORMAT PARQUET)")
+        return f"SELECT * FROM read_parquet('{empty}')"
+
+    def dedup_bucket(path: Path) -> None:
+        cursor = conn.cursor()
+        try:
+            source = f"read_parquet('{path}/*.parquet', hive_partitioning=false)"
+            dedup = build_dedup_sql(keys, order_by=order_by, source=source)
+            target = out_dir / f"bucket-{path.name.split('=', 1)[1]}.parquet"
+            cursor.execute(
+                f"COPY (SELECT * EXCLUDE (__rn) FROM ({dedup})) TO '{target}' (FORMAT PARQUET)"
+            )
+        finally:
+            cursor.close()
+
+    workers = parallelism or min(4, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(dedup_bucket, bucket_paths))
+
+    logger.info(f"Bucketed dedup: {len(bucket_paths)} buckets on ({keys_str})")
+    return f"SELECT * FROM read_parquet('{out_dir}/*.parquet')"
@@ -1,5 +1,10 @@
 """Funciones de enriquecimiento de datos."""
 
+# Tipos de surrogate key: md5 (VARCHAR de 32 caracteres), int64 (UBIGINT: los
+# primeros 64 bits del MD5, big-endian) o int128 (UUID: el MD5 completo en 16
+# bytes; en parquet es FIXED_LEN_BYTE_ARRAY, un UHUGEINT se escribiría como DOUBLE)
+KEY_TYPES = ("md5", "int64", "int128")
+
 
 def build_date_parts_sql(column: str, source: str = "input") -> str:
     """Agregar columnas de partes de fecha (year, month, day, dow).
@@ -21,16 +26,77 @@ def build_date_parts_sql(column: str, source: str = "input") -> str:
     """
 
 
-def build_hash_key_sql(columns: list[str], key_name: str = "hash_key", source: str = "input") -> str:
+def hash_key_expr(columns: list[str], key_type: str = "md5") -> str:
+    """Expresión SQL de una surrogate key a partir de múltiples columnas.
+
+    Los tres tipos salen del mismo MD5, así que una clave ``md5`` existente
+    se convierte a los otros sin rehashear (ver ``md5_key_expr``). Las claves
+    enteras ocupan 8 o 16 bytes en lugar de 32 caracteres y hacen más
+    baratos los joins y GROUP BY; con ``int64`` conviene verificar colisiones
+    (``build_key_collision_sql``) en tablas de cientos de millones de claves.
+
+    Args:
+        columns: Columnas a hashear.
+        key_type: ``md5``, ``int64`` o ``int128``.
+
+    Raises:
+        ValueError: Si ``key_type`` no es válido.
+    """
+    concat = " || '|' || ".join(f"COALESCE(CAST({c} AS VARCHAR), '')" for c in columns)
+    return md5_key_expr(f"MD5({concat})", key_type)
+
+
+def md5_key_expr(md5: str, key_type: str = "md5") -> str:
+    """Convertir un MD5 en hexadecimal (expresión SQL) a una surrogate key de ``key_type``.
+
+    Sirve para claves ``md5`` ya guardadas o que vienen de otro sistema.
+
+    Raises:
+        ValueError: Si ``key_type`` no es válido.
+    """
+    if key_type not in KEY_TYPES:
+        raise ValueError(f"Invalid key_type '{key_type}', expected one of {KEY_TYPES}")
+    if key_type == "int64":
+        return f"CAST('0x' || LEFT({md5}, 16) AS UBIGINT)"
+    if key_type == "int128":
+        return f"CAST({md5} AS UUID)"
+    return md5
+
+
+def build_hash_key_sql(
+    columns: list[str], key_name: str = "hash_key", source: str = "input", key_type: str = "md5"
+) -> str:
     """Generar columna de hash key a partir de múltiples columnas.
 
     Args:
         columns: Columnas a hashear.
         key_name: Nombre de la columna hash resultante.
         source: Tabla/CTE fuente.
+        key_type: ``md5``, ``int64`` o ``int128`` (ver ``hash_key_expr``).
 
     Returns:
         Query SQL.
     """
-    concat = " || '|' || ".join(f"COALESCE(CAST({c} AS VARCHAR), '')" for c in columns)
-    return f"SELECT *, MD5({concat}) AS {key_name} FROM {source}"
+    return f"SELECT *, {hash_key_expr(columns, key_type)} AS {key_name} FROM {source}"
+
+
+def build_key_collision_sql(columns: list[str], key_name: str, source: str = "input") -> str:
+    """Claves que corresponden a más de una combinación de ``columns``.
+
+    Args:
+        columns: Columnas de las que sale la clave.
+        key_name: Columna de la surrogate key.
+        source: Tabla/CTE fuente.
+
+    Returns:
+        Query SQL con ``key_name`` y ``n_values`` (combinaciones distintas),
+        vacía si no hay colisiones.
+    """
+    cols = ", ".join(columns)
+    return f"""
+    SELECT {key_name}, COUNT(DISTINCT ({cols})) AS n_values
+    FROM {source}
+    WHERE {key_name} IS NOT NULL
+    GROUP BY {key_name}
+    HAVING COUNT(DISTINCT ({cols})) > 1
+    """
@@ -0,0 +1,126 @@
+"""Ejecución particionada (map/merge) de pipelines RAW -> STAGING.
+
+Cada grupo de particiones de fecha de RAW se procesa por separado en un
+worker con su propia conexión DuckDB (una parte de la memoria del
+pipeline) y escribe un parquet parcial. Después un merge combina los
+parciales:
+
+- rename/cast/filter/hash_key son por fila: se aplican completos en el map;
+- ``deduplicate`` se aplica en el map (reduce cada grupo a la última fila
+  por clave) y otra vez en el merge, que ve la última de cada grupo;
+- ``aggregate`` con SUM/COUNT/MIN/MAX/AVG calcula parciales por grupo que
+  el merge combina (ver ``rollup``);
+- lo que sigue (y cualquier ``custom_sql``) corre en el merge.
+
+Los workers solo reciben SQL y paths, así que pueden correr en threads, en
+procesos o en otras máquinas que compartan el storage.
+"""
+
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+from typing import Any, Dict, List, Tuple
+
+from loguru import logger
+
+from ducklake.core.base import partition_date
+from ducklake.utils.duckdb_helper import create_connection
+
+ROW_WISE = ("rename", "cast", "filter", "hash_key")
+
+
+def split_transforms(
+    transforms: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any] | None, List[Dict[str, Any]]]:
+    """Separar las transformaciones en prefijo por fila, reducción y resto.
+
+    Returns:
+        ``(prefijo, reducción, resto)``; la reducción es el primer
+        ``deduplicate``/``aggregate`` después del prefijo, o None.
+    """
+    i = 0
+    while i < len(transforms) and transforms[i]["type"] in ROW_WISE:
+        i += 1
+    if i < len(transforms) and transforms[i]["type"] in ("deduplicate", "aggregate"):
+        return transforms[:i], transforms[i], transforms[i + 1:]
+    return transforms[:i], None, transforms[i:]
+
+
+def group_files(files: List[str], group_days: int = 1) -> List[List[str]]:
+    """Agrupar archivos RAW por fecha de partición, ``group_days`` fechas por grupo.
+
+    Los archivos sin fecha en el path van a un grupo propio al final.
+    """
+    by_day: Dict[date | None, List[str]] = defaultdict(list)
+    for f in files:
+        by_day[partition_date(f)].append(f)
+    days = sorted(d for d in by_day if d is not None)
+    groups = [
+        [f for day in days[i:i + group_days] for f in by_day[day]]
+        for i in range(0, len(days), group_days)
+    ]
+    if None in by_day:
+        groups.append(by_day[None])
+    return groups
+
+
+def conform_sql(sql: str, schema: List[Tuple[str, str]]) -> str:
+    """Castear la salida de ``sql`` a ``schema`` (``[(columna, tipo)]``).
+
+    Los parciales de cada grupo deben tener los mismos tipos, y DuckDB
+    infiere los de las columnas hive por grupo (``month=01`` es VARCHAR,
+    ``month=10`` BIGINT); el schema sale de la query sobre todos los grupos.
+    """
+    columns = ", ".join(f'CAST("{name}" AS {dtype}) AS "{name}"' for name, dtype in schema)
+    return f"SELECT {columns} FROM ({sql})"
+
+
+def run_map(
+    tasks: List[Tuple[str, str]],
+    workers: int,
+    memory_limit: str,
+    threads: int,
+    backend: str = "thread",
+) -> int:
+    """Ejecutar las queries del map, cada una a su parquet parcial.
+
+    Args:
+        tasks: Pares ``(sql, path de salida)``.
+        workers: Grupos procesados en simultáneo.
+        memory_limit: Memoria de la conexión de cada worker.
+        threads: Threads de la conexión de cada worker.
+        backend: ``thread`` o ``process``.
+
+    Returns:
+        Filas escritas en total.
+    """
+    pool: Executor
+    if backend == "process":
+        # spawn: un fork con conexiones DuckDB abiertas (y sus threads) no es seguro
+        pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+    with pool:
+        futures = [
+            pool.submit(map_partition, sql, out, memory_limit, threads) for sql, out in tasks
+        ]
+        return sum(f.result() for f in futures)
+
+
+def map_partition(sql: str, out_path: str, memory_limit: str, threads: int) -> int:
+    """Escribir el resultado de ``sql`` en ``out_path`` con una conexión propia.
+
+    Returns:
+        Filas escritas.
+    """
+    conn = create_connection(memory_limit=memory_limit, threads=threads)
+    try:
+        rows = conn.execute(f"COPY ({sql}) TO '{out_path}' (FORMAT PARQUET)").fetchone()[0]
+    finally:
+        conn.close()
+    logger.debug(f"Partition map: {rows} rows -> {out_path}")
+    return rows
+
@@ -0,0 +1,135 @@
+"""Rollups incrementales: agregaciones descomponibles en parciales mergeables."""
+
+import copy
+import json
+from typing import Any, Dict, List
+
+import duckdb
+
+from ducklake.core.projection import parse_sql
+
+# Cómo se combinan dos parciales de cada tipo de agregación
+_MERGE = {"sum": "SUM", "count": "SUM", "count_star": "SUM", "min": "MIN", "max": "MAX"}
+
+
+def decompose_aggregations(
+    conn: duckdb.DuckDBPyConnection, aggregations: List[str], names: List[str]
+) -> List[Dict[str, Any]]:
+    """Descomponer agregaciones en columnas parciales que se pueden mergear.
+
+    SUM, COUNT, MIN y MAX se guardan tal cual; AVG se guarda como SUM y
+    COUNT del mismo argumento (respetando ``FILTER``).
+
+    Args:
+        conn: Conexión DuckDB (para parsear las expresiones).
+        aggregations: Expresiones del transform ``aggregate`` (ej. ``SUM(total) AS monto``).
+        names: Nombres de las columnas de salida, en el mismo orden.
+
+    Returns:
+        Lista de ``{"name", "kind", "partials": [(columna, sql)]}``.
+
+    Raises:
+        ValueError: Si alguna agregación no es descomponible.
+    """
+    result = []
+    for expr, name in zip(aggregations, names):
+        tree = parse_sql(conn, f"SELECT {expr}")
+        node = tree["statements"][0]["node"]["select_list"][0] if tree else {}
+        kind = node.get("function_name", "").lower()
+        if node.get("class") != "FUNCTION" or node.get("distinct") or kind not in (*_MERGE, "avg"):
+            raise ValueError(f"Aggregation is not decomposable for incremental rollup: {expr}")
+
+        if kind == "avg":
+            partials = [
+                (f"{name}__sum", _rewrite(conn, tree, "sum", f"{name}__sum")),
+                (f"{name}__count", _rewrite(conn, tree, "count", f"{name}__count")),
+            ]
+        else:
+            partials = [(name, _rewrite(conn, tree, kind, name))]
+        result.append({"name": name, "kind": kind, "partials": partials})
+    return result
+
+
+def build_partial_sql(
+    group_by: List[str], group_names: List[str], aggs: List[Dict[str, Any]], source: str
+) -> str:
+    """SQL de agregados parciales sobre ``source`` (nuevas filas o todas)."""
+    groups = [f"{expr} AS {_quote(name)}" for expr, name in zip(group_by, group_names)]
+    partials = [sql for agg in aggs for _, sql in agg["partials"]]
+    query = f"SELECT {', '.join(groups + partials)} FROM {source}"
+    if group_by:
+        query += f" GROUP BY {', '.join(group_by)}"
+    return query
+
+
+def build_merge_sql(
+    group_names: List[str], aggs: List[Dict[str, Any]], sources: List[str]
+) -> str:
+    """SQL que combina varios estados parciales por grupo."""
+    groups = [_quote(g) for g in group_names]
+    merged = []
+    for agg in aggs:
+        for col, _ in agg["partials"]:
+            func = "SUM" if agg["kind"] == "avg" else _MERGE[agg["kind"]]
+            expr = f"{func}({_quote(col)})"
+            if col.endswith("__count") or agg["kind"] in ("count", "count_star"):
+                expr = f"CAST({expr} AS BIGINT)"
+            merged.append(f"{expr} AS {_quote(col)}")
+    union = " UNION ALL BY NAME ".join(f"SELECT * FROM {s}" for s in sources)
+    query = f"SELECT {', '.join(groups + merged)} FROM ({union})"
+    if groups:
+        query += f" GROUP BY {', '.join(groups)}"
+    return query
+
+
+def build_final_sql(
+    group_names: List[str], aggs: List[Dict[str, Any]], types: Dict[str, str], source: str
+) -> str:
+    """SQL con las columnas finales (mismos nombres y tipos que el aggregate completo)."""
+    columns = [_quote(g) for g in group_names]
+    for agg in aggs:
+        name = agg["name"]
+        if agg["kind"] == "avg":
+            expr = f"{_quote(name + '__sum')} / NULLIF({_quote(name + '__count')}, 0)"
+        else:
+            expr = _quote(name)
+        columns.append(f"CAST({expr} AS {types[name]}) AS {_quote(name)}")
+    return f"SELECT {', '.join(columns)} FROM {source}"
+
+
+def build_diff_sql(
+    group_names: List[str], agg_names: List[str], types: Dict[str, str], left: str, right: str
+) -> str:
+    """SQL que cuenta grupos distintos entre dos resultados finales.
+
+    Los valores de punto flotante se comparan con tolerancia relativa, ya que
+    sumar en otro orden cambia los últimos bits.
+    """
+    on = " AND ".join(f"a.{_quote(g)} IS NOT DISTINCT FROM b.{_quote(g)}" for g in group_names)
+    differs = ["a.__present IS NULL", "b.__present IS NULL"]
+    for name in agg_names:
+        a, b = f"a.{_quote(name)}", f"b.{_quote(name)}"
+        if types[name] in ("DOUBLE", "FLOAT", "REAL"):
+            tolerance = f"1e-9 * greatest(abs({a}), abs({b}), 1)"
+            differs.append(f"(({a} IS NULL) <> ({b} IS NULL) OR abs({a} - {b}) > {tolerance})")
+        else:
+            differs.append(f"{a} IS DISTINCT FROM {b}")
+    return f"""
+        SELECT COUNT(*) FROM (SELECT *, true AS __present FROM {left}) a
+        FULL OUTER JOIN (SELECT *, true AS __present FROM {right}) b ON {on or 'true'}
+        WHERE {' OR '.join(differs)}
+    """
+
+
+def _rewrite(conn: duckdb.DuckDBPyConnection, tree: Dict[str, Any], func: str, alias: str) -> str:
+    """Reescribir la función y el alias de una agregación y volver a SQL."""
+    new_tree = copy.deepcopy(tree)
+    new_node = new_tree["statements"][0]["node"]["select_list"][0]
+    new_node["function_name"] = func
+    new_node["alias"] = alias
+    sql = conn.execute("SELECT json_deserialize_sql(?)", [json.dumps(new_tree)]).fetchone()[0]
+    return sql[len("SELECT "):]
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
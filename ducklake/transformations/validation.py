@@ -4,6 +4,13 @@ from typing import Any, Dict, List
 
 import duckdb
 
+# Tipos con media/desvío (numéricos) e histograma (numéricos y temporales)
+_NUMERIC_TYPES = (
+    "TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "UTINYINT", "USMALLINT",
+    "UINTEGER", "UBIGINT", "FLOAT", "DOUBLE", "DECIMAL",
+)
+_ORDERED_TYPES = ("DATE", "TIME", "TIMESTAMP")
+
 
 def validate_not_null(conn: duckdb.DuckDBPyConnection, table: str, columns: List[str]) -> Dict[str, int]:
     """Contar nulos por columna.
@@ -68,3 +75,97 @@ def get_column_stats(conn: duckdb.DuckDBPyConnection, table: str, column: str) -
         "nulls": result[3],
         "distinct": result[4],
     }
+
+
+def profile_table(
+    conn: duckdb.DuckDBPyConnection,
+    source: str,
+    approximate: bool = True,
+    top_k: int = 5,
+    bins: int = 10,
+) -> Dict[str, Any]:
+    """Perfilar todas las columnas de una tabla en una sola pasada.
+
+    Arma un único SELECT con los agregados de todas las columnas (nulos,
+    distintos, min/max, media/desvío, top-k aproximado y cuantiles para un
+    histograma equi-depth), así DuckDB hace un solo scan paralelo en lugar de
+    uno por columna como ``get_column_stats``.
+
+    Args:
+        conn: Conexión DuckDB.
+        source: Tabla, vista o subquery entre paréntesis.
+        approximate: Contar distintos con ``approx_count_distinct`` (HyperLogLog).
+        top_k: Valores más frecuentes a reportar por columna (aproximado).
+        bins: Cantidad de buckets del histograma (columnas numéricas y de fecha).
+
+    Returns:
+        Dict con ``rows`` y ``columns``: lista de dicts por columna.
+    """
+    schema = conn.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()
+    quantiles = [round(i / bins, 6) for i in range(1, bins)]
+
+    exprs = ["COUNT(*)"]
+    plans = []
+    for name, dtype, *_ in schema:
+        col = '"' + name.replace('"', '""') + '"'
+        base_type = dtype.split("(")[0]
+        nested = dtype.endswith("]") or base_type in ("STRUCT", "MAP", "UNION")
+        numeric = base_type in _NUMERIC_TYPES
+        ordered = numeric or base_type.startswith(_ORDERED_TYPES)
+        fields = ["nulls"]
+        exprs.append(f"COUNT(*) - COUNT({col})")
+        if not nested:
+            fields += ["distinct", "min", "max", "top_k"]
+            distinct = f"approx_count_distinct({col})" if approximate else f"COUNT(DISTINCT {col})"
+            exprs += [
+                distinct,
+                f"CAST(MIN({col}) AS VARCHAR)",
+                f"CAST(MAX({col}) AS VARCHAR)",
+                f"CAST(approx_top_k({col}, {top_k}) AS VARCHAR[])",
+            ]
+        if numeric:
+            fields += ["mean", "stddev"]
+            exprs += [f"AVG({col}::DOUBLE)", f"STDDEV_SAMP({col}::DOUBLE)"]
+        if ordered and quantiles:
+            fields.append("histogram")
+            exprs.append(f"CAST(approx_quantile({col}, {quantiles}) AS VARCHAR[])")
+        plans.append((name, dtype, fields))
+
+    values = list(conn.execute(f"SELECT {', '.join(exprs)} FROM {source}").fetchone())
+    rows = values.pop(0)
+
+    columns = []
+    for name, dtype, fields in plans:
+        stats: Dict[str, Any] = {"column": name, "type": dtype}
+        for field in fields:
+            stats[field] = values.pop(0)
+        stats["null_pct"] = round(100 * stats["nulls"] / rows, 4) if rows else 0.0
+        columns.append(stats)
+    return {"rows": rows, "approximate": approximate, "columns": columns}
+
+
+def compare_profiles(previous: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Describir los cambios relevantes entre dos perfiles de la misma tabla.
+
+    Returns:
+        Lista de cambios en texto (vacía si no hay diferencias notables).
+    """
+    changes = []
+    if previous["rows"] != current["rows"]:
+        changes.append(f"rows: {previous['rows']} -> {current['rows']}")
+    before = {c["column"]: c for c in previous["columns"]}
+    after = {c["column"]: c for c in current["columns"]}
+    for name in after.keys() - before.keys():
+        changes.append(f"{name}: new column ({after[name]['type']})")
+    for name in before.keys() - after.keys():
+        changes.append(f"{name}: column removed")
+    for name in before.keys() & after.keys():
+        old, new = before[name], after[name]
+        if old["type"] != new["type"]:
+            changes.append(f"{name}: type {old['type']} -> {new['type']}")
+        if abs(old["null_pct"] - new["null_pct"]) >= 1.0:
+            changes.append(f"{name}: nulls {old['null_pct']}% -> {new['null_pct']}%")
+        old_d, new_d = old.get("distinct"), new.get("distinct")
+        if old_d and new_d is not None and abs(new_d - old_d) / old_d >= 0.1:
+            changes.append(f"{name}: distinct {old_d} -> {new_d}")
+    return sorted(changes)
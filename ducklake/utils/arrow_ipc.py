@@ -0,0 +1,119 @@
+"""Export y carga de archivos Arrow IPC (Feather v2) con memory-mapping."""
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from loguru import logger
+
+# Filas por record batch del archivo IPC: tablas de hasta este tamaño quedan en
+# un único batch (columnas contiguas, zero-copy al cargar)
+IPC_BATCH_ROWS = 4_194_304
+
+
+def write_arrow_ipc(
+    parquet_path: str,
+    ipc_path: str,
+    compression: str | None = None,
+    batch_rows: int = IPC_BATCH_ROWS,
+) -> str:
+    """Convertir un parquet a un archivo Arrow IPC.
+
+    El parquet se lee en record batches de ``batch_rows`` filas que se
+    escriben a medida que llegan: la memoria queda acotada por un batch y no
+    por la tabla. Dentro de cada batch las columnas quedan contiguas; sin
+    compresión, una tabla de un solo batch se mapea desde NumPy y pandas sin
+    copiar (y una más grande, con ``load_numpy_chunks``, un array por batch).
+
+    Args:
+        parquet_path: Parquet origen.
+        ipc_path: Path del archivo ``.arrow`` a escribir.
+        compression: None (sin comprimir, zero-copy) o ``lz4`` (más chico,
+            pero requiere descomprimir al cargar).
+        batch_rows: Filas por record batch.
+
+    Returns:
+        Path del archivo escrito.
+    """
+    parquet = pq.ParquetFile(parquet_path)
+    options = ipc.IpcWriteOptions(compression=compression)
+    tmp_path = f"{ipc_path}.tmp"
+    Path(ipc_path).parent.mkdir(parents=True, exist_ok=True)
+    rows = 0
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with ipc.new_file(sink, parquet.schema_arrow, options=options) as writer:
+            for batch in parquet.iter_batches(batch_size=batch_rows):
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    # Reemplazo atómico: los lectores con el archivo mapeado siguen viendo el viejo
+    Path(tmp_path).replace(ipc_path)
+    logger.debug(f"Arrow IPC written: {ipc_path} ({rows} rows, {compression or 'uncompressed'})")
+    return ipc_path
+
+
+def load_arrow(path: str, columns: List[str] | None = None) -> pa.Table:
+    """Cargar un archivo Arrow IPC con memory-mapping.
+
+    Sin compresión los buffers apuntan directo a las páginas del archivo: la
+    carga es casi instantánea y varios procesos comparten la misma memoria.
+
+    Args:
+        path: Path al archivo ``.arrow``.
+        columns: Columnas a cargar (None = todas).
+
+    Returns:
+        Tabla PyArrow respaldada por el archivo mapeado.
+    """
+    source = pa.memory_map(path, "r")
+    table = ipc.open_file(source).read_all()
+    if columns:
+        table = table.select(columns)
+    return table
+
+
+def load_pandas(path: str, columns: List[str] | None = None) -> Any:
+    """Cargar un archivo Arrow IPC como DataFrame de pandas.
+
+    Con ``split_blocks`` las columnas numéricas sin nulos no se copian.
+    """
+    return load_arrow(path, columns).to_pandas(split_blocks=True)
+
+
+def load_numpy(path: str, columns: List[str] | None = None) -> Dict[str, np.ndarray]:
+    """Cargar columnas de un archivo Arrow IPC como arrays NumPy.
+
+    Las columnas numéricas sin nulos de un archivo sin comprimir y de un solo
+    record batch se devuelven como vistas de solo lectura sobre el archivo
+    mapeado; el resto se copia.
+
+    Returns:
+        Dict ``{columna: array}``.
+    """
+    table = load_arrow(path, columns)
+    arrays: Dict[str, np.ndarray] = {}
+    for name, column in zip(table.column_names, table.columns):
+        if column.num_chunks == 1:
+            arrays[name] = column.chunk(0).to_numpy(zero_copy_only=False)
+        else:
+            arrays[name] = column.to_numpy()
+    return arrays
+
+
+def load_numpy_chunks(path: str, columns: List[str] | None = None) -> Dict[str, List[np.ndarray]]:
+    """Cargar columnas de un archivo Arrow IPC como un array NumPy por batch.
+
+    A diferencia de ``load_numpy`` no concatena: en un archivo sin comprimir
+    cada array numérico sin nulos es una vista de solo lectura sobre el
+    archivo mapeado, aunque la tabla tenga varios batches.
+
+    Returns:
+        Dict ``{columna: [array por batch]}``.
+    """
+    table = load_arrow(path, columns)
+    return {
+        name: [chunk.to_numpy(zero_copy_only=False) for chunk in column.chunks]
+        for name, column in zip(table.column_names, table.columns)
+    }
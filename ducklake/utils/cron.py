@@ -0,0 +1,115 @@
+"""Expresiones cron de 5 campos (minuto hora día-del-mes mes día-de-la-semana)."""
+
+from datetime import datetime, timedelta
+from typing import List, Set
+
+_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+}
+_MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+_WEEKDAYS = ["sun", "mon", "tue", "wed", "thu", "fri", "sat"]
+# Nombres aceptados en el campo de mes (3) y de día de la semana (4)
+_NAMES = {
+    3: {m: i for i, m in enumerate(_MONTHS, 1)},
+    4: {d: i for i, d in enumerate(_WEEKDAYS)},
+}
+_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+class CronSchedule:
+    """Schedule cron (hora local), con la semántica de cron para día del mes/semana.
+
+    Soporta ``*``, listas, rangos, pasos (``*/15``, ``1-5/2``), nombres de meses
+    y días (``jan``, ``mon``) y los alias ``@hourly``, ``@daily``, etc.
+
+    Raises:
+        ValueError: Si la expresión no es válida.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = _ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Invalid cron expression (expected 5 fields): {expression}")
+        parsed = [_parse_field(f, i, expression) for i, f in enumerate(fields)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {d % 7 for d in weekdays}  # 7 = domingo
+        # Si ambos están restringidos, cron corre cuando se cumple cualquiera
+        self._dom_any = fields[2].startswith("*")
+        self._dow_any = fields[4].startswith("*")
+
+    def matches(self, dt: datetime) -> bool:
+        """Si el minuto de ``dt`` está en el schedule."""
+        return (
+            dt.minute in self.minutes
+            and dt.hour in self.hours
+            and dt.month in self.months
+            and self._day_matches(dt)
+        )
+
+    def next_after(self, dt: datetime) -> datetime:
+        """Primer minuto del schedule estrictamente posterior a ``dt``."""
+        t = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 5)
+        while t < limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"Cron expression never matches: {self.expression}")
+
+    def between(self, start: datetime, end: datetime) -> List[datetime]:
+        """Minutos del schedule en ``(start, end]``."""
+        times = []
+        t = self.next_after(start)
+        while t <= end:
+            times.append(t)
+            t = self.next_after(t)
+        return times
+
+    def _day_matches(self, dt: datetime) -> bool:
+        dom = dt.day in self.days
+        dow = (dt.weekday() + 1) % 7 in self.weekdays
+        if self._dom_any or self._dow_any:
+            return dom and dow
+        return dom or dow
+
+
+def _parse_field(field: str, index: int, expression: str) -> Set[int]:
+    low, high = _RANGES[index]
+    names = _NAMES.get(index, {})
+    values: Set[int] = set()
+    for part in field.lower().split(","):
+        base, _, step_str = part.partition("/")
+        try:
+            step = int(step_str) if step_str else 1
+            if base == "*":
+                start, end = low, high
+            elif "-" in base:
+                a, b = base.split("-", 1)
+                start, end = _value(a, names), _value(b, names)
+            else:
+                start = _value(base, names)
+                end = high if step_str else start
+        except ValueError:
+            raise ValueError(f"Invalid cron field '{field}' in: {expression}") from None
+        if not (low <= start <= end <= high) or step < 1:
+            raise ValueError(f"Cron field out of range '{field}' in: {expression}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def _value(token: str, names: dict) -> int:
+    return names[token] if token in names else int(token)
@@ -1,5 +1,6 @@
 """Helpers para operaciones con DuckDB."""
 
+import re
 from typing import Any
 
 import duckdb
@@ -10,6 +11,7 @@ def create_connection(
     database: str = ":memory:",
     memory_limit: str = "4GB",
     threads: int = 4,
+    temp_directory: str | None = None,
 ) -> duckdb.DuckDBPyConnection:
     """Crear conexión DuckDB con configuración optimizada.
 
@@ -17,6 +19,7 @@ def create_connection(
         database: Path a la base de datos o ":memory:".
         memory_limit: Límite de memoria para DuckDB.
         threads: Número de threads.
+        temp_directory: Directorio para el spill a disco (None = default de DuckDB).
 
     Returns:
         Conexión DuckDB configurada.
@@ -24,10 +27,27 @@ def create_connection(
     conn = duckdb.connect(database)
     conn.execute(f"SET memory_limit = '{memory_limit}'")
     conn.execute(f"SET threads = {threads}")
+    if temp_directory:
+        conn.execute(f"SET temp_directory = '{temp_directory}'")
     logger.debug(f"DuckDB connection created: {database} (mem={memory_limit}, threads={threads})")
     return conn
 
 
+_SIZE_UNITS = {
+    "B": 1, "KB": 1000, "MB": 1000**2, "GB": 1000**3, "TB": 1000**4,
+    "KIB": 1024, "MIB": 1024**2, "GIB": 1024**3, "TIB": 1024**4,
+}
+
+
+def parse_memory_limit(value: str) -> int:
+    """Convertir un límite de memoria de DuckDB (``4GB``, ``512MiB``) a bytes."""
+    match = re.fullmatch(r"\s*([\d.]+)\s*([a-zA-Z]*)\s*", value)
+    unit = match.group(2).upper() if match else ""
+    if match is None or (unit or "B") not in _SIZE_UNITS:
+        raise ValueError(f"Invalid memory limit: {value}")
+    return int(float(match.group(1)) * _SIZE_UNITS[unit or "B"])
+
+
 def query_parquet(
     conn: duckdb.DuckDBPyConnection,
     pattern: str,
@@ -0,0 +1,116 @@
+"""Detección de archivos nuevos o modificados: inotify (Linux) o polling."""
+
+import ctypes
+import ctypes.util
+import fnmatch
+import glob
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+from loguru import logger
+
+# Máscara de eventos de inotify (ver inotify(7))
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+_EVENT = struct.Struct("iIII")
+
+
+class PollingWatcher:
+    """Compara (size, mtime) de los archivos que matchean los patrones cada ``interval``."""
+
+    def __init__(self, patterns: List[str], interval: float = 1.0):
+        self.patterns = patterns
+        self.interval = interval
+        self._seen = self._snapshot()
+
+    def wait(self, timeout: float) -> Set[str]:
+        """Esperar hasta ``timeout`` segundos y devolver los archivos que cambiaron."""
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self._snapshot()
+            changed = {p for p, st in current.items() if self._seen.get(p) != st}
+            self._seen = current
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for pattern in self.patterns:
+            for path in glob.glob(pattern):
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                snapshot[path] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+
+class InotifyWatcher:
+    """Eventos de inotify sobre los directorios de los patrones (no recursivo)."""
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = patterns
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, str] = {}
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        for directory in sorted({os.path.dirname(p) or "." for p in patterns}):
+            Path(directory).mkdir(parents=True, exist_ok=True)
+            wd = self._libc.inotify_add_watch(self._fd, directory.encode(), mask)
+            if wd < 0:
+                os.close(self._fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed: {directory}")
+            self._dirs[wd] = directory
+
+    def wait(self, timeout: float) -> Set[str]:
+        """Esperar hasta ``timeout`` segundos y devolver los archivos que cambiaron."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        data = os.read(self._fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, _mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0").decode()
+            offset += _EVENT.size + length
+            path = os.path.join(self._dirs.get(wd, ""), name)
+            if name and any(fnmatch.fnmatch(path, p) for p in self.patterns):
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def create_watcher(
+    patterns: List[str], interval: float = 1.0, polling: bool = False
+) -> PollingWatcher | InotifyWatcher:
+    """Watcher para los patrones: inotify si se puede, sino polling.
+
+    inotify no sirve para patrones con comodines en el directorio (no es
+    recursivo) ni fuera de Linux; en esos casos se usa polling.
+    """
+    if not polling and sys.platform.startswith("linux"):
+        if any(glob.has_magic(os.path.dirname(p)) for p in patterns):
+            logger.info("Wildcards in watched directories: using polling")
+        else:
+            try:
+                return InotifyWatcher(patterns)
+            except (OSError, AttributeError) as e:
+                logger.warning(f"inotify unavailable ({e}), using polling")
+    return PollingWatcher(patterns, interval)
@@ -0,0 +1,135 @@
+"""Índice de claves (sidecar) para lookups puntuales sobre un parquet."""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import duckdb
+import pyarrow.parquet as pq
+from loguru import logger
+
+INDEX_FILE = "index.parquet"
+INDEX_META = "index.json"
+
+
+def build_key_index(
+    conn: duckdb.DuckDBPyConnection, parquet_path: str, keys: List[str]
+) -> str:
+    """Construir el índice de claves de un parquet.
+
+    El índice guarda ``(hash(claves), row_group)`` ordenado por hash y en row
+    groups chicos, así un lookup lee una sola página del índice (pruning por
+    estadísticas min/max) y después solo los row groups del dato que
+    contienen la clave. El row group de cada fila sale de ``file_row_number``
+    y de los tamaños en ``parquet_metadata``.
+
+    Args:
+        conn: Conexión DuckDB.
+        parquet_path: Parquet indexado (``data.parquet``).
+        keys: Columnas clave.
+
+    Returns:
+        Path del índice escrito.
+    """
+    table_dir = Path(parquet_path).parent
+    index_path = table_dir / INDEX_FILE
+    tmp_path = table_dir / f"{INDEX_FILE}.tmp"
+    key_cols = ", ".join(f"d.{_quote(k)}" for k in keys)
+
+    conn.execute(f"""
+        COPY (
+            WITH row_groups AS (
+                SELECT DISTINCT row_group_id, row_group_num_rows
+                FROM parquet_metadata('{parquet_path}')
+            ),
+            bounds AS (
+                SELECT row_group_id,
+                       SUM(row_group_num_rows) OVER (ORDER BY row_group_id)
+                           - row_group_num_rows AS first_row
+                FROM row_groups
+            )
+            SELECT DISTINCT hash({key_cols}) AS key_hash, b.row_group_id::INTEGER AS row_group
+            FROM read_parquet('{parquet_path}', file_row_number = true) d
+            ASOF JOIN bounds b ON d.file_row_number >= b.first_row
+            ORDER BY key_hash
+        ) TO '{tmp_path}' (FORMAT PARQUET, COMPRESSION zstd, ROW_GROUP_SIZE 16384)
+    """)
+
+    # Los tipos de las claves definen el hash: el lookup castea los valores igual
+    schema = dict(
+        r[:2] for r in conn.execute(
+            f"DESCRIBE SELECT * FROM read_parquet('{parquet_path}')"
+        ).fetchall()
+    )
+    meta = {"keys": keys, "types": [schema[k] for k in keys], "data": _fingerprint(parquet_path)}
+
+    tmp_path.replace(index_path)
+    (table_dir / INDEX_META).write_text(json.dumps(meta, indent=2))
+    logger.debug(f"Key index written: {index_path} (keys: {', '.join(keys)})")
+    return str(index_path)
+
+
+def lookup(
+    conn: duckdb.DuckDBPyConnection, parquet_path: str, values: List[Any]
+) -> duckdb.DuckDBPyRelation:
+    """Buscar las filas de un parquet con una clave dada.
+
+    Si el índice no corresponde al archivo actual (se modificó por fuera del
+    pipeline) se hace un scan completo.
+
+    Args:
+        conn: Conexión DuckDB.
+        parquet_path: Parquet indexado.
+        values: Valores de las columnas clave, en el orden del índice.
+
+    Returns:
+        Relation con las filas encontradas.
+
+    Raises:
+        ValueError: Si el parquet no tiene índice o faltan valores de clave.
+    """
+    table_dir = Path(parquet_path).parent
+    meta = read_index_meta(parquet_path)
+    if meta is None:
+        raise ValueError(f"No key index for {parquet_path}")
+    keys, types = meta["keys"], meta["types"]
+    if len(values) != len(keys):
+        raise ValueError(f"Expected {len(keys)} key values ({', '.join(keys)}), got {len(values)}")
+
+    typed = ", ".join(f"CAST(? AS {t})" for t in types)
+    where = " AND ".join(f"{_quote(k)} = CAST(? AS {t})" for k, t in zip(keys, types))
+
+    if meta["data"] != _fingerprint(parquet_path):
+        logger.warning(f"Key index is stale for {parquet_path}, falling back to a full scan")
+        return conn.sql(f"SELECT * FROM read_parquet('{parquet_path}') WHERE {where}", params=values)
+
+    key_hash = conn.execute(f"SELECT hash({typed})", values).fetchone()[0]
+    # Constante tipada para que DuckDB pode el índice por estadísticas
+    row_groups = [
+        r[0] for r in conn.execute(f"""
+            SELECT row_group FROM read_parquet('{table_dir / INDEX_FILE}')
+            WHERE key_hash = {key_hash}::UBIGINT
+        """).fetchall()
+    ]
+    logger.debug(f"Key lookup on {parquet_path}: {len(row_groups)} row group(s)")
+    # DuckDB lee ``candidates`` por replacement scan
+    candidates = pq.ParquetFile(parquet_path).read_row_groups(row_groups)  # noqa: F841
+    return conn.sql(f"SELECT * FROM candidates WHERE {where}", params=values)
+
+
+def read_index_meta(parquet_path: str) -> Dict[str, Any] | None:
+    """Leer la metadata del índice de un parquet (None si no tiene)."""
+    meta_path = Path(parquet_path).parent / INDEX_META
+    if not meta_path.exists():
+        return None
+    return json.loads(meta_path.read_text())
+
+
+def _fingerprint(path: str) -> Dict[str, int]:
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
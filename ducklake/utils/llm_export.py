@@ -0,0 +1,403 @@
+"""Export de documentos para LLM/RAG: template -> chunks -> shards JSONL comprimidos."""
+
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+import duckdb
+from loguru import logger
+
+MANIFEST_NAME = "manifest.json"
+PENDING_NAME = ".pending.parquet"
+
+
+def chunk_text(
+    text: str,
+    size: int,
+    overlap: int = 0,
+    unit: str = "chars",
+    encoding: str = "cl100k_base",
+) -> List[str]:
+    """Partir un texto en chunks de a lo sumo ``size`` caracteres o tokens.
+
+    En modo ``chars`` se corta en el último espacio dentro de la ventana
+    (si lo hay en su segunda mitad) para no partir palabras. En modo
+    ``tokens`` se usa ``tiktoken`` (dependencia opcional).
+
+    Args:
+        text: Texto a partir.
+        size: Tamaño máximo de cada chunk.
+        overlap: Solapamiento entre chunks consecutivos.
+        unit: ``chars`` o ``tokens``.
+        encoding: Encoding de tiktoken para ``tokens``.
+
+    Returns:
+        Lista de chunks (al menos uno).
+    """
+    if overlap >= size:
+        raise ValueError(f"chunk_overlap ({overlap}) must be smaller than chunk_size ({size})")
+
+    if unit == "tokens":
+        try:
+            import tiktoken
+        except ImportError as e:
+            raise ImportError(
+                "chunk_unit: tokens requires tiktoken (pip install ducklake[llm])"
+            ) from e
+        enc = tiktoken.get_encoding(encoding)
+        tokens = enc.encode(text)
+        if len(tokens) <= size:
+            return [text]
+        step = size - overlap
+        return [enc.decode(tokens[i:i + size]) for i in range(0, len(tokens) - overlap, step)]
+
+    if len(text) <= size:
+        return [text]
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            cut = text.rfind(" ", start + size // 2, end)
+            if cut > start:
+                end = cut
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return [c for c in chunks if c]
+
+
+def export_llm_shards(
+    conn: duckdb.DuckDBPyConnection,
+    source: str,
+    out_dir: str,
+    config: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Renderizar filas como documentos y escribirlos en shards JSONL comprimidos.
+
+    Los shards son rangos contiguos de ``id_column``. El manifest guarda, por
+    shard, su límite inferior, cantidad de filas y un fingerprint del
+    contenido; en la siguiente corrida se mantienen los mismos límites y solo
+    se reescriben los shards cuyo fingerprint cambió. Si un shard crece más
+    del doble de ``shard_rows`` se vuelve a partir. Cambiar el template o las
+    opciones de chunking reescribe todo. Las filas con ``id_column`` NULL van
+    al primer shard.
+
+    Args:
+        conn: Conexión DuckDB.
+        source: Expresión FROM con las filas (ej. ``read_parquet('...')``).
+        out_dir: Directorio de los shards y el manifest.
+        config: Config ``llm_export`` (template, id_column, chunk_size, ...).
+
+    Returns:
+        Dict con shards totales, reescritos, borrados y chunks escritos.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    id_col = _quote(config["id_column"])
+    shard_rows = int(config.get("shard_rows") or 10_000)
+    signature = _signature(config)
+
+    manifest = _load_manifest(out)
+    previous = {}
+    if manifest.get("signature") == signature:
+        previous = {s["lower"]: s for s in manifest["shards"]}
+        bounds = [s["lower"] for s in manifest["shards"]]
+    else:
+        bounds = _initial_bounds(conn, source, id_col, shard_rows)
+
+    stats = _shard_stats(conn, source, id_col, bounds)
+    oversized = [i for i, s in enumerate(stats) if s["rows"] > 2 * shard_rows]
+    if oversized:
+        bounds = _split_bounds(conn, source, id_col, bounds, oversized, shard_rows)
+        stats = _shard_stats(conn, source, id_col, bounds)
+
+    shards: List[Dict[str, Any]] = []
+    pending: List[Dict[str, Any]] = []
+    for i, stat in enumerate(stats):
+        if stat["rows"] == 0 and i > 0:
+            continue
+        upper = next((s["lower"] for s in stats[i + 1:] if s["rows"] > 0), None)
+        shard = {
+            "file": _shard_file(stat["lower"], config),
+            "lower": stat["lower"],
+            "upper": upper,
+            "rows": stat["rows"],
+            "fingerprint": stat["fingerprint"],
+        }
+        old = previous.get(shard["lower"])
+        if (
+            old is not None
+            and old["rows"] == shard["rows"]
+            and old["fingerprint"] == shard["fingerprint"]
+            and old.get("upper") == upper
+            and (out / old["file"]).exists()
+        ):
+            shard.update(file=old["file"], chunks=old["chunks"], bytes=old["bytes"])
+        else:
+            pending.append(shard)
+        shards.append(shard)
+
+    render = _renderer(config)
+    workers = int(config.get("parallelism") or min(8, os.cpu_count() or 1))
+    shard_source = source
+    if len(pending) > 1:
+        shard_source = _sort_pending(conn, source, id_col, out, pending, shard_rows)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_write_shard, conn, shard_source, id_col, out, s, render, config)
+                for s in pending
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        (out / PENDING_NAME).unlink(missing_ok=True)
+
+    keep = {s["file"] for s in shards} | {MANIFEST_NAME}
+    removed = [f for f in out.iterdir() if f.name not in keep and f.name.startswith("shard-")]
+    for f in removed:
+        f.unlink()
+
+    _write_manifest(
+        out, {"signature": signature, "id_column": config["id_column"], "shards": shards}
+    )
+    written_chunks = sum(s["chunks"] for s in pending)
+    logger.info(
+        f"LLM export: {len(shards)} shards, {len(pending)} rewritten, "
+        f"{len(removed)} removed, {written_chunks} chunks -> {out}"
+    )
+    return {
+        "shards": len(shards),
+        "rewritten": len(pending),
+        "removed": len(removed),
+        "chunks": written_chunks,
+        "path": str(out),
+    }
+
+
+def _sort_pending(
+    conn: duckdb.DuckDBPyConnection,
+    source: str,
+    id_col: str,
+    out: Path,
+    pending: List[Dict[str, Any]],
+    shard_rows: int,
+) -> str:
+    """Copiar las filas de los shards pendientes, ordenadas por id, a un parquet temporal.
+
+    La fuente no está ordenada por id: cada shard leído de ella sería un scan
+    completo más un sort. Con una sola pasada ordenada, los row groups del
+    temporal tienen rangos de id disjuntos y cada shard lee solo los suyos.
+
+    Returns:
+        Expresión FROM del temporal.
+    """
+    conditions, params = [], []
+    for shard in pending:
+        condition, shard_params = _range_condition(id_col, shard["lower"], shard["upper"])
+        conditions.append(f"({condition or 'TRUE'})")
+        params += shard_params
+    path = out / PENDING_NAME
+    conn.execute(
+        f"""
+        COPY (SELECT * FROM {source} WHERE {' OR '.join(conditions)} ORDER BY {id_col})
+        TO '{path}' (FORMAT PARQUET, ROW_GROUP_SIZE {shard_rows})
+        """,
+        params,
+    )
+    return f"read_parquet('{path}')"
+
+
+def _write_shard(
+    conn: duckdb.DuckDBPyConnection,
+    source: str,
+    id_col: str,
+    out: Path,
+    shard: Dict[str, Any],
+    render: Callable[[Dict[str, Any]], Iterator[Dict[str, Any]]],
+    config: Dict[str, Any],
+) -> None:
+    """Renderizar las filas de un shard y escribirlo (reemplazo atómico)."""
+    condition, params = _range_condition(id_col, shard["lower"], shard["upper"])
+    where = f" WHERE {condition}" if condition else ""
+
+    path = out / shard["file"]
+    tmp = path.with_name(path.name + ".tmp")
+    opener = gzip.open if _compressed(config) else open
+    chunks = 0
+    cursor = conn.cursor()
+    try:
+        result = cursor.execute(f"SELECT * FROM {source}{where} ORDER BY {id_col}", params)
+        names = [d[0] for d in result.description]
+        with opener(tmp, "wt", encoding="utf-8") as f:
+            while True:
+                batch = result.fetchmany(1_000)
+                if not batch:
+                    break
+                for values in batch:
+                    for record in render(dict(zip(names, values))):
+                        f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                        chunks += 1
+    finally:
+        cursor.close()
+    tmp.replace(path)
+    shard.update(chunks=chunks, bytes=path.stat().st_size)
+
+
+def _range_condition(id_col: str, lower: Any, upper: Any) -> tuple[str, list]:
+    """Condición WHERE de un shard ``[lower, upper)``.
+
+    El primer shard (``lower`` None) incluye las filas con id NULL, como hace
+    ``_shard_stats`` al contarlas.
+    """
+    if lower is None:
+        if upper is None:
+            return "", []
+        return f"({id_col} < ? OR {id_col} IS NULL)", [upper]
+    if upper is None:
+        return f"{id_col} >= ?", [lower]
+    return f"{id_col} >= ? AND {id_col} < ?", [lower, upper]
+
+
+def _renderer(config: Dict[str, Any]) -> Callable[[Dict[str, Any]], Iterator[Dict[str, Any]]]:
+    """Crear la función fila -> registros JSONL (un registro por chunk)."""
+    template = config["template"]
+    id_column = config["id_column"]
+    metadata = config.get("metadata_columns") or []
+    size = int(config.get("chunk_size") or 2_000)
+    overlap = int(config.get("chunk_overlap") or 0)
+    unit = config.get("chunk_unit") or "chars"
+
+    def render(row: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        text = template.format_map({k: "" if v is None else v for k, v in row.items()})
+        doc_id = row[id_column]
+        for i, chunk in enumerate(chunk_text(text, size, overlap, unit)):
+            yield {
+                "id": f"{doc_id}#{i}",
+                "doc_id": doc_id,
+                "chunk": i,
+                "text": chunk,
+                "metadata": {c: row.get(c) for c in metadata},
+            }
+
+    return render
+
+
+def _initial_bounds(
+    conn: duckdb.DuckDBPyConnection, source: str, id_col: str, shard_rows: int
+) -> List[Any]:
+    """Límites inferiores cada ``shard_rows`` filas (el primero abierto).
+
+    Con ids repetidos dos cortes pueden caer en el mismo id: quedan uno solo
+    (el shard se agranda en vez de repetir límite y nombre de archivo).
+    """
+    rows = conn.execute(f"""
+        SELECT DISTINCT {id_col} FROM (
+            SELECT {id_col}, ROW_NUMBER() OVER (ORDER BY {id_col}) - 1 AS __rn
+            FROM {source} WHERE {id_col} IS NOT NULL
+        ) WHERE __rn % {shard_rows} = 0 AND __rn > 0
+        ORDER BY 1
+    """).fetchall()
+    return [None] + [r[0] for r in rows]
+
+
+def _split_bounds(
+    conn: duckdb.DuckDBPyConnection,
+    source: str,
+    id_col: str,
+    bounds: List[Any],
+    oversized: List[int],
+    shard_rows: int,
+) -> List[Any]:
+    """Agregar límites dentro de los shards que crecieron demasiado."""
+    new_bounds = list(bounds)
+    for i in oversized:
+        conditions, params = [f"{id_col} IS NOT NULL"], []
+        if bounds[i] is not None:
+            conditions.append(f"{id_col} >= ?")
+            params.append(bounds[i])
+        if i + 1 < len(bounds):
+            conditions.append(f"{id_col} < ?")
+            params.append(bounds[i + 1])
+        where = f"WHERE {' AND '.join(conditions)}"
+        rows = conn.execute(f"""
+            SELECT {id_col} FROM (
+                SELECT {id_col}, ROW_NUMBER() OVER (ORDER BY {id_col}) - 1 AS __rn
+                FROM {source} {where}
+            ) WHERE __rn % {shard_rows} = 0 AND __rn > 0
+        """, params).fetchall()
+        new_bounds += [r[0] for r in rows]
+    return [None] + sorted(b for b in set(new_bounds) if b is not None)
+
+
+def _shard_stats(
+    conn: duckdb.DuckDBPyConnection, source: str, id_col: str, bounds: List[Any]
+) -> List[Dict[str, Any]]:
+    """Filas y fingerprint de contenido por shard, en una sola pasada."""
+    lowers = [b for b in bounds if b is not None]
+    counts: Dict[int, tuple] = {}
+    if lowers:
+        values = ", ".join(f"({i + 1}, ?)" for i in range(len(lowers)))
+        bounds_sql = f"SELECT * FROM (VALUES {values}) b(shard, lower_bound)"
+        rows = conn.execute(f"""
+            SELECT COALESCE(b.shard, 0), COUNT(*), SUM(hash(s)::HUGEINT)
+            FROM {source} s ASOF LEFT JOIN ({bounds_sql}) b ON s.{id_col} >= b.lower_bound
+            GROUP BY ALL
+        """, lowers).fetchall()
+    else:
+        rows = conn.execute(
+            f"SELECT 0, COUNT(*), SUM(hash(s)::HUGEINT) FROM {source} s"
+        ).fetchall()
+    for shard, count, fingerprint in rows:
+        counts[shard] = (count, str(fingerprint))
+    return [
+        {
+            "lower": bound,
+            "rows": counts.get(i, (0, None))[0],
+            "fingerprint": counts.get(i, (0, None))[1],
+        }
+        for i, bound in enumerate(bounds)
+    ]
+
+
+def _shard_file(lower: Any, config: Dict[str, Any]) -> str:
+    """Nombre estable de un shard, derivado de su límite inferior."""
+    digest = hashlib.sha1(json.dumps(lower, default=str).encode()).hexdigest()[:12]
+    return f"shard-{digest}.jsonl" + (".gz" if _compressed(config) else "")
+
+
+def _signature(config: Dict[str, Any]) -> str:
+    """Hash de las opciones que afectan el contenido de los shards."""
+    keys = [
+        "template", "id_column", "metadata_columns", "chunk_size", "chunk_overlap",
+        "chunk_unit", "compression",
+    ]
+    payload = json.dumps({k: config.get(k) for k in keys}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _compressed(config: Dict[str, Any]) -> bool:
+    return (config.get("compression") or "gzip") == "gzip"
+
+
+def _load_manifest(out: Path) -> Dict[str, Any]:
+    path = out / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write_manifest(out: Path, manifest: Dict[str, Any]) -> None:
+    tmp = out / f"{MANIFEST_NAME}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=2, default=str), encoding="utf-8")
+    tmp.replace(out / MANIFEST_NAME)
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
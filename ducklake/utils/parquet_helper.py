@@ -1,5 +1,6 @@
 """Helpers para operaciones con Parquet via PyArrow."""
 
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
@@ -83,3 +84,25 @@ def merge_parquet_files(paths: list[str], output_path: str, compression: str = "
     tables = [pq.read_table(p) for p in paths]
     merged = pa.concat_tables(tables)
     return write_parquet(merged, output_path, compression=compression)
+
+
+def add_ingestion_metadata(
+    batch: pa.RecordBatch, ingestion_ts: datetime, source_name: str
+) -> pa.RecordBatch:
+    """Agregar columnas _ingestion_timestamp y _source_name a un record batch.
+
+    Args:
+        batch: Record batch extraído de la fuente.
+        ingestion_ts: Timestamp de ingestión (igual para todos los batches).
+        source_name: Nombre de la fuente.
+
+    Returns:
+        Record batch con las columnas de metadata al final.
+    """
+    n = batch.num_rows
+    arrays = list(batch.columns) + [
+        pa.array([ingestion_ts] * n, type=pa.timestamp("us")),
+        pa.array([source_name] * n, type=pa.string()),
+    ]
+    names = list(batch.schema.names) + ["_ingestion_timestamp", "_source_name"]
+    return pa.RecordBatch.from_arrays(arrays, names=names)
@@ -0,0 +1,46 @@
+{#-
+  Surrogate keys a partir de un MD5, con el tipo de var('surrogate_key_type'):
+    md5    → VARCHAR de 32 caracteres (el comportamiento anterior)
+    int64  → UBIGINT, los primeros 64 bits del MD5 (default)
+    int128 → UUID, el MD5 completo en 16 bytes
+  Mismo criterio que ducklake.transformations.enrichment (hash_key_expr / md5_key_expr):
+  una clave se puede comparar con la generada por un pipeline de DuckLake.
+-#}
+
+{% macro surrogate_key_type() -%}
+    {%- set key_type = var('surrogate_key_type', 'int64') -%}
+    {%- if key_type not in ('md5', 'int64', 'int128') -%}
+        {{ exceptions.raise_compiler_error("Invalid surrogate_key_type: " ~ key_type) }}
+    {%- endif -%}
+    {{ return(key_type) }}
+{%- endmacro %}
+
+
+{#- Tipo SQL de las claves (para NULL::...) -#}
+{% macro surrogate_key_sql_type() -%}
+    {{ return({'md5': 'VARCHAR', 'int64': 'UBIGINT', 'int128': 'UUID'}[surrogate_key_type()]) }}
+{%- endmacro %}
+
+
+{#- Convertir un MD5 en hexadecimal (ej. claves md5 de otro sistema) al tipo configurado -#}
+{% macro md5_key(md5_expr) -%}
+    {%- set key_type = surrogate_key_type() -%}
+    {%- if key_type == 'int64' -%}
+        CAST('0x' || LEFT({{ md5_expr }}, 16) AS UBIGINT)
+    {%- elif key_type == 'int128' -%}
+        CAST({{ md5_expr }} AS UUID)
+    {%- else -%}
+        {{ md5_expr }}
+    {%- endif -%}
+{%- endmacro %}
+
+
+{#-
+  Clave a partir de una expresión VARCHAR (la concatenación a hashear):
+    {{ surrogate_key("'vtex|' || orderId") }}
+  o, para expresiones largas, en un bloque call:
+    {% call surrogate_key() %} coalesce(calle, '') || '|' || ... {% endcall %}
+-#}
+{% macro surrogate_key(expr=none) -%}
+    {{ md5_key('md5(' ~ (expr if expr is not none else caller() | trim) ~ ')') }}
+{%- endmacro %}
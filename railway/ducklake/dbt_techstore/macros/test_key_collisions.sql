@@ -0,0 +1,22 @@
+{#-
+  Test genérico: claves que corresponden a más de una combinación de las columnas
+  de las que salen (colisiones del hash). Con int64 conviene correrlo en las
+  tablas grandes.
+
+    columns:
+      - name: pedido_id
+        tests:
+          - key_collisions:
+              columns: [canal, orden_id_origen]
+-#}
+{% test key_collisions(model, column_name, columns) %}
+
+SELECT
+    {{ column_name }},
+    COUNT(DISTINCT ({{ columns | join(', ') }})) AS n_values
+FROM {{ model }}
+WHERE {{ column_name }} IS NOT NULL
+GROUP BY {{ column_name }}
+HAVING COUNT(DISTINCT ({{ columns | join(', ') }})) > 1
+
+{% endtest %}
@@ -7,7 +7,7 @@
 WITH vtex AS (
     SELECT
         md5('vtex|' || coalesce(json_extract_string(clientProfileData, '$.userProfileId'), '')) AS cliente_id,
-        md5('vtex|' || orderId)                                                                  AS pedido_id,
+        {{ surrogate_key("'vtex|' || orderId") }}                                                AS pedido_id,
         'vtex'                                                                                   AS canal,
         TRY_CAST(value AS DOUBLE) / 100.0                                                        AS monto_total,
         TRY_CAST(creationDate AS TIMESTAMP)                                                      AS fecha_pedido,
@@ -20,7 +20,7 @@ WITH vtex AS (
 meli AS (
     SELECT
         md5('mercadolibre|' || coalesce(json_extract_string(buyer, '$.id'), '')) AS cliente_id,
-        md5('mercadolibre|' || id::VARCHAR)                                       AS pedido_id,
+        {{ surrogate_key("'mercadolibre|' || id::VARCHAR") }}                     AS pedido_id,
         'mercadolibre'                                                            AS canal,
         TRY_CAST(total_amount AS DOUBLE)                                          AS monto_total,
         TRY_CAST(date_created AS TIMESTAMP)                                       AS fecha_pedido,
@@ -33,7 +33,7 @@ meli AS (
 garbarino AS (
     SELECT
         md5('garbarino|' || coalesce(json_extract_string(customer, '$.id'), '')) AS cliente_id,
-        md5('garbarino|' || id::VARCHAR)                                          AS pedido_id,
+        {{ surrogate_key("'garbarino|' || id::VARCHAR") }}                        AS pedido_id,
         'garbarino'                                                               AS canal,
         TRY_CAST(json_extract_string(totals_sale, '$.total') AS DOUBLE)          AS monto_total,
         TRY_CAST(created AS TIMESTAMP)                                            AS fecha_pedido,
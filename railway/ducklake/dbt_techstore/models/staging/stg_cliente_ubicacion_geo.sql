@@ -10,11 +10,11 @@
 WITH meli_link AS (
     SELECT
         md5('mercadolibre|' || coalesce(json_extract_string(p.buyer, '$.id'), ''))  AS cliente_id,
-        md5(
+        {% call surrogate_key() %}
             coalesce(json_extract_string(e.receiver_address, '$.city.name'), '')    || '|' ||
             coalesce(json_extract_string(e.receiver_address, '$.zip_code'), '')     || '|' ||
             coalesce(json_extract_string(e.receiver_address, '$.country.id'), 'AR')
-        )                                                                            AS ubicacion_id,
+        {% endcall %}                                                                AS ubicacion_id,
         'destino'                                                                    AS tipo,
         MAX(TRY_CAST(p.date_created AS TIMESTAMP))                                  AS fecha_ultimo_pedido
     FROM {{ source('raw', 'type_6') }} e
@@ -28,11 +28,11 @@ WITH meli_link AS (
 vtex_link AS (
     SELECT
         md5('vtex|' || coalesce(json_extract_string(clientProfileData, '$.userProfileId'), '')) AS cliente_id,
-        md5(
+        {% call surrogate_key() %}
             coalesce(json_extract_string(shippingData, '$.address.city'), '')       || '|' ||
             coalesce(json_extract_string(shippingData, '$.address.postalCode'), '') || '|' ||
             coalesce(json_extract_string(shippingData, '$.address.country'), 'AR')
-        )                                                                                        AS ubicacion_id,
+        {% endcall %}                                                                            AS ubicacion_id,
         'destino'                                                                                AS tipo,
         MAX(TRY_CAST(creationDate AS TIMESTAMP))                                                 AS fecha_ultimo_pedido
     FROM {{ source('raw', 'vtex_pedido') }}
@@ -1,7 +1,7 @@
 {{ config(materialized='table') }}
 
 -- Dimensión de direcciones de entrega únicas.
--- direccion_id: md5(calle|altura|ciudad|cp|pais) — misma lógica que en stg_pedido.
+-- direccion_id: surrogate key de calle|altura|ciudad|cp|pais — misma lógica que en stg_pedido.
 -- Fuentes:
 --   type_6 receiver_address → MeLi (JSON real, tiene calle/altura/lat/lon)
 --   vtex_pedido shippingData → VTEX (puede ser token anonimizado → campos NULL)
@@ -63,13 +63,13 @@ unificado AS (
 )
 
 SELECT
-    md5(
+    {% call surrogate_key() %}
         coalesce(calle,  '') || '|' ||
         coalesce(altura, '') || '|' ||
         coalesce(ciudad, '') || '|' ||
         coalesce(cp,     '') || '|' ||
         coalesce(pais, 'AR')
-    )               AS direccion_id,
+    {% endcall %}   AS direccion_id,
     calle,
     altura,
     complemento,
@@ -2,9 +2,10 @@
 
 -- Coordenadas geocodificadas desde coords_enriched.csv.
 -- Tipado limpio de todas las columnas; dedup por direccion_id (más completo primero).
+-- direccion_id viene como md5 en hexadecimal: se convierte al tipo de surrogate_key_type.
 
 SELECT
-    direccion_id::VARCHAR                           AS direccion_id,
+    {{ md5_key('direccion_id::VARCHAR') }}          AS direccion_id,
     TRY_CAST(latitud            AS DOUBLE)          AS latitud,
     TRY_CAST(longitud           AS DOUBLE)          AS longitud,
     matched_city::VARCHAR                           AS matched_city,
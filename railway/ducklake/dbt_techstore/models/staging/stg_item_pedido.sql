@@ -1,12 +1,12 @@
 {{ config(materialized='table') }}
 
 -- Líneas de pedido: un registro por producto dentro de cada pedido.
--- item_pedido_id: surrogate key md5(pedido_id|producto_id_origen)
+-- item_pedido_id: surrogate key de pedido_id|producto_id_origen
 -- Nota: precio VTEX en centavos → se divide por 100.
 
 WITH meli_items AS (
     SELECT
-        md5('mercadolibre|' || id::VARCHAR)                             AS pedido_id,
+        {{ surrogate_key("'mercadolibre|' || id::VARCHAR") }}           AS pedido_id,
         id::VARCHAR                                                     AS orden_id_origen,
         'mercadolibre'                                                  AS canal,
         json_extract_string(item_row, '$.item.id')                     AS producto_id_origen,
@@ -25,7 +25,7 @@ WITH meli_items AS (
 
 vtex_items AS (
     SELECT
-        md5('vtex|' || orderId)                                         AS pedido_id,
+        {{ surrogate_key("'vtex|' || orderId") }}                       AS pedido_id,
         orderId                                                         AS orden_id_origen,
         'vtex'                                                          AS canal,
         json_extract_string(item_row, '$.productId')                   AS producto_id_origen,
@@ -46,7 +46,7 @@ vtex_items AS (
 
 garbarino_items AS (
     SELECT
-        md5('garbarino|' || id::VARCHAR)                                AS pedido_id,
+        {{ surrogate_key("'garbarino|' || id::VARCHAR") }}              AS pedido_id,
         id::VARCHAR                                                     AS orden_id_origen,
         'garbarino'                                                     AS canal,
         json_extract_string(item_row, '$.product_id')                  AS producto_id_origen,
@@ -70,7 +70,7 @@ unificado AS (
 )
 
 SELECT
-    md5(pedido_id || '|' || coalesce(producto_id_origen, nombre_producto)) AS item_pedido_id,
+    {{ surrogate_key("pedido_id::VARCHAR || '|' || coalesce(producto_id_origen, nombre_producto)") }} AS item_pedido_id,
     pedido_id,
     orden_id_origen,
     canal,
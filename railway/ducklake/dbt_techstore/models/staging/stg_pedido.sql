@@ -1,7 +1,7 @@
 {{ config(materialized='table') }}
 
 -- Fact table central: pedidos unificados de las 3 plataformas.
--- pedido_id: surrogate key md5(canal|orden_id_origen)
+-- pedido_id: surrogate key de canal|orden_id_origen (tipo según var surrogate_key_type)
 -- canal_id: obtenido via join a stg_canal
 -- direccion_id: FK a stg_direccion (NULL si address es token anonimizado o no hay datos)
 --   MeLi: la dirección está en type_6.receiver_address (JSON real, join por order_id)
@@ -19,13 +19,13 @@ WITH canal AS (
 meli_dir AS (
     SELECT
         order_id::VARCHAR AS orden_id_origen,
-        md5(
+        {% call surrogate_key() %}
             coalesce(json_extract_string(receiver_address, '$.street_name'),  '') || '|' ||
             coalesce(json_extract_string(receiver_address, '$.street_number'),'') || '|' ||
             coalesce(json_extract_string(receiver_address, '$.city.name'),    '') || '|' ||
             coalesce(json_extract_string(receiver_address, '$.zip_code'),     '') || '|' ||
             coalesce(json_extract_string(receiver_address, '$.country.id'),  'AR')
-        ) AS direccion_id
+        {% endcall %} AS direccion_id
     FROM {{ source('raw', 'type_6') }}
     WHERE receiver_address IS NOT NULL
     QUALIFY ROW_NUMBER() OVER (PARTITION BY order_id ORDER BY last_updated DESC NULLS LAST) = 1
@@ -33,7 +33,7 @@ meli_dir AS (
 
 vtex AS (
     SELECT
-        md5('vtex|' || orderId)                                                 AS pedido_id,
+        {{ surrogate_key("'vtex|' || orderId") }}                               AS pedido_id,
         orderId                                                                 AS orden_id_origen,
         'vtex'                                                                  AS canal,
         status,
@@ -42,13 +42,13 @@ vtex AS (
         TRY_CAST(lastChange   AS TIMESTAMP)                                     AS fecha_actualizacion,
         NULL::TIMESTAMP                                                         AS fecha_cierre,
         CASE WHEN shippingData LIKE '{' || '%' THEN
-            md5(
+            {% call surrogate_key() %}
                 coalesce(json_extract_string(shippingData, '$.address.street'),     '') || '|' ||
                 coalesce(json_extract_string(shippingData, '$.address.number'),     '') || '|' ||
                 coalesce(json_extract_string(shippingData, '$.address.city'),       '') || '|' ||
                 coalesce(json_extract_string(shippingData, '$.address.postalCode'), '') || '|' ||
                 coalesce(json_extract_string(shippingData, '$.address.country'),   'AR')
-            )
+            {% endcall %}
         ELSE NULL END                                                           AS direccion_id
     FROM {{ source('raw', 'vtex_pedido') }}
     QUALIFY ROW_NUMBER() OVER (PARTITION BY orderId ORDER BY lastChange DESC) = 1
@@ -56,7 +56,7 @@ vtex AS (
 
 meli AS (
     SELECT
-        md5('mercadolibre|' || id::VARCHAR)                                     AS pedido_id,
+        {{ surrogate_key("'mercadolibre|' || id::VARCHAR") }}                   AS pedido_id,
         id::VARCHAR                                                             AS orden_id_origen,
         'mercadolibre'                                                          AS canal,
         status,
@@ -64,14 +64,14 @@ meli AS (
         TRY_CAST(date_created  AS TIMESTAMP)                                    AS fecha_creacion,
         TRY_CAST(last_updated  AS TIMESTAMP)                                    AS fecha_actualizacion,
         TRY_CAST(date_closed   AS TIMESTAMP)                                    AS fecha_cierre,
-        NULL::VARCHAR                                                           AS direccion_id  -- se resuelve via LEFT JOIN con meli_dir
+        NULL::{{ surrogate_key_sql_type() }}                                    AS direccion_id  -- se resuelve via LEFT JOIN con meli_dir
     FROM {{ source('raw', 'meli_pedido') }}
     QUALIFY ROW_NUMBER() OVER (PARTITION BY id ORDER BY last_updated DESC) = 1
 ),
 
 garbarino AS (
     SELECT
-        md5('garbarino|' || id::VARCHAR)                                        AS pedido_id,
+        {{ surrogate_key("'garbarino|' || id::VARCHAR") }}                      AS pedido_id,
         id::VARCHAR                                                             AS orden_id_origen,
         'garbarino'                                                             AS canal,
         status,
@@ -80,13 +80,13 @@ garbarino AS (
         NULL::TIMESTAMP                                                         AS fecha_actualizacion,
         NULL::TIMESTAMP                                                         AS fecha_cierre,
         CASE WHEN billing_address LIKE '{' || '%' THEN
-            md5(
+            {% call surrogate_key() %}
                 coalesce(json_extract_string(billing_address, '$.street'),  '') || '|' ||
                 coalesce(json_extract_string(billing_address, '$.number'),  '') || '|' ||
                 coalesce(json_extract_string(billing_address, '$.city'),    '') || '|' ||
                 coalesce(json_extract_string(billing_address, '$.zip'),     '') || '|' ||
                 coalesce(json_extract_string(billing_address, '$.country'), 'AR')
-            )
+            {% endcall %}
         ELSE NULL END                                                           AS direccion_id
     FROM {{ source('raw', 'garbarino_pedido') }}
     QUALIFY ROW_NUMBER() OVER (PARTITION BY id ORDER BY created DESC) = 1
@@ -6,7 +6,7 @@
 --   type_6 sender_address   → orígenes vendedor MeLi (lat/lon disponibles)
 --   vtex_pedido shippingData → destinos VTEX (sin lat/lon)
 --   meli_pickup store_info   → tiendas de retiro MeLi (lat/lon disponibles)
--- ubicacion_id: surrogate key md5(ciudad|codigo_postal|pais_codigo)
+-- ubicacion_id: surrogate key de ciudad|codigo_postal|pais_codigo
 -- Coordenadas: lat/lon del JSON cuando disponibles (MeLi/pickup);
 --   fallback a stg_direccion_geocodificada (promedio geocodificado por ciudad).
 --   Fuente canónica de coordenadas para todos los modelos consume.
@@ -70,11 +70,11 @@ unificado AS (
 -- Prioriza registros con lat/lon del JSON (MeLi/pickup) sobre los sin coordenadas (VTEX).
 deduped AS (
     SELECT
-        md5(
+        {% call surrogate_key() %}
             coalesce(ciudad, '')        || '|' ||
             coalesce(codigo_postal, '') || '|' ||
             coalesce(pais_codigo, 'AR')
-        )               AS ubicacion_id,
+        {% endcall %}   AS ubicacion_id,
         ciudad,
         provincia,
         -- Homologar: ISO 3166-1 alpha-3 → alpha-2
@@ -27,6 +27,8 @@ class PostgresExporter:
         "BIGINT": "BIGINT",
         "INTEGER": "INTEGER",
         "HUGEINT": "NUMERIC",
+        "UBIGINT": "NUMERIC(20)",  # Surrogate keys int64 (no entran en BIGINT con signo)
+        "UUID": "UUID",  # Surrogate keys int128
         "DOUBLE": "DOUBLE PRECISION",
         "FLOAT": "REAL",
         "DECIMAL": "NUMERIC",
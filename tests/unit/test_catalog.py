@@ -0,0 +1,48 @@
+"""Tests para el catálogo de metadata."""
+
+import pytest
+
+from ducklake.core.catalog import Catalog
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    cat = Catalog(str(tmp_path / "catalog.duckdb"))
+    yield cat
+    cat.close()
+
+
+class TestIngestedFiles:
+    def test_register_and_get(self, catalog):
+        catalog.register_ingested_files(
+            "src", "t", [{"path": "/in/a.csv", "size": 10, "mtime": 1.5, "hash": "abc"}]
+        )
+        files = catalog.get_ingested_files("src", "t")
+        assert files["/in/a.csv"]["size"] == 10
+        assert files["/in/a.csv"]["mtime"] == 1.5
+        assert catalog.get_ingested_files("src", "other") == {}
+
+    def test_register_replaces_previous_state(self, catalog):
+        catalog.register_ingested_files(
+            "src", "t", [{"path": "/in/a.csv", "size": 10, "mtime": 1.5, "hash": "abc"}]
+        )
+        catalog.register_ingested_files(
+            "src", "t", [{"path": "/in/a.csv", "size": 20, "mtime": 2.5, "hash": "def"}]
+        )
+        files = catalog.get_ingested_files("src", "t")
+        assert len(files) == 1
+        assert files["/in/a.csv"]["hash"] == "def"
+
+    def test_tail_state_roundtrip(self, catalog):
+        catalog.register_ingested_files(
+            "src",
+            "t",
+            [{
+                "path": "/in/log.csv", "size": 100, "mtime": 1.0, "hash": None,
+                "offset": 90, "lines": 4, "head_hash": "h", "schema": {"id": "BIGINT"},
+            }],
+        )
+        state = catalog.get_ingested_files("src", "t")["/in/log.csv"]
+        assert state["offset"] == 90
+        assert state["lines"] == 4
+        assert state["schema"] == {"id": "BIGINT"}
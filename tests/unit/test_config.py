@@ -12,6 +12,7 @@ from ducklake.core.config import (
     SettingsConfig,
     load_yaml,
     load_config,
+    update_source_connection,
     _resolve_env_vars,
 )
 
@@ -100,3 +101,36 @@ class TestPipelineConfig:
         assert p.name == "test"
         assert p.transforms == []
         assert p.quality_checks == []
+
+    def test_asof_join_requires_timestamp(self):
+        with pytest.raises(ValueError, match="asof_join requires"):
+            PipelineConfig(
+                name="features",
+                source={"layer": "staging", "domain": "ml", "table": "labels"},
+                destination={"layer": "consume", "domain": "ml", "table": "train"},
+                transforms=[
+                    {"type": "asof_join", "keys": ["cliente_id"], "features": [
+                        {"domain": "finanzas", "table": "saldos"}
+                    ]}
+                ],
+            )
+
+
+class TestUpdateSourceConnection:
+    def test_writes_columns_and_keeps_env_placeholders(self, config_dir, monkeypatch):
+        sources = Path(config_dir) / "sources.yaml"
+        sources.write_text(
+            sources.read_text().replace('delimiter: ","', 'delimiter: "${CSV_DELIM}"')
+        )
+        monkeypatch.setenv("CSV_DELIM", ";")
+
+        update_source_connection(config_dir, "test_csv", {"columns": {"id": "BIGINT"}})
+
+        assert "${CSV_DELIM}" in sources.read_text()
+        source = load_config(config_dir).sources[0]
+        assert source.model_dump()["connection"]["columns"] == {"id": "BIGINT"}
+        assert source.model_dump()["connection"]["delimiter"] == ";"
+
+    def test_unknown_source(self, config_dir):
+        with pytest.raises(ValueError):
+            update_source_connection(config_dir, "nope", {"columns": {}})
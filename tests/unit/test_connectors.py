@@ -3,11 +3,24 @@
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import duckdb
 import pyarrow.parquet as pq
+from pymysql.constants import FIELD_TYPE
 import pytest
 
 from ducklake.connectors.csv_connector import CSVConnector
+from ducklake.connectors import get_connector
 from ducklake.connectors.mysql import MySQLConnector
+from ducklake.connectors.pool import ConnectionPool, PoolTimeoutError, close_all_pools
+from ducklake.connectors.postgres import PostgresConnector
+
+
+@pytest.fixture(autouse=True)
+def _reset_pools():
+    """Los pools son globales al proceso: aislarlos entre tests."""
+    close_all_pools()
+    yield
+    close_all_pools()
 
 
 class TestCSVConnector:
@@ -54,6 +67,161 @@ class TestCSVConnector:
         assert "_ingestion_timestamp" in table.column_names
         assert "_source_name" in table.column_names
 
+    def test_incremental_only_new_or_modified_files(self, tmp_path):
+        folder = tmp_path / "drops"
+        folder.mkdir()
+        for day in (1, 2):
+            (folder / f"ventas_{day}.csv").write_text(f"id,total\n{day},10\n{day}0,20\n")
+        config = {
+            "name": "test_csv",
+            "type": "csv",
+            "path": str(folder / "*.csv"),
+            "connection": {"delimiter": ",", "header": True},
+            "tables": [],
+            "extract": {"mode": "incremental"},
+        }
+        connector = CSVConnector(config)
+
+        first = connector.extract("ventas", str(tmp_path / "out1.parquet"))
+        assert len(list(Path(first).glob("*.parquet"))) == 2
+        known = {f["path"]: f for f in connector.get_ingested_files()}
+        assert all(len(f["hash"]) == 64 for f in known.values())
+
+        # Sin cambios: no se convierte nada
+        second = connector.extract("ventas", str(tmp_path / "out2.parquet"), ingested_files=known)
+        assert list(Path(second).glob("*.parquet")) == []
+        assert connector.get_ingested_files() == []
+
+        # Archivo nuevo + uno modificado
+        (folder / "ventas_3.csv").write_text("id,total\n3,30\n")
+        (folder / "ventas_1.csv").write_text("id,total\n1,10\n10,20\n11,5\n")
+        third = connector.extract("ventas", str(tmp_path / "out3.parquet"), ingested_files=known)
+        parts = list(Path(third).glob("*.parquet"))
+        assert len(parts) == 2
+        assert sum(pq.read_table(p).num_rows for p in parts) == 4
+        assert {Path(f["path"]).name for f in connector.get_ingested_files()} == {
+            "ventas_1.csv",
+            "ventas_3.csv",
+        }
+
+    def test_incremental_touched_file_same_content(self, tmp_path, sample_csv):
+        config = {
+            "name": "test_csv",
+            "type": "csv",
+            "path": sample_csv,
+            "connection": {},
+            "tables": [],
+            "extract": {"mode": "incremental"},
+        }
+        connector = CSVConnector(config)
+        connector.extract("t", str(tmp_path / "a.parquet"))
+        known = {f["path"]: f for f in connector.get_ingested_files()}
+        known[sample_csv]["mtime"] -= 10  # simular touch
+
+        result = connector.extract("t", str(tmp_path / "b.parquet"), ingested_files=known)
+        assert list(Path(result).glob("*.parquet")) == []
+        # Se actualiza el estado (mtime nuevo) sin reingerir
+        assert len(connector.get_ingested_files()) == 1
+
+    def _tail_connector(self, path):
+        return CSVConnector({
+            "name": "test_csv",
+            "type": "csv",
+            "path": str(path),
+            "connection": {"delimiter": ",", "header": True},
+            "tables": [],
+            "extract": {"mode": "tail"},
+        })
+
+    def test_tail_reads_only_appended_lines(self, tmp_path):
+        log = tmp_path / "eventos.csv"
+        log.write_text("id,evento,monto\n1,alta,10.5\n2,baja,3.0\n")
+        connector = self._tail_connector(log)
+
+        first = connector.extract("eventos", str(tmp_path / "o1.parquet"))
+        assert pq.read_table(next(Path(first).glob("*.parquet"))).num_rows == 2
+        state = connector.get_ingested_files()[0]
+        assert state["offset"] == log.stat().st_size
+        assert state["lines"] == 3
+        assert state["schema"]["monto"] == "DOUBLE"
+
+        # Fila completa + fila a medio escribir (sin newline): solo entra la completa
+        with open(log, "a") as f:
+            f.write('3,"nota, con\nsalto",7.25\n4,parc')
+        known = {state["path"]: state}
+        second = connector.extract("eventos", str(tmp_path / "o2.parquet"), ingested_files=known)
+        rows = pq.read_table(next(Path(second).glob("*.parquet"))).to_pylist()
+        assert [r["id"] for r in rows] == [3]
+        assert rows[0]["evento"] == "nota, con\nsalto"
+        state = connector.get_ingested_files()[0]
+        assert state["lines"] == 5
+
+        # Se completa la fila pendiente
+        with open(log, "a") as f:
+            f.write("ial,1.0\n")
+        known = {state["path"]: state}
+        third = connector.extract("eventos", str(tmp_path / "o3.parquet"), ingested_files=known)
+        rows = pq.read_table(next(Path(third).glob("*.parquet"))).to_pylist()
+        assert rows[0]["evento"] == "parcial"
+        assert rows[0]["monto"] == 1.0
+
+        # Sin bytes nuevos: nada que escribir
+        known = {state["path"]: connector.get_ingested_files()[0]}
+        fourth = connector.extract("eventos", str(tmp_path / "o4.parquet"), ingested_files=known)
+        assert list(Path(fourth).glob("*.parquet")) == []
+
+    def test_tail_full_reread_on_truncation_and_rotation(self, tmp_path):
+        log = tmp_path / "eventos.csv"
+        log.write_text("id,evento\n1,alta\n2,baja\n3,alta\n")
+        connector = self._tail_connector(log)
+        connector.extract("eventos", str(tmp_path / "o1.parquet"))
+        known = {f["path"]: f for f in connector.get_ingested_files()}
+
+        # Truncado: el archivo es más chico que el offset registrado
+        log.write_text("id,evento\n9,nuevo\n")
+        result = connector.extract("eventos", str(tmp_path / "o2.parquet"), ingested_files=known)
+        rows = pq.read_table(next(Path(result).glob("*.parquet"))).to_pylist()
+        assert [r["id"] for r in rows] == [9]
+
+        # Rotado: mismo tamaño o mayor pero otro contenido al comienzo
+        known = {f["path"]: f for f in connector.get_ingested_files()}
+        log.write_text("id,evento\n7,otro\n8,otro\n")
+        result = connector.extract("eventos", str(tmp_path / "o3.parquet"), ingested_files=known)
+        rows = pq.read_table(next(Path(result).glob("*.parquet"))).to_pylist()
+        assert [r["id"] for r in rows] == [7, 8]
+
+    def test_pinned_columns_skip_sniffing(self, tmp_path):
+        (tmp_path / "a.csv").write_text("codigo,total\n1,10\n2,20\n")
+        (tmp_path / "b.csv").write_text("codigo,total\nX-9,30\n")
+        config = {
+            "name": "test_csv",
+            "type": "csv",
+            "path": str(tmp_path / "*.csv"),
+            "connection": {"columns": {"codigo": "VARCHAR", "total": "DECIMAL(10,2)"}},
+            "tables": [],
+            "extract": {"mode": "full"},
+        }
+        connector = CSVConnector(config)
+        assert connector.get_schema("t") == {"codigo": "VARCHAR", "total": "DECIMAL(10,2)"}
+
+        table = pq.read_table(connector.extract("t", str(tmp_path / "out.parquet")))
+        assert table.num_rows == 3
+        assert str(table.schema.field("codigo").type) == "string"
+        assert str(table.schema.field("total").type) == "decimal128(10, 2)"
+
+    def test_infer_schema_ignores_pinned_columns(self, sample_csv):
+        config = {
+            "name": "test_csv",
+            "type": "csv",
+            "path": sample_csv,
+            "connection": {"columns": {"id": "VARCHAR"}},
+            "tables": [],
+            "extract": {"mode": "full"},
+        }
+        schema = CSVConnector(config).infer_schema("t")
+        assert schema["id"] == "BIGINT"
+        assert schema["total"] == "DOUBLE"
+
     def test_get_schema(self, sample_csv):
         config = {
             "name": "test_csv",
@@ -125,7 +293,11 @@ class TestMySQLConnector:
         }
         connector = MySQLConnector(config)
         assert connector.validate_connection() is True
-        mock_conn.close.assert_called_once()
+        # La conexión vuelve al pool y se reutiliza (sin nuevo handshake)
+        assert MySQLConnector(config).validate_connection() is True
+        mock_pymysql.connect.assert_called_once()
+        mock_conn.close.assert_not_called()
+        mock_conn.ping.assert_called_once()
 
     @patch("ducklake.connectors.mysql.pymysql")
     def test_validate_connection_failure(self, mock_pymysql):
@@ -140,3 +312,297 @@ class TestMySQLConnector:
         }
         connector = MySQLConnector(config)
         assert connector.validate_connection() is False
+
+
+class _MySQLStandIn:
+    """Conexión pymysql falsa respaldada por DuckDB (para tests sin servidor)."""
+
+    _TYPES = {"BIGINT": FIELD_TYPE.LONGLONG, "INTEGER": FIELD_TYPE.LONG,
+              "VARCHAR": FIELD_TYPE.VAR_STRING, "DATE": FIELD_TYPE.DATE,
+              "TIMESTAMP": FIELD_TYPE.DATETIME, "DOUBLE": FIELD_TYPE.DOUBLE}
+
+    def __init__(self, db, table_rows=None):
+        self.db = db.cursor()
+        self.table_rows = table_rows
+        self.queries = []
+        self.description = None
+
+    def cursor(self, *args):
+        return self
+
+    def execute(self, query, params=None):
+        self.queries.append(query)
+        if "information_schema.TABLES" in query:
+            query, params = f"SELECT {self.table_rows or 'NULL'}::BIGINT", None
+        self.db.execute(query.replace("%s", "?"), params or [])
+        self.description = [
+            (d[0], self._TYPES[str(d[1])], None, None, None, None, True)
+            for d in self.db.description
+        ]
+
+    def fetchone(self):
+        return self.db.fetchone()
+
+    def fetchall(self):
+        return self.db.fetchall()
+
+    def fetchmany(self, size):
+        return self.db.fetchmany(size)
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def mysql_orders():
+    """Tabla de pedidos en DuckDB con ids 1..1000 y algunos NULL en fecha."""
+    db = duckdb.connect()
+    db.execute("""
+        CREATE TABLE pedidos AS
+        SELECT i::BIGINT AS id,
+               'cliente_' || (i % 7) AS cliente,
+               CASE WHEN i % 100 = 0 THEN NULL
+                    ELSE TIMESTAMP '2024-01-01' + INTERVAL (i) HOUR END AS fecha
+        FROM range(1, 1001) t(i)
+    """)
+    yield db
+    db.close()
+
+
+class TestMySQLSplitExtraction:
+    def _config(self, **extract):
+        return {
+            "name": "test_mysql",
+            "type": "mysql",
+            "connection": {"host": "localhost"},
+            "tables": ["pedidos"],
+            "extract": {"mode": "full", "batch_size": 128, **extract},
+        }
+
+    def _run(self, mysql_orders, tmp_path, table_rows=None, **extract):
+        connector = MySQLConnector(self._config(**extract))
+        conns = []
+
+        def new_conn():
+            conns.append(_MySQLStandIn(mysql_orders, table_rows))
+            return conns[-1]
+
+        with patch.object(MySQLConnector, "_get_connection", side_effect=new_conn):
+            result = connector.extract("pedidos", str(tmp_path / "pedidos.parquet"))
+        return result, conns
+
+    def test_single_stream_writes_all_rows(self, mysql_orders, tmp_path):
+        result, _ = self._run(mysql_orders, tmp_path)
+        table = pq.read_table(result)
+        assert table.num_rows == 1000
+        assert "_ingestion_timestamp" in table.column_names
+
+    def test_minmax_split_covers_all_rows_once(self, mysql_orders, tmp_path):
+        result, conns = self._run(mysql_orders, tmp_path, split_column="id", num_splits=4)
+        parts = sorted(Path(result).glob("part-*.parquet"))
+        assert len(parts) == 4
+        ids = [i for p in parts for i in pq.read_table(p).column("id").to_pylist()]
+        assert sorted(ids) == list(range(1, 1001))
+        # Conexiones reutilizadas del pool: nunca más que el tamaño del pool
+        assert len(conns) <= 4
+
+    def test_date_split_keeps_null_rows(self, mysql_orders, tmp_path):
+        result, _ = self._run(
+            mysql_orders,
+            tmp_path,
+            table_rows=1000,
+            split_column="fecha",
+            num_splits=3,
+            split_strategy="quantiles",
+        )
+        parts = sorted(Path(result).glob("part-*.parquet"))
+        assert len(parts) == 3
+        total = sum(pq.read_table(p).num_rows for p in parts)
+        assert total == 1000
+
+    def test_quantiles_without_table_rows_use_minmax(self, mysql_orders, tmp_path):
+        result, conns = self._run(
+            mysql_orders, tmp_path, split_column="id", num_splits=4, split_strategy="quantiles"
+        )
+        queries = [q for c in conns for q in c.queries]
+        # Sin TABLE_ROWS no se trae la columna entera: cortes de MIN/MAX
+        assert not any(q.startswith("SELECT id FROM") for q in queries)
+        assert any(q.startswith("SELECT MIN(id), MAX(id)") for q in queries)
+        parts = sorted(Path(result).glob("part-*.parquet"))
+        assert len(parts) == 4
+        ids = [i for p in parts for i in pq.read_table(p).column("id").to_pylist()]
+        assert sorted(ids) == list(range(1, 1001))
+
+    def test_split_with_filter(self, mysql_orders, tmp_path):
+        result, _ = self._run(
+            mysql_orders, tmp_path, split_column="id", num_splits=2, filter="id <= 10"
+        )
+        rows = sum(pq.read_table(p).num_rows for p in Path(result).glob("*.parquet"))
+        assert rows == 10
+
+
+class TestMySQLPooling:
+    def _config(self):
+        return {
+            "name": "test_mysql",
+            "type": "mysql",
+            "connection": {"host": "erp", "database": "ventas", "pool_size": 2},
+            "tables": ["clientes", "pedidos"],
+            "extract": {"mode": "full"},
+        }
+
+    def test_schemas_fetched_in_one_query(self):
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.fetchall.return_value = [
+            ("clientes", "id", "int(11)"),
+            ("clientes", "nombre", "varchar(100)"),
+            ("pedidos", "id", "bigint(20)"),
+        ]
+        with patch.object(MySQLConnector, "_get_connection", return_value=conn) as factory:
+            connector = MySQLConnector(self._config())
+            assert connector.get_schema("clientes") == {"id": "int(11)", "nombre": "varchar(100)"}
+            assert connector.get_schema("pedidos") == {"id": "bigint(20)"}
+        assert cursor.execute.call_count == 1
+        assert cursor.execute.call_args[0][1] == ["clientes", "pedidos"]
+        factory.assert_called_once()
+
+    def test_pool_reused_across_connector_instances(self):
+        with patch.object(MySQLConnector, "_get_connection", side_effect=lambda: MagicMock()):
+            first = MySQLConnector(self._config())
+            second = MySQLConnector(self._config())
+            assert first._pool() is second._pool()
+            assert first._pool().size == 2
+
+    def test_unhealthy_connection_is_replaced(self):
+        dead, fresh = MagicMock(), MagicMock()
+        dead.ping.side_effect = Exception("MySQL server has gone away")
+        with patch.object(MySQLConnector, "_get_connection", side_effect=[dead, fresh]):
+            connector = MySQLConnector(self._config())
+            with connector._connection() as conn:
+                assert conn is dead
+            with connector._connection() as conn:
+                assert conn is fresh
+        dead.close.assert_called_once()
+
+    def test_pool_bounds_connections(self):
+        pool = ConnectionPool(MagicMock, size=1, timeout=0.05)
+        conn = pool.acquire()
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire()
+        pool.release(conn)
+        assert pool.acquire() is conn
+
+    def test_connection_discarded_on_error(self):
+        pool = ConnectionPool(MagicMock, size=1)
+        with pytest.raises(RuntimeError):
+            with pool.connection() as conn:
+                raise RuntimeError("boom")
+        conn.close.assert_called_once()
+        assert pool.acquire() is not conn
+
+
+def _pg_conn_mock(columns, copy_payload):
+    """Conexión psycopg2 falsa: information_schema + COPY que emite CSV."""
+    conn = MagicMock()
+    cursor = conn.cursor.return_value
+    cursor.fetchall.return_value = columns
+    cursor.mogrify.side_effect = lambda q, p: (q.replace("%s", f"'{p[0]}'")).encode()
+
+    def copy_expert(sql, sink):
+        cursor.last_copy = sql
+        # Escribir en varios chunks como lo hace psycopg2 (un mensaje por fila)
+        for line in copy_payload.splitlines(keepends=True):
+            sink.write(line)
+
+    cursor.copy_expert.side_effect = copy_expert
+    return conn
+
+
+_PG_COLUMNS = [
+    ("id", "integer", 32, 0),
+    ("nombre", "text", None, None),
+    ("total", "numeric", 10, 2),
+    ("activo", "boolean", None, None),
+    ("updated_at", "timestamp without time zone", None, None),
+]
+
+
+class TestPostgresConnector:
+    def _config(self, **extract):
+        return {
+            "name": "test_pg",
+            "type": "postgres",
+            "connection": {"host": "localhost", "database": "db", "user": "u", "password": "p"},
+            "tables": ["clientes"],
+            "extract": {"mode": "full", **extract},
+        }
+
+    def test_factory_and_default_port(self):
+        connector = get_connector(self._config())
+        assert isinstance(connector, PostgresConnector)
+        assert connector.connection_params["port"] == 5432
+
+    def test_extract_streams_copy_to_parquet(self, tmp_path):
+        payload = (
+            b"1,Alice,100.50,t,2024-01-01 10:00:00\n"
+            b'2,"Bob, Jr.",200.00,f,2024-01-02 10:00:00\n'
+            b'3,"",,t,2024-01-03 10:00:00\n'
+            b'4,"multi\nline",1.00,,\n'
+        )
+        connector = PostgresConnector(self._config())
+        # Bloques chicos para forzar varios record batches
+        connector.block_size = 64
+        conn = _pg_conn_mock(_PG_COLUMNS, payload)
+        output = str(tmp_path / "out.parquet")
+        with patch.object(PostgresConnector, "_get_connection", return_value=conn):
+            connector.extract("clientes", output)
+
+        table = pq.read_table(output)
+        assert table.num_rows == 4
+        rows = table.to_pylist()
+        assert rows[1]["nombre"] == "Bob, Jr."
+        assert rows[2]["nombre"] == ""
+        assert rows[2]["total"] is None
+        assert rows[3]["nombre"] == "multi\nline"
+        assert rows[0]["activo"] is True
+        assert str(table.schema.field("total").type) == "decimal128(10, 2)"
+        assert "_ingestion_timestamp" in table.column_names
+        assert set(table.column("_source_name").to_pylist()) == {"test_pg"}
+        assert conn.cursor.return_value.last_copy.startswith('COPY (SELECT "id", "nombre"')
+
+    def test_extract_incremental_with_filter(self, tmp_path):
+        connector = PostgresConnector(
+            self._config(mode="incremental", key_column="updated_at", filter="activo")
+        )
+        conn = _pg_conn_mock(_PG_COLUMNS, b"")
+        output = str(tmp_path / "out.parquet")
+        with patch.object(PostgresConnector, "_get_connection", return_value=conn):
+            connector.extract("clientes", output, last_value="2024-01-02")
+
+        copy_sql = conn.cursor.return_value.last_copy
+        assert "WHERE (activo) AND \"updated_at\" > '2024-01-02'" in copy_sql
+        # Resultado vacío: parquet válido con el schema de information_schema
+        table = pq.read_table(output)
+        assert table.num_rows == 0
+        assert "updated_at" in table.column_names
+
+    def test_get_schema_from_information_schema(self):
+        connector = PostgresConnector(self._config())
+        conn = _pg_conn_mock(_PG_COLUMNS, b"")
+        with patch.object(PostgresConnector, "_get_connection", return_value=conn):
+            schema = connector.get_schema("ventas.clientes")
+        assert schema["id"] == "integer"
+        params = conn.cursor.return_value.execute.call_args[0][1]
+        assert params == ["ventas", "clientes"]
+
+    def test_copy_error_is_raised(self, tmp_path):
+        connector = PostgresConnector(self._config())
+        conn = _pg_conn_mock(_PG_COLUMNS, b"")
+        conn.cursor.return_value.copy_expert.side_effect = RuntimeError("permission denied")
+        with patch.object(PostgresConnector, "_get_connection", return_value=conn):
+            with pytest.raises(RuntimeError, match="permission denied"):
+                connector.extract("clientes", str(tmp_path / "out.parquet"))
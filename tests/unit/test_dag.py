@@ -0,0 +1,118 @@
+"""Tests para el DAG de pipelines y su runner."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from ducklake.core.config import PipelineConfig, ResourcesConfig, SettingsConfig
+from ducklake.core.dag import DagRunner, build_dag, downstream, topological_levels
+from ducklake.core.workers import CatalogRecorder, replay
+
+
+def _pipeline(name, source, dest, **kwargs):
+    return PipelineConfig(
+        name=name,
+        source={"layer": source[0], "domain": source[1], "table": source[2]},
+        destination={"layer": dest[0], "domain": dest[1], "table": dest[2]},
+        **kwargs,
+    )
+
+
+PIPELINES = [
+    _pipeline("clientes", ("raw", "erp", "clientes"), ("staging", "ventas", "clientes")),
+    _pipeline("pedidos", ("raw", "erp", "pedidos"), ("staging", "ventas", "pedidos")),
+    _pipeline(
+        "resumen", ("staging", "ventas", "pedidos"), ("consume", "bi", "resumen"),
+        depends_on=["clientes"],
+    ),
+    _pipeline(
+        "dedup_gigante", ("raw", "erp", "eventos"), ("staging", "ventas", "eventos"),
+        resources=ResourcesConfig(memory_limit="12GB", threads=16),
+    ),
+]
+
+
+class FakeOrchestrator:
+    """Orquestador que solo registra la concurrencia de cada corrida."""
+
+    def __init__(self, pipelines, fail=()):
+        self.config = SimpleNamespace(
+            pipelines=pipelines,
+            settings=SettingsConfig(duckdb_memory_limit="4GB", duckdb_threads=4),
+        )
+        self.fail = set(fail)
+        self.lock = threading.Lock()
+        self.running = set()
+        self.overlaps = []
+
+    def pipeline_resources(self, name):
+        p = next(p for p in self.config.pipelines if p.name == name)
+        big = p.resources is not None
+        return {"memory": 12 * 10**9 if big else 4 * 10**9, "threads": 16 if big else 4}
+
+    def run_pipeline(self, name, isolated=False):
+        with self.lock:
+            self.running.add(name)
+            self.overlaps.append(set(self.running))
+        time.sleep(0.05)
+        with self.lock:
+            self.running.discard(name)
+        if name in self.fail:
+            return {"status": "error", "pipeline": name, "error": "boom"}
+        return {"status": "success", "pipeline": name, "isolated": isolated}
+
+
+class TestDag:
+    def test_dependencies_from_tables(self):
+        deps = build_dag(PIPELINES)
+        assert deps["resumen"] == {"pedidos", "clientes"}
+        assert topological_levels(deps) == [["clientes", "dedup_gigante", "pedidos"], ["resumen"]]
+
+    def test_cycle(self):
+        cycle = [
+            _pipeline("a", ("staging", "x", "b"), ("staging", "x", "a")),
+            _pipeline("b", ("staging", "x", "a"), ("staging", "x", "b")),
+        ]
+        with pytest.raises(ValueError, match="cycle"):
+            topological_levels(build_dag(cycle))
+
+    def test_runner_respects_budget(self):
+        orch = FakeOrchestrator(PIPELINES)
+        results = DagRunner(orch, max_parallel=3, memory_budget="12GB", threads_budget=16).run()
+
+        assert all(r["status"] == "success" and r["isolated"] for r in results.values())
+        # El pipeline grande ocupa todo el presupuesto: nunca corre acompañado
+        assert all(s == {"dedup_gigante"} for s in orch.overlaps if "dedup_gigante" in s)
+        assert max(len(s) for s in orch.overlaps) == 2
+
+    def test_failed_dependency_skips_dependents(self):
+        orch = FakeOrchestrator(PIPELINES, fail={"pedidos"})
+        results = DagRunner(orch, max_parallel=2).run(["pedidos", "resumen", "clientes"])
+        assert results["pedidos"]["status"] == "error"
+        assert results["resumen"]["status"] == "skipped"
+        assert results["clientes"]["status"] == "success"
+
+
+class TestCatalogRecorder:
+    def test_records_writes_and_replays(self):
+        recorder = CatalogRecorder({("erp", "clientes"): {"year=2024/month=01/day=01": {}}})
+        recorder.register_pipeline_run(pipeline_name="p", rows=3)
+        assert recorder.get_raw_partitions("erp", "clientes")
+        with pytest.raises(RuntimeError):
+            recorder.get_raw_partitions("erp", "pedidos")
+        with pytest.raises(AttributeError):
+            recorder.get_recent_pipeline_runs()
+
+        calls = []
+        catalog = SimpleNamespace(register_pipeline_run=lambda **kw: calls.append(kw))
+        assert replay(catalog, {"status": "success"}, recorder.records) == {"status": "success"}
+        assert calls == [{"pipeline_name": "p", "rows": 3}]
+
+
+class TestDownstream:
+    def test_dependents_are_included(self):
+        deps = build_dag(PIPELINES)
+        assert downstream(deps, {"pedidos"}) == {"pedidos", "resumen"}
+        assert downstream(deps, {"dedup_gigante"}) == {"dedup_gigante"}
@@ -24,12 +24,53 @@ class TestRawLayer:
         table = pq.read_table(result_path)
         assert table.num_rows == 5
 
+    def test_write_parts_directory(self, tmp_data_dir, sample_parquet, tmp_path):
+        parts_dir = tmp_path / "extracted"
+        parts_dir.mkdir()
+        for i in range(3):
+            (parts_dir / f"part-{i:04d}.parquet").write_bytes(Path(sample_parquet).read_bytes())
+
+        raw = RawLayer(tmp_data_dir)
+        first = raw.write(str(parts_dir), {"source": "src", "table": "t"})
+        second = raw.write(str(parts_dir), {"source": "src", "table": "t"})
+
+        assert first != second
+        conn = duckdb.connect()
+        assert conn.execute(f"SELECT COUNT(*) FROM read_parquet('{first}')").fetchone()[0] == 15
+        # Las partes de ambas escrituras conviven en la partición
+        query = raw.read({"domain": "src", "table": "t"})
+        assert conn.execute(f"SELECT COUNT(*) FROM ({query})").fetchone()[0] == 30
+
+    def test_partition_depth_is_uniform(self, tmp_data_dir, sample_parquet):
+        raw = RawLayer(tmp_data_dir)
+        raw.write(sample_parquet, {"source": "src", "table": "t"})
+        with pytest.raises(ValueError, match="day-level partitions"):
+            raw.write(sample_parquet, {"source": "src", "table": "t", "partition": "hour"})
+
+        raw.write(sample_parquet, {"source": "src", "table": "h", "partition": "hour"})
+        raw.write(sample_parquet, {"source": "src", "table": "h", "partition": "hour"})
+        with pytest.raises(ValueError, match="hour-level partitions"):
+            raw.write(sample_parquet, {"source": "src", "table": "h"})
+
+        # La tabla sigue siendo legible con hive_partitioning
+        conn = duckdb.connect()
+        for table, rows in (("t", 5), ("h", 5)):
+            query = raw.read({"domain": "src", "table": table})
+            assert conn.execute(f"SELECT COUNT(*) FROM ({query})").fetchone()[0] == rows
+
     def test_read_builds_query(self, tmp_data_dir):
         raw = RawLayer(tmp_data_dir)
         query = raw.read({"domain": "test_src", "table": "users"})
         assert "read_parquet" in query
         assert "raw/test_src/users" in query
 
+    def test_read_projects_columns(self, tmp_data_dir, sample_parquet):
+        raw = RawLayer(tmp_data_dir)
+        raw.write(sample_parquet, {"source": "src", "table": "t"})
+        query = raw.read({"domain": "src", "table": "t", "columns": ["id", "total"]})
+        conn = duckdb.connect()
+        assert [d[0] for d in conn.execute(query).description] == ["id", "total"]
+
     def test_list_sources_empty(self, tmp_data_dir):
         raw = RawLayer(tmp_data_dir)
         assert raw.list_sources() == []
@@ -48,7 +89,8 @@ class TestStagingLayer:
         result = staging.write(relation, {"domain": "ventas", "table": "clientes"})
 
         assert Path(result).exists()
-        assert "staging/ventas/clientes/data.parquet" in result
+        assert "staging/ventas/clientes/versions/" in result
+        assert result in staging.read({"domain": "ventas", "table": "clientes"})
 
     def test_read_builds_query(self, tmp_data_dir, duckdb_conn):
         staging = StagingLayer(tmp_data_dir, duckdb_conn)
@@ -74,6 +116,101 @@ class TestStagingLayer:
         assert result["rows"] == 3  # Bob(200), Diana(300), Eve(250)
         assert Path(result["path"]).exists()
 
+    def test_bucketed_dedup_matches_window(self, tmp_data_dir, duckdb_conn, tmp_path):
+        path = str(tmp_path / "dups.parquet")
+        duckdb_conn.execute(f"""
+            COPY (
+                SELECT i % 37 AS cliente_id, i AS valor,
+                       TIMESTAMP '2024-01-01' + INTERVAL (i) MINUTE AS _ingestion_timestamp
+                FROM range(500) t(i)
+            ) TO '{path}' (FORMAT PARQUET)
+        """)
+        staging = StagingLayer(tmp_data_dir, duckdb_conn)
+        raw_query = f"SELECT * FROM read_parquet('{path}')"
+
+        def run(table, dedup):
+            config = {
+                "name": table,
+                "destination": {"domain": "test", "table": table},
+                "transforms": [{"type": "filter", "condition": "valor > 10"}, dedup],
+                "quality_checks": [],
+            }
+            result = staging.process(config, raw_query)
+            return duckdb_conn.execute(
+                f"SELECT * FROM read_parquet('{result['path']}') ORDER BY cliente_id"
+            ).fetchall()
+
+        window = run("window", {"type": "deduplicate", "keys": ["cliente_id"]})
+        bucketed = run(
+            "bucketed",
+            {"type": "deduplicate", "keys": ["cliente_id"], "strategy": "bucketed", "buckets": 4},
+        )
+        assert len(window) == 37
+        assert bucketed == window
+        assert not list(Path(tmp_data_dir, "_tmp").glob("*"))
+
+    def test_process_with_select(self, tmp_data_dir, duckdb_conn, sample_parquet):
+        staging = StagingLayer(tmp_data_dir, duckdb_conn)
+
+        raw_query = f"SELECT * FROM read_parquet('{sample_parquet}')"
+        pipeline_config = {
+            "name": "test_select",
+            "destination": {"layer": "staging", "domain": "test", "table": "narrow"},
+            "transforms": [{"type": "filter", "condition": "total > 150"}],
+            "select": ["id", "total"],
+            "quality_checks": [],
+        }
+
+        result = staging.process(pipeline_config, raw_query)
+        assert result["status"] == "success"
+        assert pq.read_schema(result["path"]).names == ["id", "total"]
+
+
+    def test_process_with_hash_key(self, tmp_data_dir, duckdb_conn, sample_parquet):
+        staging = StagingLayer(tmp_data_dir, duckdb_conn)
+
+        raw_query = f"SELECT * FROM read_parquet('{sample_parquet}')"
+        pipeline_config = {
+            "name": "test_hash_key",
+            "destination": {"layer": "staging", "domain": "test", "table": "keyed"},
+            "transforms": [
+                {"type": "hash_key", "keys": ["id", "email"], "key_name": "sk", "key_type": "int64"}
+            ],
+            "select": ["sk", "id", "email"],
+            "quality_checks": [
+                {"type": "key_collisions", "column": "sk", "columns": ["id", "email"]}
+            ],
+        }
+
+        result = staging.process(pipeline_config, raw_query)
+        assert result["status"] == "success"
+        assert result["quality"][0]["passed"]
+        schema = pq.read_schema(result["path"])
+        assert str(schema.field("sk").type) == "uint64"
+
+    def test_key_index_lookup(self, tmp_data_dir, duckdb_conn):
+        staging = StagingLayer(tmp_data_dir, duckdb_conn)
+        orders = duckdb_conn.sql(
+            "SELECT i AS pedido_id, i % 3 AS linea, 'p' || i AS detalle "
+            "FROM range(300000) t(i) ORDER BY hash(i)"
+        )
+        destination = {"domain": "ventas", "table": "pedidos", "index": ["pedido_id", "linea"]}
+        path = staging.write(orders, destination)
+        assert pq.ParquetFile(path).num_row_groups > 1
+
+        rows = staging.lookup(destination, [123457, "1"]).fetchall()
+        assert rows == [(123457, 1, "p123457")]
+        assert staging.lookup(destination, [123457, 2]).fetchall() == []
+
+        # Reescrito por fuera del pipeline: el índice queda viejo y se hace scan
+        duckdb_conn.sql("SELECT 5 AS pedido_id, 2 AS linea, 'nuevo' AS detalle").write_parquet(path)
+        assert staging.lookup(destination, [5, 2]).fetchall() == [(5, 2, "nuevo")]
+
+        # Sin index configurado se borra el índice anterior
+        staging.write(orders, {"domain": "ventas", "table": "pedidos"})
+        with pytest.raises(ValueError):
+            staging.lookup(destination, [5, 2])
+
 
 class TestConsumeLayer:
     def test_write_creates_file(self, tmp_data_dir, duckdb_conn, sample_parquet):
@@ -82,7 +219,8 @@ class TestConsumeLayer:
         result = consume.write(relation, {"domain": "bi", "table": "summary"})
 
         assert Path(result).exists()
-        assert "consume/bi/summary/data.parquet" in result
+        assert "consume/bi/summary/versions/" in result
+        assert result in consume.read({"domain": "bi", "table": "summary"})
 
     def test_process_with_custom_sql(self, tmp_data_dir, duckdb_conn, sample_parquet):
         consume = ConsumeLayer(tmp_data_dir, duckdb_conn)
@@ -102,3 +240,186 @@ class TestConsumeLayer:
         result = consume.process(pipeline_config, staging_query)
         assert result["status"] == "success"
         assert result["rows"] == 3  # ACTIVO, INACTIVO, DELETED
+
+    def test_write_arrow_ipc(self, tmp_data_dir, duckdb_conn, sample_parquet):
+        from ducklake.utils.arrow_ipc import load_arrow, load_numpy
+
+        consume = ConsumeLayer(tmp_data_dir, duckdb_conn)
+        relation = duckdb_conn.sql(f"SELECT id, total FROM read_parquet('{sample_parquet}')")
+        result = consume.write(
+            relation, {"domain": "ml", "table": "features", "arrow_ipc": "uncompressed"}
+        )
+
+        ipc_path = Path(result).with_suffix(".arrow")
+        assert ipc_path.exists()
+        table = load_arrow(str(ipc_path))
+        assert table.num_rows == 5
+        arrays = load_numpy(str(ipc_path), ["total"])
+        assert arrays["total"].sum() == 1000.0
+        # Sin compresión la columna es una vista sobre el archivo mapeado
+        assert not arrays["total"].flags.writeable
+
+    def test_write_arrow_ipc_streams_batches(self, tmp_path, duckdb_conn):
+        from ducklake.utils.arrow_ipc import (
+            load_arrow,
+            load_numpy,
+            load_numpy_chunks,
+            write_arrow_ipc,
+        )
+
+        parquet_path = tmp_path / "data.parquet"
+        duckdb_conn.execute(f"""
+            COPY (SELECT i AS id, i / 2 AS total FROM range(250000) t(i))
+            TO '{parquet_path}' (FORMAT PARQUET, ROW_GROUP_SIZE 100000)
+        """)
+        # Varios row groups, un solo batch: sigue siendo zero-copy
+        ipc_path = write_arrow_ipc(str(parquet_path), str(tmp_path / "data.arrow"))
+        assert load_arrow(ipc_path).column("total").num_chunks == 1
+        ids = load_numpy(ipc_path, ["id"])["id"]
+        assert ids.sum() == sum(range(250000))
+        assert not ids.flags.writeable
+
+        # Más filas que batch_rows: un array por batch, sin copiar
+        ipc_path = write_arrow_ipc(
+            str(parquet_path), str(tmp_path / "small.arrow"), batch_rows=100_000
+        )
+        chunks = load_numpy_chunks(ipc_path, ["total"])["total"]
+        assert [len(c) for c in chunks] == [100000, 100000, 50000]
+        assert not any(c.flags.writeable for c in chunks)
+        assert sum(c.sum() for c in chunks) == sum(range(250000)) * 0.5
+    def test_asof_join_is_point_in_time(self, tmp_data_dir, duckdb_conn):
+        saldos = Path(tmp_data_dir) / "staging" / "finanzas" / "saldos" / "data.parquet"
+        saldos.parent.mkdir(parents=True)
+        duckdb_conn.execute(f"""
+            COPY (
+                SELECT * FROM (VALUES
+                    (1, TIMESTAMP '2024-01-02', 10.0),
+                    (1, TIMESTAMP '2024-01-05', 20.0),
+                    (2, TIMESTAMP '2024-01-01', 5.0)
+                ) t(cliente_id, fecha, saldo)
+            ) TO '{saldos}' (FORMAT PARQUET)
+        """)
+        labels = """
+            SELECT * FROM (VALUES
+                (1, TIMESTAMP '2024-01-01', true),
+                (1, TIMESTAMP '2024-01-05', false),
+                (2, TIMESTAMP '2024-01-03', true)
+            ) t(cliente_id, fecha_label, churn)
+        """
+        consume = ConsumeLayer(tmp_data_dir, duckdb_conn)
+
+        def run(strict):
+            config = {
+                "name": "features",
+                "destination": {"domain": "ml", "table": f"train_{strict}"},
+                "transforms": [
+                    {
+                        "type": "asof_join",
+                        "keys": ["cliente_id"],
+                        "timestamp": "fecha_label",
+                        "strict": strict,
+                        "features": [
+                            {"domain": "finanzas", "table": "saldos", "timestamp": "fecha",
+                             "prefix": "f_"}
+                        ],
+                    }
+                ],
+            }
+            result = consume.process(config, labels)
+            return duckdb_conn.execute(
+                f"SELECT cliente_id, fecha_label, f_saldo FROM read_parquet('{result['path']}') "
+                "ORDER BY ALL"
+            ).fetchall()
+
+        rows = run(False)
+        # Antes del primer saldo no hay feature; nunca se toma un saldo futuro
+        assert [r[2] for r in rows] == [None, 20.0, 5.0]
+        assert [r[2] for r in run(True)] == [None, 10.0, 5.0]
+
+    def test_asof_join_column_collision(self, tmp_data_dir, duckdb_conn):
+        saldos = Path(tmp_data_dir) / "staging" / "finanzas" / "saldos" / "data.parquet"
+        saldos.parent.mkdir(parents=True)
+        duckdb_conn.execute(f"""
+            COPY (SELECT 1 AS cliente_id, TIMESTAMP '2024-01-01' AS fecha, 10.0 AS saldo)
+            TO '{saldos}' (FORMAT PARQUET)
+        """)
+        labels = "SELECT 1 AS cliente_id, TIMESTAMP '2024-01-02' AS fecha, 0.0 AS saldo"
+        consume = ConsumeLayer(tmp_data_dir, duckdb_conn)
+        feature = {"domain": "finanzas", "table": "saldos"}
+        transform = {"type": "asof_join", "keys": ["cliente_id"], "timestamp": "fecha"}
+
+        # Sin prefix "saldo" choca con la del label (DuckDB la renombraría a saldo_1)
+        with pytest.raises(ValueError, match="'saldo' from feature finanzas.saldos collides"):
+            consume._apply_consume_transforms(labels, [{**transform, "features": [feature]}])
+        # Con prefix, la misma tabla dos veces choca con el feature anterior
+        twice = [{**feature, "prefix": "f_"}, {**feature, "prefix": "f_"}]
+        with pytest.raises(ValueError, match="collides with feature finanzas.saldos"):
+            consume._apply_consume_transforms(labels, [{**transform, "features": twice}])
+
+    def test_process_with_llm_export(self, tmp_data_dir, duckdb_conn, sample_parquet):
+        consume = ConsumeLayer(tmp_data_dir, duckdb_conn)
+        staging_query = f"SELECT * FROM read_parquet('{sample_parquet}')"
+        pipeline_config = {
+            "name": "docs",
+            "destination": {
+                "domain": "llm",
+                "table": "clientes",
+                "llm_export": {"template": "{nombre} <{email}>", "id_column": "id"},
+            },
+            "transforms": [],
+        }
+
+        result = consume.process(pipeline_config, staging_query)
+        assert result["llm_export"]["chunks"] == 5
+        shards = Path(tmp_data_dir) / "consume" / "llm" / "clientes" / "shards"
+        assert (shards / "manifest.json").exists()
+
+    def test_incremental_rollup_matches_full(self, tmp_data_dir, duckdb_conn, tmp_path):
+        consume = ConsumeLayer(tmp_data_dir, duckdb_conn)
+        staging = tmp_path / "pedidos.parquet"
+
+        def load(days):
+            duckdb_conn.execute(f"""
+                COPY (
+                    SELECT i % 5 AS tienda, (i * 7) % 100 + 0.5 AS total,
+                           TIMESTAMP '2024-01-01' + INTERVAL (i // 100) DAY AS _ingestion_timestamp
+                    FROM range({days * 100}) t(i)
+                ) TO '{staging}' (FORMAT PARQUET)
+            """)
+
+        aggregate = {
+            "type": "aggregate",
+            "group_by": ["tienda"],
+            "aggregations": [
+                "SUM(total) AS monto", "COUNT(*) AS pedidos", "MAX(total) AS maximo",
+                "AVG(total) AS promedio",
+            ],
+        }
+
+        def run(table, **options):
+            config = {
+                "name": "rollup",
+                "destination": {"domain": "bi", "table": table},
+                "transforms": [{**aggregate, **options}],
+            }
+            result = consume.process(config, f"SELECT * FROM read_parquet('{staging}')")
+            rows = duckdb_conn.execute(
+                f"SELECT * FROM read_parquet('{result['path']}') ORDER BY tienda"
+            ).fetchall()
+            return result, rows
+
+        load(2)
+        first, _ = run("incremental", incremental=True, full_refresh_every=3)
+        assert first["rollup"]["mode"] == "full"
+        load(4)
+        second, incremental = run("incremental", incremental=True, full_refresh_every=3)
+        assert second["rollup"]["mode"] == "incremental"
+        _, full = run("full")
+        assert [(r[0], r[2], r[3]) for r in incremental] == [(r[0], r[2], r[3]) for r in full]
+        assert [(r[1], r[4]) for r in incremental] == pytest.approx([(r[1], r[4]) for r in full])
+
+        load(5)
+        run("incremental", incremental=True, full_refresh_every=3)
+        third, _ = run("incremental", incremental=True, full_refresh_every=3)
+        # Verificación periódica: recalcula todo y no encuentra diferencias
+        assert third["rollup"] == {"mode": "full", "mismatched_groups": 0}
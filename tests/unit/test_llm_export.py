@@ -0,0 +1,104 @@
+"""Tests para el export de documentos LLM en shards JSONL."""
+
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from ducklake.utils.llm_export import _initial_bounds, chunk_text, export_llm_shards
+
+CONFIG = {
+    "template": "{titulo}\n\n{cuerpo}",
+    "id_column": "doc_id",
+    "metadata_columns": ["categoria"],
+    "chunk_size": 40,
+    "shard_rows": 10,
+}
+
+
+@pytest.fixture
+def docs(duckdb_conn):
+    duckdb_conn.execute("""
+        CREATE TABLE docs AS
+        SELECT i AS doc_id, 'Doc ' || i AS titulo,
+               repeat('palabra ', 1 + i % 12) AS cuerpo,
+               CASE WHEN i % 2 = 0 THEN 'a' ELSE 'b' END AS categoria
+        FROM range(35) t(i)
+    """)
+    return duckdb_conn
+
+
+def _read_records(out_dir):
+    records = []
+    for path in sorted(Path(out_dir).glob("shard-*.jsonl.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            records += [json.loads(line) for line in f]
+    return records
+
+
+class TestChunkText:
+    def test_short_text_single_chunk(self):
+        assert chunk_text("hola mundo", 100) == ["hola mundo"]
+
+    def test_respects_budget_and_words(self):
+        chunks = chunk_text("uno dos tres cuatro cinco seis siete", 12)
+        assert all(len(c) <= 12 for c in chunks)
+        assert " ".join(chunks).split() == "uno dos tres cuatro cinco seis siete".split()
+
+
+class TestExportLlmShards:
+    def test_writes_shards_and_manifest(self, docs, tmp_path):
+        result = export_llm_shards(docs, "docs", str(tmp_path), CONFIG)
+
+        assert result["shards"] == 4
+        records = _read_records(tmp_path)
+        assert {r["doc_id"] for r in records} == set(range(35))
+        assert all(len(r["text"]) <= 40 for r in records)
+        assert records[0]["metadata"] == {"categoria": "a"}
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        assert sum(s["rows"] for s in manifest["shards"]) == 35
+        assert sorted(p.name for p in tmp_path.iterdir() if not p.name.startswith("shard-")) == [
+            "manifest.json"
+        ]
+
+    def test_only_changed_shards_rewritten(self, docs, tmp_path):
+        export_llm_shards(docs, "docs", str(tmp_path), CONFIG)
+        docs.execute("UPDATE docs SET titulo = 'Cambiado' WHERE doc_id = 12")
+
+        result = export_llm_shards(docs, "docs", str(tmp_path), CONFIG)
+        assert result["rewritten"] == 1
+        titles = {r["doc_id"]: r["text"] for r in _read_records(tmp_path) if r["chunk"] == 0}
+        assert titles[12].startswith("Cambiado")
+
+        assert export_llm_shards(docs, "docs", str(tmp_path), CONFIG)["rewritten"] == 0
+
+    def test_null_ids_go_to_first_shard(self, docs, tmp_path):
+        docs.execute("INSERT INTO docs VALUES (NULL, 'Sin id', 'texto', 'a')")
+        result = export_llm_shards(docs, "docs", str(tmp_path), CONFIG)
+
+        assert result["shards"] == 4
+        records = _read_records(tmp_path)
+        assert sum(r["doc_id"] is None for r in records) == 1
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        assert sum(s["rows"] for s in manifest["shards"]) == 36
+
+    def test_repeated_ids_share_a_shard(self, docs, tmp_path):
+        # 25 filas con doc_id 0: los cortes en las filas 10 y 20 caen en el mismo id
+        docs.execute("UPDATE docs SET doc_id = doc_id // 25")
+        assert _initial_bounds(docs, "docs", '"doc_id"', 10) == [None, 0, 1]
+        result = export_llm_shards(docs, "docs", str(tmp_path), CONFIG)
+
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        files = [s["file"] for s in manifest["shards"]]
+        assert len(files) == len(set(files)) == result["shards"]
+        assert sum(r["chunk"] == 0 for r in _read_records(tmp_path)) == 35
+        assert sum(s["rows"] for s in manifest["shards"]) == 35
+
+    def test_template_change_rewrites_all(self, docs, tmp_path):
+        export_llm_shards(docs, "docs", str(tmp_path), CONFIG)
+        result = export_llm_shards(
+            docs, "docs", str(tmp_path), {**CONFIG, "template": "# {titulo}\n{cuerpo}"}
+        )
+        assert result["rewritten"] == result["shards"]
+        assert len(list(tmp_path.glob("shard-*"))) == result["shards"]
@@ -0,0 +1,173 @@
+"""Tests para el orquestador de pipelines."""
+
+from pathlib import Path
+
+import duckdb
+import pytest
+import yaml
+
+from ducklake.core.orchestrator import Orchestrator
+from ducklake.layers.raw import RawLayer
+
+
+@pytest.fixture
+def lake(tmp_path):
+    """Proyecto con una tabla RAW de clientes (3 archivos) y un pipeline a STAGING."""
+    config_dir = tmp_path / "config"
+    data_dir = tmp_path / "data"
+    config_dir.mkdir()
+    raw = RawLayer(str(data_dir))
+    conn = duckdb.connect()
+    for day in range(3):
+        extracted = tmp_path / f"extract_{day}.parquet"
+        conn.execute(f"""
+            COPY (
+                SELECT i AS cli_id, i % 7 AS segmento,
+                       TIMESTAMP '2024-01-01' + INTERVAL ({day}) DAY AS _ingestion_timestamp
+                FROM range(2000) t(i)
+            ) TO '{extracted}' (FORMAT PARQUET)
+        """)
+        parts = tmp_path / f"parts_{day}"
+        parts.mkdir()
+        extracted.rename(parts / "part-0000.parquet")
+        raw.write(str(parts), {"source": "erp", "table": "clientes"})
+    conn.close()
+
+    pipelines = {
+        "pipelines": [
+            {
+                "name": "clientes_staging",
+                "source": {"layer": "raw", "domain": "erp", "table": "clientes"},
+                "destination": {"layer": "staging", "domain": "ventas", "table": "clientes"},
+                "transforms": [
+                    {"type": "rename", "columns": {"cli_id": "cliente_id"}},
+                    {"type": "deduplicate", "keys": ["cliente_id"]},
+                ],
+            }
+        ]
+    }
+    (config_dir / "pipelines.yaml").write_text(yaml.safe_dump(pipelines))
+    orch = Orchestrator(str(config_dir), str(data_dir))
+    yield orch, data_dir
+    orch.close()
+
+
+class TestSampleRun:
+    def test_sample_is_deterministic_and_goes_to_scratch(self, lake):
+        orch, data_dir = lake
+        first = orch.run_pipeline("clientes_staging", sample=10)
+        second = orch.run_pipeline("clientes_staging", sample=10)
+
+        assert first["status"] == "success"
+        assert "_scratch/staging/ventas/clientes" in first["path"]
+        assert not (data_dir / "staging" / "ventas" / "clientes").exists()
+        assert 100 < first["rows"] < 300
+        conn = duckdb.connect()
+        read = "SELECT * FROM read_parquet('{}') ORDER BY cliente_id"
+        assert (
+            conn.execute(read.format(first["path"])).fetchall()
+            == conn.execute(read.format(second["path"])).fetchall()
+        )
+        # Las muestras no se registran en el catálogo
+        assert orch.catalog.conn.execute("SELECT COUNT(*) FROM pipeline_runs").fetchone()[0] == 0
+
+    def test_sample_keeps_whole_keys(self, lake):
+        orch, _ = lake
+        query = orch._sample_query(
+            orch.raw.read({"domain": "erp", "table": "clientes"}),
+            orch._get_pipeline_config("clientes_staging").model_dump(),
+            10,
+        )
+        counts = {r[0] for r in orch.conn.execute(
+            f"SELECT COUNT(*) FROM ({query}) GROUP BY cli_id"
+        ).fetchall()}
+        # Cada cliente muestreado trae sus 3 versiones
+        assert counts == {3}
+
+    def test_sample_below_one_hundredth_of_a_percent(self, lake):
+        orch, _ = lake
+        p_dict = orch._get_pipeline_config("clientes_staging").model_dump()
+        rows = "SELECT i AS cli_id FROM range(1000000) t(i)"
+        count = orch.conn.execute(
+            f"SELECT COUNT(*) FROM ({orch._sample_query(rows, p_dict, 0.005)})"
+        ).fetchone()[0]
+        # 0.005% de un millón ≈ 50 (con int(sample * 100) daba 0)
+        assert 20 < count < 100
+        with pytest.raises(ValueError, match="resolution"):
+            orch._sample_query(rows, p_dict, 0.00001)
+
+    def test_limit_files(self, lake):
+        orch, _ = lake
+        result = orch.run_pipeline("clientes_staging", limit_files=1)
+        assert result["status"] == "success"
+        assert result["rows"] == 2000
+        assert Path(result["path"]).exists()
+
+
+class TestVersions:
+    def test_versions_recorded_and_collected(self, lake):
+        orch, data_dir = lake
+        orch.config.settings.snapshot_retention_hours = 0
+        first = orch.run_pipeline("clientes_staging")
+        second = orch.run_pipeline("clientes_staging")
+
+        versions = orch.catalog.get_table_versions("staging", "ventas/clientes")
+        assert [v["version"] for v in versions] == [second["version"], first["version"]]
+        assert [v["status"] for v in versions] == ["current", "deleted"]
+        table_dir = data_dir / "staging" / "ventas" / "clientes"
+        assert sorted(p.name for p in (table_dir / "versions").iterdir()) == [second["version"]]
+        assert (table_dir / "CURRENT").read_text() == second["version"]
+
+
+class TestProfileData:
+    def test_profile_is_stored_and_compared(self, lake):
+        orch, _ = lake
+        first = orch.profile_data("raw", "erp/clientes")
+        assert first["previous"] is None
+        assert first["profile"]["rows"] == 6000
+
+        second = orch.profile_data("raw", "erp/clientes", exact=True)
+        assert second["previous"]["rows"] == 6000
+        assert second["previous"]["columns"] == first["profile"]["columns"]
+        cols = {c["column"]: c for c in second["profile"]["columns"]}
+        assert cols["cli_id"]["distinct"] == 2000
+        assert not any(c.startswith("rows") for c in second["changes"])
+
+    def test_invalid_table_ref(self, lake):
+        orch, _ = lake
+        with pytest.raises(ValueError):
+            orch.profile_data("staging", "clientes")
+
+
+class TestResources:
+    def test_pipeline_connection_does_not_touch_shared(self, lake):
+        orch, _ = lake
+        shared_threads = orch.conn.execute("SELECT current_setting('threads')").fetchone()[0]
+        conn = orch._pipeline_connection({"threads": 1, "memory_limit": "256MB"})
+        try:
+            assert conn.execute("SELECT current_setting('threads')").fetchone()[0] == 1
+        finally:
+            conn.close()
+        assert orch.conn.execute("SELECT current_setting('threads')").fetchone()[0] == shared_threads
+
+    def test_isolated_run_and_resources(self, lake):
+        orch, data_dir = lake
+        result = orch.run_pipeline("clientes_staging", isolated=True)
+        assert result["status"] == "success"
+        assert orch.pipeline_resources("clientes_staging") == {
+            "memory": 4 * 1000**3,
+            "threads": orch.config.settings.duckdb_threads,
+        }
+        assert orch.run_all()["clientes_staging"]["status"] == "success"
+
+    def test_process_backend_replays_catalog(self, lake):
+        orch, data_dir = lake
+        results = orch.run_all(max_parallel=2, backend="process")
+        result = results["clientes_staging"]
+        assert result["status"] == "success"
+        assert result["rows"] == 2000
+        runs = orch.catalog.get_recent_pipeline_runs()
+        assert [(r["pipeline"], r["rows"]) for r in runs] == [("clientes_staging", 2000)]
+        versions = orch.catalog.get_table_versions("staging", "ventas/clientes")
+        assert [v["version"] for v in versions] == [result["version"]]
+        assert (data_dir / "staging" / "ventas" / "clientes" / "CURRENT").read_text() == result["version"]
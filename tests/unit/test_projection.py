@@ -0,0 +1,73 @@
+"""Tests para el análisis de columnas requeridas (projection pushdown)."""
+
+import duckdb
+import pytest
+
+from ducklake.core.projection import project_columns, required_columns, sql_column_refs
+
+
+@pytest.fixture
+def conn():
+    c = duckdb.connect()
+    yield c
+    c.close()
+
+
+class TestSqlColumnRefs:
+    def test_collects_columns(self, conn):
+        refs = sql_column_refs(
+            conn, "SELECT t.estado, SUM(total) AS s FROM x AS t WHERE fecha > '2024-01-01' GROUP BY 1"
+        )
+        assert refs == {"t", "estado", "total", "fecha"}
+
+    def test_struct_field_keeps_struct_column(self, conn):
+        sql = "SELECT s.city AS city, id FROM __input__"
+        refs = sql_column_refs(conn, sql)
+        assert {"s", "city", "id"} <= refs
+        assert project_columns(["id", "s", "other"], refs) == ["id", "s"]
+        needed = required_columns(conn, [{"type": "custom_sql", "sql": sql}])
+        assert project_columns(["id", "s", "other"], needed) == ["id", "s"]
+
+    def test_star_needs_everything(self, conn):
+        assert sql_column_refs(conn, "SELECT * FROM x") is None
+
+    def test_unparseable_needs_everything(self, conn):
+        assert sql_column_refs(conn, "SELEC broken") is None
+
+
+class TestRequiredColumns:
+    def test_select_through_rename_and_dedup(self, conn):
+        transforms = [
+            {"type": "rename", "columns": {"cli_id": "cliente_id"}},
+            {"type": "cast", "columns": {"fecha_alta": "DATE"}},
+            {"type": "filter", "condition": "estado != 'DELETED'"},
+            {"type": "deduplicate", "keys": ["cliente_id"]},
+        ]
+        needed = required_columns(conn, transforms, select=["cliente_id", "nombre"])
+        assert needed == {
+            "cli_id", "nombre", "fecha_alta", "estado", "_ingestion_timestamp"
+        }
+
+    def test_custom_sql_defines_inputs(self, conn):
+        transforms = [
+            {"type": "custom_sql", "sql": "SELECT estado, SUM(total) AS t FROM __INPUT__ GROUP BY 1"}
+        ]
+        assert required_columns(conn, transforms) == {"estado", "total"}
+
+    def test_asof_join_without_timestamp(self, conn):
+        transforms = [{"type": "asof_join", "keys": ["cliente_id"]}]
+        with pytest.raises(ValueError, match="timestamp"):
+            required_columns(conn, transforms, select=["cliente_id"])
+
+    def test_without_select_reads_all(self, conn):
+        assert required_columns(conn, [{"type": "filter", "condition": "total > 1"}]) is None
+
+
+class TestProjectColumns:
+    def test_keeps_schema_order(self):
+        assert project_columns(["a", "B", "c"], {"c", "b"}) == ["B", "c"]
+
+    def test_all_or_none_reads_everything(self):
+        assert project_columns(["a", "b"], {"a", "b"}) is None
+        assert project_columns(["a", "b"], {"z"}) is None
+        assert project_columns(["a", "b"], None) is None
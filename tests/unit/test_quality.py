@@ -0,0 +1,67 @@
+"""Tests para los quality checks."""
+
+import duckdb
+import pytest
+
+from ducklake.core.quality import QualityChecker
+
+
+@pytest.fixture
+def checker():
+    conn = duckdb.connect()
+    conn.execute("CREATE TABLE unicos AS SELECT i AS id, i % 50 AS grupo FROM range(100000) t(i)")
+    conn.execute("CREATE TABLE repetidos AS SELECT i % 60000 AS id FROM range(100000) t(i)")
+    yield QualityChecker(conn)
+    conn.close()
+
+
+class TestApproximateChecks:
+    def test_unique_confirmed_exactly(self, checker):
+        # La estimación no prueba unicidad: se confirma con el check exacto
+        [result] = checker.run_checks("unicos", [{"type": "unique", "columns": ["id"], "approximate": True}])
+        assert result["passed"]
+        assert result["details"] == "OK"
+
+    def test_unique_fails_on_estimate(self, checker):
+        [result] = checker.run_checks(
+            "repetidos", [{"type": "unique", "columns": ["id"], "approximate": True}]
+        )
+        assert not result["passed"]
+        assert "approx" in result["details"]
+
+    def test_unique_few_duplicates_within_max_error(self, checker):
+        # 3% de duplicados: dentro del max_error de la estimación, el exacto los encuentra
+        checker.conn.execute(
+            "CREATE TABLE pocos AS SELECT CASE WHEN i < 6000 THEN i // 2 ELSE i END AS id "
+            "FROM range(100000) t(i)"
+        )
+        [result] = checker.run_checks(
+            "pocos", [{"type": "unique", "columns": ["id"], "approximate": True, "max_error": 0.05}]
+        )
+        assert not result["passed"]
+        assert result["details"] == "3000 duplicates on (id)"
+
+    def test_unique_exact_by_hash_buckets(self, checker):
+        checker.conn.execute(
+            "CREATE TABLE pocos AS SELECT CASE WHEN i < 60 THEN i // 2 ELSE i END AS id "
+            "FROM range(100000) t(i)"
+        )
+        check = {"type": "unique", "columns": ["id"], "approximate": True, "bucket_keys": 30000}
+        [ok, dup] = [checker.run_checks(t, [check])[0] for t in ("unicos", "pocos")]
+        # ~100k claves en buckets de 30k: 4 queries, ninguna con todas las claves
+        assert ok["passed"]
+        assert ok["details"] == "OK (exact in 4 hash buckets)"
+        assert not dup["passed"]
+        assert dup["details"] == "30 duplicates on (id) (exact in 4 hash buckets)"
+
+    def test_distinct_count(self, checker):
+        results = checker.run_checks("unicos", [
+            {"type": "distinct_count", "column": "grupo", "min_value": 10, "max_value": 100,
+             "approximate": True},
+            {"type": "distinct_count", "column": "grupo", "min_value": 50, "approximate": True},
+            {"type": "distinct_count", "column": "grupo", "max_value": 49},
+        ])
+        assert [r["passed"] for r in results] == [True, True, False]
+        assert "approx" in results[0]["details"]
+        # En el límite la estimación no alcanza y se cuenta exacto
+        assert results[1]["details"] == "OK"
@@ -0,0 +1,199 @@
+"""Tests para el scheduler y las expresiones cron."""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+import yaml
+
+from ducklake.core.orchestrator import Orchestrator
+from ducklake.core.scheduler import Scheduler
+from ducklake.utils.cron import CronSchedule
+
+
+class TestCronSchedule:
+    def test_next_after(self):
+        cron = CronSchedule("*/15 9-17 * * mon-fri")
+        # Sábado al mediodía -> lunes 09:00
+        assert cron.next_after(datetime(2026, 10, 17, 12, 0)) == datetime(2026, 10, 19, 9, 0)
+        assert cron.next_after(datetime(2026, 10, 19, 9, 0)) == datetime(2026, 10, 19, 9, 15)
+        assert cron.next_after(datetime(2026, 10, 19, 17, 45)) == datetime(2026, 10, 20, 9, 0)
+
+    def test_aliases_and_between(self):
+        cron = CronSchedule("@daily")
+        times = cron.between(datetime(2026, 1, 1, 0, 0), datetime(2026, 1, 4, 0, 0))
+        assert times == [datetime(2026, 1, d) for d in (2, 3, 4)]
+
+    def test_day_of_month_or_weekday(self):
+        # Con ambos restringidos alcanza con cualquiera (1ro del mes o domingo)
+        cron = CronSchedule("0 0 1 * sun")
+        assert cron.matches(datetime(2026, 10, 1))
+        assert cron.matches(datetime(2026, 10, 18))
+        assert not cron.matches(datetime(2026, 10, 19))
+        assert CronSchedule("0 0 * * 7").matches(datetime(2026, 10, 18))
+
+    @pytest.mark.parametrize("expression", ["* * * *", "61 * * * *", "* * * foo *", "5-1 * * * *"])
+    def test_invalid(self, expression):
+        with pytest.raises(ValueError):
+            CronSchedule(expression)
+
+    def test_never_matches(self):
+        with pytest.raises(ValueError, match="never matches"):
+            CronSchedule("0 0 31 2 *").next_after(datetime(2026, 1, 1))
+
+
+class FakeClock:
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+@pytest.fixture
+def orch(tmp_path):
+    """Una fuente y un pipeline que la lee de RAW, ambos con schedule."""
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    sources = {
+        "sources": [
+            {
+                "name": "ventas",
+                "type": "csv",
+                "path": str(tmp_path / "ventas.csv"),
+                "extract": {"schedule": "*/5 * * * *"},
+            },
+            {"name": "sin_schedule", "type": "csv", "path": str(tmp_path / "otro.csv")},
+        ]
+    }
+    pipelines = {
+        "pipelines": [
+            {
+                "name": "ventas_staging",
+                "source": {"layer": "raw", "domain": "ventas", "table": "ventas"},
+                "destination": {"layer": "staging", "domain": "ventas", "table": "ventas"},
+                "schedule": "*/10 * * * *",
+            }
+        ]
+    }
+    (config_dir / "sources.yaml").write_text(yaml.safe_dump(sources))
+    (config_dir / "pipelines.yaml").write_text(yaml.safe_dump(pipelines))
+    orch = Orchestrator(str(config_dir), str(tmp_path / "data"))
+    yield orch
+    orch.close()
+
+
+def _statuses(orch):
+    return sorted(
+        (r["job"], r["scheduled_at"].strftime("%H:%M"), r["status"])
+        for r in orch.catalog.get_schedule_runs(limit=100)
+    )
+
+
+class TestScheduler:
+    def test_jobs_and_locks(self, orch):
+        sched = Scheduler(orch, clock=FakeClock(datetime(2026, 10, 19, 12, 1)))
+        try:
+            jobs = {j.key: j for j in sched.jobs}
+            assert set(jobs) == {"extract:ventas", "pipeline:ventas_staging"}
+            assert jobs["pipeline:ventas_staging"].locks == {
+                "pipeline:ventas_staging",
+                "source:ventas",
+            }
+            assert jobs["extract:ventas"].next_at == datetime(2026, 10, 19, 12, 5)
+        finally:
+            sched.close()
+
+    def test_no_overlap_on_same_source(self, orch, monkeypatch):
+        release = threading.Event()
+        calls = []
+
+        def run_extraction(name):
+            calls.append(name)
+            release.wait(5)
+            return {"ventas": {"status": "success", "rows": 1}}
+
+        def run_pipeline(name, isolated=False):
+            calls.append(name)
+            return {"status": "success"}
+
+        monkeypatch.setattr(orch, "run_extraction", run_extraction)
+        monkeypatch.setattr(orch, "run_pipeline", run_pipeline)
+        clock = FakeClock(datetime(2026, 10, 19, 11, 59))
+        sched = Scheduler(orch, max_workers=4, clock=clock)
+        try:
+            # 12:00: la extracción y el pipeline comparten la fuente -> corre solo uno
+            clock.now = datetime(2026, 10, 19, 12, 0)
+            assert sched.tick() == ["extract:ventas"]
+            clock.now = datetime(2026, 10, 19, 12, 5)
+            assert sched.tick() == []
+            release.set()
+            sched.wait()
+            clock.now = datetime(2026, 10, 19, 12, 10)
+            assert sorted(sched.tick()) == ["extract:ventas"]
+            sched.wait()
+            assert sched.tick(datetime(2026, 10, 19, 12, 10)) == []
+        finally:
+            sched.close()
+
+        assert calls == ["ventas", "ventas"]
+        assert _statuses(orch) == [
+            ("ventas", "12:00", "success"),
+            ("ventas", "12:05", "skipped"),
+            ("ventas", "12:10", "success"),
+            ("ventas_staging", "12:00", "skipped"),
+            ("ventas_staging", "12:10", "skipped"),
+        ]
+
+    def test_late_start_with_bounded_pool(self, orch, monkeypatch):
+        clock = FakeClock(datetime(2026, 10, 19, 11, 59))
+
+        def run_extraction(name):
+            clock.now += timedelta(minutes=2)  # Ocupa el único worker
+            return {"ventas": {"status": "error", "error": "boom"}}
+
+        monkeypatch.setattr(orch, "run_extraction", run_extraction)
+        monkeypatch.setattr(orch, "run_pipeline", lambda name, isolated=False: {"status": "success"})
+        orch.config.pipelines[0].source.layer = "staging"  # Sin fuente en común
+        sched = Scheduler(orch, max_workers=1, grace_seconds=30, clock=clock)
+        try:
+            clock.now = datetime(2026, 10, 19, 12, 0)
+            assert sched.tick() == ["extract:ventas", "pipeline:ventas_staging"]
+            sched.wait()
+        finally:
+            sched.close()
+
+        runs = {r["job"]: r for r in orch.catalog.get_schedule_runs()}
+        extraction, pipeline = runs["ventas"], runs["ventas_staging"]
+        assert (extraction["status"], extraction["late"], extraction["error"]) == (
+            "error",
+            False,
+            "ventas: boom",
+        )
+        assert (pipeline["status"], pipeline["late"], pipeline["delay"]) == ("success", True, 120)
+
+    def test_missed_runs_are_recorded(self, orch, monkeypatch):
+        monkeypatch.setattr(orch, "run_extraction", lambda name: {})
+        monkeypatch.setattr(orch, "run_pipeline", lambda name, isolated=False: {"status": "success"})
+        clock = FakeClock(datetime(2026, 10, 19, 12, 0, 30))
+        sched = Scheduler(orch, clock=clock)
+        clock.now = datetime(2026, 10, 19, 12, 10)
+        sched.tick()
+        sched.close()
+
+        # Apagado hasta las 12:32: 12:15, 12:20, 12:25 y 12:30 perdidos
+        Scheduler(orch, clock=FakeClock(datetime(2026, 10, 19, 12, 32))).close()
+        statuses = _statuses(orch)
+        assert [s for s in statuses if s[0] == "ventas"] == [
+            ("ventas", "12:05", "missed"),  # Dos horarios en un tick: corre el último
+            ("ventas", "12:10", "success"),
+            ("ventas", "12:15", "missed"),
+            ("ventas", "12:20", "missed"),
+            ("ventas", "12:25", "missed"),
+            ("ventas", "12:30", "missed"),
+        ]
+
+    def test_invalid_schedule(self, orch):
+        orch.config.pipelines[0].schedule = "every hour"
+        with pytest.raises(ValueError, match="ventas_staging"):
+            Scheduler(orch)
@@ -0,0 +1,99 @@
+"""Tests para el servidor de consultas sobre CONSUME."""
+
+import io
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+import pytest
+
+from ducklake.core.server import QueryError, QueryService, make_handler
+
+
+@pytest.fixture
+def service(tmp_data_dir):
+    path = Path(tmp_data_dir) / "consume" / "bi" / "ventas" / "data.parquet"
+    path.parent.mkdir(parents=True)
+    pq.write_table(pa.table({"estado": ["A", "B", "A"], "total": [1.0, 2.0, 3.0]}), path)
+    svc = QueryService(tmp_data_dir)
+    yield svc
+    svc.close()
+
+
+def _body(chunks):
+    return b"".join(chunks)
+
+
+class TestQueryService:
+    def test_parameterized_query_and_cache(self, service):
+        sql = "SELECT estado, SUM(total) AS t FROM consume_bi.ventas WHERE total > ? GROUP BY 1 ORDER BY 1"
+        chunks, hit = service.execute(sql, [0], "json")
+        assert not hit
+        assert json.loads(_body(chunks)) == [{"estado": "A", "t": 4.0}, {"estado": "B", "t": 2.0}]
+
+        chunks, hit = service.execute(sql, [0], "json")
+        assert hit
+        assert json.loads(_body(chunks))[0]["t"] == 4.0
+
+    def test_cache_invalidated_on_write(self, service, tmp_data_dir):
+        sql = "SELECT COUNT(*) AS n FROM consume_bi.ventas"
+        _body(service.execute(sql, fmt="json")[0])
+        pq.write_table(
+            pa.table({"estado": ["A"], "total": [9.0]}),
+            f"{tmp_data_dir}/consume/bi/ventas/data.parquet",
+        )
+        chunks, hit = service.execute(sql, fmt="json")
+        assert not hit
+        assert json.loads(_body(chunks)) == [{"n": 1}]
+
+    def test_arrow_and_parquet_formats(self, service):
+        arrow = _body(service.execute("SELECT * FROM consume_bi.ventas", fmt="arrow")[0])
+        assert ipc.open_stream(arrow).read_all().num_rows == 3
+        parquet = _body(service.execute("SELECT * FROM consume_bi.ventas", fmt="parquet")[0])
+        assert pq.read_table(io.BytesIO(parquet)).column_names == ["estado", "total"]
+
+    def test_table_query_filters(self, service):
+        sql, params = service.table_query("consume", "bi", "ventas", {"estado": "A"}, ["total"])
+        rows = json.loads(_body(service.execute(sql, params, "json")[0]))
+        assert rows == [{"total": 1.0}, {"total": 3.0}]
+        with pytest.raises(KeyError):
+            service.table_query("consume", "bi", "missing")
+
+    def test_only_reads_allowed(self, service):
+        with pytest.raises(QueryError):
+            service.execute("COPY (SELECT 1) TO 'out.csv'")
+        with pytest.raises(QueryError):
+            service.execute("SELECT * FROM read_csv('/etc/passwd')")
+
+
+class TestHTTPHandler:
+    def test_query_endpoint(self, service):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(service))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            request = urllib.request.Request(
+                f"{base}/query",
+                data=json.dumps({"sql": "SELECT * FROM consume_bi.ventas"}).encode(),
+                method="POST",
+            )
+            with urllib.request.urlopen(request) as response:
+                assert response.headers["Content-Type"] == "application/vnd.apache.arrow.stream"
+                assert ipc.open_stream(response.read()).read_all().num_rows == 3
+
+            with urllib.request.urlopen(f"{base}/tables") as response:
+                assert json.loads(response.read())[0]["name"] == "consume_bi.ventas"
+
+            with pytest.raises(urllib.error.HTTPError) as err:
+                urllib.request.urlopen(f"{base}/tables/consume/bi/nope")
+            assert err.value.code == 404
+        finally:
+            server.shutdown()
+            server.server_close()
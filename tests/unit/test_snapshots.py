@@ -0,0 +1,49 @@
+"""Tests para las versiones de tablas con puntero atómico."""
+
+import os
+import time
+
+from ducklake.core import snapshots
+from ducklake.layers.staging import StagingLayer
+
+
+def _write(staging, conn, n):
+    return staging.write(
+        conn.sql(f"SELECT i AS id FROM range({n}) t(i)"), {"domain": "ventas", "table": "t"}
+    )
+
+
+class TestSnapshots:
+    def test_reader_keeps_resolved_version(self, tmp_data_dir, duckdb_conn):
+        staging = StagingLayer(tmp_data_dir, duckdb_conn)
+        _write(staging, duckdb_conn, 10)
+        query = staging.read({"domain": "ventas", "table": "t"})
+
+        # Se publica otra versión mientras un lector usa la query resuelta
+        _write(staging, duckdb_conn, 20)
+        assert duckdb_conn.execute(f"SELECT COUNT(*) FROM ({query})").fetchone()[0] == 10
+        fresh = staging.read({"domain": "ventas", "table": "t"})
+        assert duckdb_conn.execute(f"SELECT COUNT(*) FROM ({fresh})").fetchone()[0] == 20
+
+    def test_legacy_layout_without_pointer(self, tmp_data_dir, duckdb_conn):
+        table_dir = StagingLayer(tmp_data_dir).table_dir({"domain": "ventas", "table": "old"})
+        table_dir.mkdir(parents=True)
+        duckdb_conn.execute(f"COPY (SELECT 1 AS id) TO '{table_dir / 'data.parquet'}'")
+        assert snapshots.current_version(table_dir) is None
+        assert snapshots.current_file(table_dir) == table_dir / "data.parquet"
+
+    def test_collect_garbage_respects_retention(self, tmp_data_dir, duckdb_conn):
+        staging = StagingLayer(tmp_data_dir, duckdb_conn)
+        table_dir = staging.table_dir({"domain": "ventas", "table": "t"})
+        for n in (1, 2, 3):
+            _write(staging, duckdb_conn, n)
+        old, middle, current = snapshots.list_versions(table_dir)
+
+        assert snapshots.collect_garbage(table_dir, 3600) == []
+        # La primera fue reemplazada hace dos horas; la segunda recién
+        two_hours_ago = time.time() - 7200
+        os.utime(table_dir / "versions" / middle, (two_hours_ago, two_hours_ago))
+        assert snapshots.collect_garbage(table_dir, 3600) == [old]
+        assert snapshots.collect_garbage(table_dir, 0) == [middle]
+        assert snapshots.list_versions(table_dir) == [current]
+        assert snapshots.current_version(table_dir) == current
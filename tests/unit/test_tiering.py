@@ -0,0 +1,96 @@
+"""Tests para la retención y el cold tier de RAW."""
+
+from datetime import date
+
+import duckdb
+import pytest
+
+from ducklake.core.base import partition_date
+from ducklake.core.catalog import Catalog
+from ducklake.core.config import RawRetentionConfig
+from ducklake.core.tiering import run_tiering
+from ducklake.layers.raw import RawLayer
+
+
+@pytest.fixture
+def raw_lake(tmp_path):
+    """RAW con tres días de pedidos (dos archivos part por día) y su catálogo."""
+    data_dir = tmp_path / "data"
+    conn = duckdb.connect()
+    for day in (date(2024, 1, 1), date(2024, 3, 1), date(2024, 4, 5)):
+        partition = data_dir / "raw" / "erp" / "pedidos" / f"year={day.year}/month={day.month:02d}/day={day.day:02d}"
+        partition.mkdir(parents=True)
+        for part in range(2):
+            conn.execute(f"""
+                COPY (SELECT i AS pedido_id, DATE '{day}' AS fecha FROM range({part * 100}, {part * 100 + 100}) t(i))
+                TO '{partition}/part-000000-{part:04d}.parquet' (FORMAT PARQUET)
+            """)
+    raw = RawLayer(str(data_dir), conn)
+    catalog = Catalog(str(data_dir / "catalog.duckdb"))
+    yield raw, catalog, tmp_path
+    catalog.close()
+    conn.close()
+
+
+class TestTiering:
+    def test_partition_date(self):
+        assert partition_date("year=2024/month=03/day=07") == date(2024, 3, 7)
+        assert partition_date("year=2024/month=03/day=07/hour=10") == date(2024, 3, 7)
+        assert partition_date("misc") is None
+
+    def test_recompress_move_and_delete(self, raw_lake):
+        raw, catalog, tmp_path = raw_lake
+        policy = RawRetentionConfig(
+            recompress_after_days=30, delete_after_days=90, cold_path=str(tmp_path / "cold")
+        )
+        today = date(2024, 4, 10)
+
+        plan = run_tiering(raw, catalog, policy, today=today, dry_run=True)
+        assert [(a["partition"], a["action"]) for a in plan] == [
+            ("year=2024/month=01/day=01", "delete"),
+            ("year=2024/month=03/day=01", "recompress"),
+        ]
+        assert catalog.get_raw_partitions("erp", "pedidos") == {}
+
+        run_tiering(raw, catalog, policy, today=today)
+        table_dir = tmp_path / "data" / "raw" / "erp" / "pedidos"
+        assert not (table_dir / "year=2024" / "month=01").exists()
+        assert not (table_dir / "year=2024" / "month=03").exists()
+        cold = tmp_path / "cold" / "raw" / "erp" / "pedidos" / "year=2024/month=03/day=01"
+        assert [f.name for f in cold.iterdir()] == ["data.parquet"]
+        compression = raw.conn.execute(
+            f"SELECT DISTINCT compression FROM parquet_metadata('{cold}/data.parquet')"
+        ).fetchall()
+        assert compression == [("ZSTD",)]
+
+        # Los lectores siguen a las particiones movidas vía el catálogo
+        state = catalog.get_raw_partitions("erp", "pedidos")
+        locations = [info["location"] for info in state.values()]
+        assert locations == [str(cold)]
+        query = raw.read({"domain": "erp", "table": "pedidos", "locations": locations})
+        rows = raw.conn.execute(f"SELECT fecha, COUNT(*) FROM ({query}) GROUP BY ALL ORDER BY 1").fetchall()
+        assert rows == [(date(2024, 3, 1), 200), (date(2024, 4, 5), 200)]
+
+        # Idempotente: la segunda corrida no tiene nada para hacer
+        assert run_tiering(raw, catalog, policy, today=today) == []
+        actions = catalog.conn.execute(
+            "SELECT action, files, bytes_after FROM raw_tiering ORDER BY id"
+        ).fetchall()
+        assert [(a[0], a[1]) for a in actions] == [("delete", 2), ("recompress", 2)]
+        assert actions[1][2] > 0
+
+    def test_cold_tier_configured_later_moves_partition(self, raw_lake):
+        raw, catalog, tmp_path = raw_lake
+        today = date(2024, 4, 10)
+        run_tiering(raw, catalog, RawRetentionConfig(recompress_after_days=30), today=today)
+        hot = tmp_path / "data" / "raw" / "erp" / "pedidos" / "year=2024/month=03/day=01"
+        assert [f.name for f in hot.iterdir()] == ["data.parquet"]
+
+        policy = RawRetentionConfig(recompress_after_days=30, cold_path=str(tmp_path / "cold"))
+        actions = run_tiering(raw, catalog, policy, today=today)
+        assert [(a["partition"], a["action"]) for a in actions] == [
+            ("year=2024/month=01/day=01", "move"),
+            ("year=2024/month=03/day=01", "move"),
+        ]
+        assert not hot.exists()
+        assert all(info["action"] == "move" for info in catalog.get_raw_partitions("erp", "pedidos").values())
@@ -9,8 +9,15 @@ from ducklake.transformations.cleaning import (
     build_filter_sql,
     build_rename_sql,
 )
+from ducklake.transformations.enrichment import (
+    build_hash_key_sql,
+    build_key_collision_sql,
+    md5_key_expr,
+)
 from ducklake.transformations.validation import (
+    compare_profiles,
     get_column_stats,
+    profile_table,
     validate_not_null,
     validate_unique,
 )
@@ -52,6 +59,35 @@ class TestCleaningSQL:
         assert len(result) == 4  # id=2 deduplicado
 
 
+class TestHashKeys:
+    def test_key_types_share_md5(self, conn_with_data):
+        keys = {
+            key_type: conn_with_data.execute(
+                f"SELECT k FROM ({build_hash_key_sql(['id', 'nombre'], 'k', 'test_data', key_type)})"
+                " ORDER BY id LIMIT 1"
+            ).fetchone()[0]
+            for key_type in ("md5", "int64", "int128")
+        }
+        assert len(keys["md5"]) == 32
+        assert keys["int64"] == int(keys["md5"][:16], 16)
+        assert keys["int128"].hex == keys["md5"]
+
+    def test_convert_md5_keys(self, conn_with_data):
+        md5 = "'d0726241020676b14aa6298ce6a18b21'"
+        assert conn_with_data.execute(f"SELECT {md5_key_expr(md5, 'int64')}").fetchone()[0] == (
+            0xD0726241020676B1
+        )
+        with pytest.raises(ValueError):
+            md5_key_expr(md5, "int32")
+
+    def test_collisions(self, conn_with_data):
+        # Clave booleana a propósito: colisiona (las filas repetidas cuentan una vez)
+        conn_with_data.execute("CREATE TABLE keyed AS SELECT *, total > 120 AS k FROM test_data")
+        sql = build_key_collision_sql(["id", "nombre"], "k", "keyed")
+        assert conn_with_data.execute(sql).fetchall() == [(True, 3)]
+        assert conn_with_data.execute(build_key_collision_sql(["id"], "id", "keyed")).fetchall() == []
+
+
 class TestValidation:
     def test_not_null(self, conn_with_data):
         results = validate_not_null(conn_with_data, "test_data", ["nombre", "id"])
@@ -68,3 +104,31 @@ class TestValidation:
         assert stats["max"] == 300.0
         assert stats["total"] == 5
         assert stats["nulls"] == 0
+
+
+class TestProfile:
+    def test_profile_single_scan(self, conn_with_data):
+        profile = profile_table(conn_with_data, "test_data", approximate=False, bins=4)
+        cols = {c["column"]: c for c in profile["columns"]}
+
+        assert profile["rows"] == 5
+        assert cols["id"]["distinct"] == 4
+        assert cols["nombre"]["nulls"] == 1
+        assert cols["nombre"]["null_pct"] == 20.0
+        assert cols["total"]["min"] == "100.0"
+        assert cols["total"]["max"] == "300.0"
+        assert cols["total"]["mean"] == pytest.approx(190.0)
+        assert len(cols["total"]["histogram"]) == 3
+        assert cols["estado"]["top_k"][0] == "ACTIVO"
+        assert "histogram" not in cols["estado"]
+
+    def test_compare_profiles(self, conn_with_data):
+        before = profile_table(conn_with_data, "test_data")
+        conn_with_data.execute("INSERT INTO test_data VALUES (5, NULL, NULL, 'ACTIVO')")
+        conn_with_data.execute("ALTER TABLE test_data ADD COLUMN canal VARCHAR")
+        after = profile_table(conn_with_data, "test_data")
+
+        changes = compare_profiles(before, after)
+        assert "rows: 5 -> 6" in changes
+        assert "canal: new column (VARCHAR)" in changes
+        assert any(c.startswith("total: nulls") for c in changes)
@@ -0,0 +1,87 @@
+"""Tests para ``ducklake watch`` (ingesta por micro-batches)."""
+
+import time
+
+import pytest
+import yaml
+
+from ducklake.core.orchestrator import Orchestrator
+from ducklake.core.watch import SourceWatch
+from ducklake.utils.fswatch import InotifyWatcher, PollingWatcher
+
+
+@pytest.fixture
+def lake(tmp_path):
+    """Fuente CSV incremental con particiones horarias y un pipeline que la lee."""
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    drops = tmp_path / "drops"
+    drops.mkdir()
+    sources = {
+        "sources": [
+            {
+                "name": "drops",
+                "type": "csv",
+                "path": f"{drops}/ventas_*.csv",
+                "tables": ["ventas"],
+                "extract": {"mode": "incremental", "raw_partition": "hour"},
+            }
+        ]
+    }
+    pipelines = {
+        "pipelines": [
+            {
+                "name": "ventas_staging",
+                "source": {"layer": "raw", "domain": "drops", "table": "ventas"},
+                "destination": {"layer": "staging", "domain": "ventas", "table": "ventas"},
+                "transforms": [{"type": "deduplicate", "keys": ["id"]}],
+            }
+        ]
+    }
+    (config_dir / "sources.yaml").write_text(yaml.safe_dump(sources))
+    (config_dir / "pipelines.yaml").write_text(yaml.safe_dump(pipelines))
+    orch = Orchestrator(str(config_dir), str(tmp_path / "data"))
+    yield orch, drops, tmp_path / "data"
+    orch.close()
+
+
+def _tick_until(watch, seconds=5.0):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        results = watch.tick(timeout=0.1)
+        if results:
+            return results
+    raise AssertionError("no micro-batch was ingested")
+
+
+class TestWatch:
+    @pytest.mark.parametrize("polling", [True, False])
+    def test_micro_batch_and_pipeline(self, lake, polling):
+        orch, drops, data_dir = lake
+        watch = SourceWatch(
+            orch, ["drops"], debounce=0.2, run_pipelines=True, polling=polling, poll_interval=0.05
+        )
+        try:
+            assert isinstance(watch.watcher, PollingWatcher if polling else InotifyWatcher)
+            (drops / "ventas_1.csv").write_text("id,total\n1,10\n2,20\n")
+            (drops / "otro.csv").write_text("id\n9\n")
+            result = _tick_until(watch)["drops"]
+            assert result["rows"] == 2
+            assert result["pipelines"]["ventas_staging"]["status"] == "success"
+
+            (drops / "ventas_2.csv").write_text("id,total\n2,25\n3,30\n")
+            result = _tick_until(watch)["drops"]
+            assert result["rows"] == 2
+            assert result["pipelines"]["ventas_staging"]["rows"] == 3
+        finally:
+            watch.close()
+
+        parts = sorted((data_dir / "raw" / "drops" / "ventas").glob("**/part-*.parquet"))
+        assert len(parts) == 2
+        assert all(p.parent.name.startswith("hour=") for p in parts)
+
+    def test_requires_incremental_csv(self, lake):
+        orch, _, _ = lake
+        orch.config.sources[0].extract.mode = "full"
+        with pytest.raises(ValueError, match="incremental"):
+            SourceWatch(orch, ["drops"], polling=True)